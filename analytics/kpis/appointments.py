@@ -8,6 +8,7 @@ from django.db.models import Avg, Count, Sum, Q
 from django.db.models.functions import Coalesce, TruncDate
 from django.utils import timezone
 
+from core.utils import date_range_filter
 from spa.models import Appointment, AppointmentItem, StaffAvailability
 from analytics.decorators import log_performance
 
@@ -68,8 +69,7 @@ class AppointmentMetricsMixin:
         Utilización = minutos reservados ÷ minutos disponibles de las agendas del personal.
         """
         appointment_minutes = AppointmentItem.objects.filter(
-            appointment__start_time__date__gte=self.start_date,
-            appointment__start_time__date__lte=self.end_date,
+            **date_range_filter("appointment__start_time", self.start_date, self.end_date),
         )
         if self.staff_id:
             appointment_minutes = appointment_minutes.filter(
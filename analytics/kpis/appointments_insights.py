@@ -5,6 +5,7 @@ from collections import defaultdict
 
 from django.db.models import Count, Sum
 
+from core.utils import date_range_filter
 from spa.models import AppointmentItem
 
 
@@ -47,8 +48,7 @@ class AppointmentInsightsMixin:
         services = (
             AppointmentItem.objects
             .filter(
-                appointment__start_time__date__gte=self.start_date,
-                appointment__start_time__date__lte=self.end_date
+                **date_range_filter("appointment__start_time", self.start_date, self.end_date)
             )
             .values('service__name')
             .annotate(
@@ -6,6 +6,7 @@ from zoneinfo import ZoneInfo
 from django.conf import settings
 from django.utils import timezone
 
+from core.utils import date_range_filter
 from finances.models import Payment
 from marketplace.models import Order
 from spa.models import Appointment
@@ -46,8 +47,7 @@ class KpiBase:
 
     def _appointment_queryset(self):
         qs = Appointment.objects.filter(
-            start_time__date__gte=self.start_date,
-            start_time__date__lte=self.end_date,
+            **date_range_filter("start_time", self.start_date, self.end_date),
         )
         if self.staff_id:
             qs = qs.filter(staff_member_id=self.staff_id)
@@ -65,8 +65,7 @@ class KpiBase:
 
     def _payment_queryset(self):
         qs = Payment.objects.filter(
-            created_at__date__gte=self.start_date,
-            created_at__date__lte=self.end_date,
+            **date_range_filter("created_at", self.start_date, self.end_date),
             status__in=[
                 Payment.PaymentStatus.APPROVED,
                 Payment.PaymentStatus.PAID_WITH_CREDIT,
@@ -79,8 +78,7 @@ class KpiBase:
 
     def _order_queryset(self):
         return Order.objects.filter(
-            created_at__date__gte=self.start_date,
-            created_at__date__lte=self.end_date,
+            **date_range_filter("created_at", self.start_date, self.end_date),
         )
 
     def as_rows(self):
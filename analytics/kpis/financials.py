@@ -7,6 +7,7 @@ from django.db.models import Avg, Count, F, Q, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from core.utils import date_range_filter
 from finances.models import Payment
 from marketplace.models import Order
 from users.models import CustomUser
@@ -22,8 +23,7 @@ class FinancialMetricsMixin:
         Retorna un dict: {role: {'total_amount': X, 'user_count': Y, 'ltv': Z}}
         """
         filters = Q(
-            payments__created_at__date__gte=self.start_date,
-            payments__created_at__date__lte=self.end_date,
+            **date_range_filter("payments__created_at", self.start_date, self.end_date),
             payments__status__in=[
                 Payment.PaymentStatus.APPROVED,
                 Payment.PaymentStatus.PAID_WITH_CREDIT,
@@ -65,8 +65,7 @@ class FinancialMetricsMixin:
         Tasa de Recuperación = monto recuperado de pagos inicialmente en mora ÷ deuda generada.
         """
         base_qs = Payment.objects.filter(
-            created_at__date__gte=self.start_date,
-            created_at__date__lte=self.end_date,
+            **date_range_filter("created_at", self.start_date, self.end_date),
         )
         debt_statuses = [
             Payment.PaymentStatus.PENDING,
@@ -79,8 +78,7 @@ class FinancialMetricsMixin:
         )["total"]
         recovered_amount = base_qs.filter(
             status=Payment.PaymentStatus.APPROVED,
-            updated_at__date__gte=self.start_date,
-            updated_at__date__lte=self.end_date,
+            **date_range_filter("updated_at", self.start_date, self.end_date),
         ).exclude(created_at=F("updated_at")).aggregate(
             total=Coalesce(Sum("amount"), Decimal("0"))
         )["total"]
@@ -134,8 +132,7 @@ class FinancialMetricsMixin:
         OPTIMIZADO: Usa select_related y prefetch_related para evitar N+1.
         """
         base_qs = Payment.objects.filter(
-            created_at__date__gte=self.start_date,
-            created_at__date__lte=self.end_date,
+            **date_range_filter("created_at", self.start_date, self.end_date),
         ).select_related("user", "appointment")  # Optimizar relaciones
 
         debt_related = base_qs.filter(
@@ -147,8 +144,7 @@ class FinancialMetricsMixin:
             ])
             | Q(
                 status=Payment.PaymentStatus.APPROVED,
-                updated_at__date__gte=self.start_date,
-                updated_at__date__lte=self.end_date,
+                **date_range_filter("updated_at", self.start_date, self.end_date),
             )
         ).order_by("-created_at")  # Añadir ordenamiento para consistencia
 
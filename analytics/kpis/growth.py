@@ -7,6 +7,7 @@ from decimal import Decimal
 from django.db.models import Avg, Case, CharField, Count, Q, Sum, Value, When, F
 from django.db.models.functions import Coalesce
 
+from core.utils import date_range_filter, day_start
 from finances.models import Payment
 from marketplace.models import InventoryMovement
 from spa.models import Appointment
@@ -25,18 +26,19 @@ class GrowthMetricsMixin:
         duration = self.end_date - self.start_date
         previous_start = self.start_date - duration - timedelta(days=1)
         previous_end = self.end_date - duration - timedelta(days=1)
+        current_start = day_start(self.start_date)
 
         # Query única para ambos periodos - REVENUE
         revenue_data = (
             Payment.objects
             .filter(
-                Q(created_at__date__gte=previous_start, created_at__date__lte=previous_end) |
-                Q(created_at__date__gte=self.start_date, created_at__date__lte=self.end_date),
+                Q(**date_range_filter("created_at", previous_start, previous_end)) |
+                Q(**date_range_filter("created_at", self.start_date, self.end_date)),
                 status__in=[Payment.PaymentStatus.APPROVED, Payment.PaymentStatus.PAID_WITH_CREDIT]
             )
             .annotate(
                 period=Case(
-                    When(created_at__date__gte=self.start_date, then=Value('current')),
+                    When(created_at__gte=current_start, then=Value('current')),
                     default=Value('previous'),
                     output_field=CharField()
                 )
@@ -53,12 +55,12 @@ class GrowthMetricsMixin:
         appt_data = (
             Appointment.objects
             .filter(
-                Q(start_time__date__gte=previous_start, start_time__date__lte=previous_end) |
-                Q(start_time__date__gte=self.start_date, start_time__date__lte=self.end_date)
+                Q(**date_range_filter("start_time", previous_start, previous_end)) |
+                Q(**date_range_filter("start_time", self.start_date, self.end_date))
             )
             .annotate(
                 period=Case(
-                    When(start_time__date__gte=self.start_date, then=Value('current')),
+                    When(start_time__gte=current_start, then=Value('current')),
                     default=Value('previous'),
                     output_field=CharField()
                 )
@@ -98,14 +100,14 @@ class GrowthMetricsMixin:
         # Usuario nuevo = creado en este periodo
         new_user_revenue = (
             self._payment_queryset()
-            .filter(user__created_at__date__gte=self.start_date)
+            .filter(user__created_at__gte=day_start(self.start_date))
             .aggregate(total=Coalesce(Sum('amount'), Decimal('0')))['total']
         )
         
         # Usuario recurrente = creado antes de este periodo
         returning_user_revenue = (
             self._payment_queryset()
-            .filter(user__created_at__date__lt=self.start_date)
+            .filter(user__created_at__lt=day_start(self.start_date))
             .aggregate(total=Coalesce(Sum('amount'), Decimal('0')))['total']
         )
         
@@ -158,7 +160,7 @@ class GrowthMetricsMixin:
         # 1. Top Productos Vendidos (Pareto)
         top_products = (
             OrderItem.objects
-            .filter(order__created_at__date__gte=self.start_date, order__created_at__date__lte=self.end_date)
+            .filter(**date_range_filter("order__created_at", self.start_date, self.end_date))
             .values('variant__product__name', 'variant__name')
             .annotate(total_sold=Sum('quantity'), total_revenue=Sum(F('quantity') * F('price_at_purchase')))
             .order_by('-total_revenue')[:10]
@@ -168,8 +170,7 @@ class GrowthMetricsMixin:
         shrinkage = (
             InventoryMovement.objects
             .filter(
-                created_at__date__gte=self.start_date, 
-                created_at__date__lte=self.end_date,
+                **date_range_filter("created_at", self.start_date, self.end_date),
                 movement_type=InventoryMovement.MovementType.ADJUSTMENT,
                 quantity__lt=0
             )
@@ -6,6 +6,7 @@ from decimal import Decimal
 from django.db.models import Count, Sum
 from django.db.models.functions import Coalesce
 
+from core.utils import date_range_filter
 from spa.models import Appointment
 from analytics.decorators import log_performance
 
@@ -21,8 +22,7 @@ class StaffMetricsMixin:
         """
         # Construir query base con filtros
         base_query = Appointment.objects.filter(
-            start_time__date__gte=self.start_date,
-            start_time__date__lte=self.end_date,
+            **date_range_filter("start_time", self.start_date, self.end_date),
             status=Appointment.AppointmentStatus.COMPLETED
         )
         
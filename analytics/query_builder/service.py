@@ -6,6 +6,7 @@ en queries Django ORM, evitando SQL injection.
 """
 import logging
 
+from core.infra.db_routing import using_replica
 from analytics.query_builder.aggregation import QueryBuilderAggregationMixin
 from analytics.query_builder.base import QueryBuilderBase
 from analytics.query_builder.filtering import QueryBuilderFilteringMixin
@@ -22,8 +23,9 @@ class QueryBuilderService(
 ):
     """Servicio para ejecutar queries dinámicas del Query Builder."""
 
+    @using_replica()
     def execute(self) -> dict:
-        """Ejecuta la query y retorna los resultados."""
+        """Ejecuta la query y retorna los resultados (en la réplica si está disponible)."""
         try:
             queryset = self._build_queryset()
 
@@ -3,6 +3,7 @@ Servicios de Analytics (KPI y BI).
 
 Se refactorizó en mixins específicos para mantener responsabilidades claras
 sin cambiar la interfaz pública: `KpiService` sigue importable desde aquí.
+Sus métodos públicos leen de la réplica cuando está disponible.
 """
 
 from analytics.kpis import (
@@ -13,8 +14,10 @@ from analytics.kpis import (
     GrowthMetricsMixin,
     StaffMetricsMixin,
 )
+from core.infra.db_routing import replica_reads
 
 
+@replica_reads
 class KpiService(
     AppointmentMetricsMixin,
     AppointmentInsightsMixin,
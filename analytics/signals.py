@@ -1,7 +1,7 @@
-from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from core.utils.caching import payload_cache
 from spa.models import Appointment, Payment
 from marketplace.models import Order
 
@@ -12,10 +12,10 @@ def invalidate_payment_analytics_cache(sender, instance, **kwargs):
     Invalida el caché de analytics cuando se crea, actualiza o elimina un pago.
     """
     # Invalidar KPIs y time series que dependen de pagos
-    cache.delete_pattern('analytics:kpis:*')
-    cache.delete_pattern('analytics:timeseries:*')
-    cache.delete_pattern('analytics:dataset:*')
-    cache.delete_pattern('analytics:bi:*')  # BI metrics también usan pagos
+    payload_cache.delete_pattern('analytics:kpis:*')
+    payload_cache.delete_pattern('analytics:timeseries:*')
+    payload_cache.delete_pattern('analytics:dataset:*')
+    payload_cache.delete_pattern('analytics:bi:*')  # BI metrics también usan pagos
 
 
 @receiver([post_save, post_delete], sender=Appointment)
@@ -24,10 +24,21 @@ def invalidate_appointment_analytics_cache(sender, instance, **kwargs):
     Invalida el caché de analytics cuando se crea, actualiza o elimina una cita.
     """
     # Invalidar KPIs, time series y ops que dependen de citas
-    cache.delete_pattern('analytics:kpis:*')
-    cache.delete_pattern('analytics:timeseries:*')
-    cache.delete_pattern('analytics:dataset:*')
-    cache.delete_pattern('analytics:ops:*')  # Operational insights usan citas
+    payload_cache.delete_pattern('analytics:kpis:*')
+    payload_cache.delete_pattern('analytics:timeseries:*')
+    payload_cache.delete_pattern('analytics:dataset:*')
+    payload_cache.delete_pattern('analytics:ops:*')  # Operational insights usan citas
+
+
+def invalidate_marketplace_analytics():
+    """
+    Invalida las métricas de marketplace.
+
+    Además del signal de ``Order``, la usan las actualizaciones masivas de
+    órdenes (``QuerySet.update``), que no disparan ``post_save``.
+    """
+    payload_cache.delete_pattern('analytics:kpis:*')
+    payload_cache.delete_pattern('analytics:bi:inventory:*')
 
 
 @receiver([post_save, post_delete], sender=Order)
@@ -35,6 +46,4 @@ def invalidate_order_analytics_cache(sender, instance, **kwargs):
     """
     Invalida el caché de analytics cuando se crea, actualiza o elimina una orden.
     """
-    # Invalidar métricas de marketplace
-    cache.delete_pattern('analytics:kpis:*')
-    cache.delete_pattern('analytics:bi:inventory:*')
+    invalidate_marketplace_analytics()
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from model_bakery import baker
+
+from analytics.kpis.base import KpiBase
+from finances.models import Payment
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != "postgresql", reason="EXPLAIN con planes de Postgres"),
+]
+
+
+def _plan(queryset):
+    with connection.cursor() as cursor:
+        # Con tablas de test pequeñas el planner prefiere seq scan; se
+        # desactiva para ver qué índices puede usar realmente el filtro.
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("ANALYZE finances_payment")
+        cursor.execute("ANALYZE spa_appointment")
+    return queryset.explain()
+
+
+@pytest.fixture
+def kpi():
+    today = timezone.localdate()
+    now = timezone.now()
+    user = baker.make("users.CustomUser")
+    Payment.objects.bulk_create(
+        [
+            Payment(
+                user=user,
+                amount=1000,
+                status=Payment.PaymentStatus.APPROVED,
+                payment_type=Payment.PaymentType.ADVANCE,
+            )
+            for _ in range(300)
+        ]
+    )
+    for offset, payment in enumerate(Payment.objects.all()):
+        Payment.objects.filter(pk=payment.pk).update(created_at=now - timedelta(days=offset))
+    return KpiBase(today - timedelta(days=6), today)
+
+
+def test_payment_range_uses_time_status_index(kpi):
+    plan = _plan(kpi._payment_queryset())
+
+    assert "payment_time_status_idx" in plan
+    assert "Index Cond" in plan and "created_at >=" in plan
+
+
+def test_appointment_range_uses_time_status_index(kpi):
+    plan = _plan(kpi._appointment_queryset())
+
+    assert "appt_time_status_idx" in plan
+    assert "start_time >=" in plan
+
+
+def test_date_cast_lookup_cannot_use_index_condition(kpi):
+    plan = _plan(
+        Payment.objects.filter(
+            created_at__date__gte=kpi.start_date, created_at__date__lte=kpi.end_date
+        )
+    )
+
+    # El cast a fecha solo puede evaluarse como Filter fila a fila
+    assert "Index Cond" not in plan
+    assert "::date" in plan
@@ -13,6 +13,7 @@ from analytics.permissions import (
     CanViewOperationalMetrics,
 )
 from analytics.views import AnalyticsExportView, CacheClearView, KpiView, TimeSeriesView
+from core.utils.caching import payload_cache
 from users.models import CustomUser
 
 
@@ -219,7 +220,7 @@ class AnalyticsViewsTests(TestCase):
 
     @patch("analytics.views._audit_analytics")
     def test_cache_clear_all_fallback(self, mock_audit):
-        cache.set("analytics:test:key", "value")
+        payload_cache.set("analytics:test:key", "value")
         request = self.factory.post("/cache/clear/", {"scope": "all"}, format="json")
         force_authenticate(request, user=self.admin)
         request = self._force_version(request)
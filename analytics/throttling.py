@@ -1,7 +1,7 @@
-from rest_framework.throttling import UserRateThrottle
+from core.api.throttling import RedisUserRateThrottle
 
 
-class AnalyticsRateThrottle(UserRateThrottle):
+class AnalyticsRateThrottle(RedisUserRateThrottle):
     """
     Throttle específico para endpoints de analytics.
     Limita requests costosos para prevenir abuso de recursos.
@@ -9,7 +9,7 @@ class AnalyticsRateThrottle(UserRateThrottle):
     scope = 'analytics'
 
 
-class AnalyticsExportRateThrottle(UserRateThrottle):
+class AnalyticsExportRateThrottle(RedisUserRateThrottle):
     """
     Throttle más restrictivo para exportaciones (CSV/XLSX).
     Las exportaciones son operaciones costosas que requieren límites más estrictos.
@@ -1,10 +1,10 @@
 """
 Views Cache - Limpieza de caché de Analytics.
 """
-from django.core.cache import cache
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.utils.caching import payload_cache
 from users.permissions import IsStaffOrAdmin
 
 from analytics.views.shared import audit_analytics
@@ -37,28 +37,24 @@ class CacheClearView(APIView):
             if scope == 'all':
                 # Limpiar todas las claves que empiecen con 'analytics:'
                 # Nota: Esto requiere acceso al backend de caché
-                from django.core.cache import cache as django_cache
-
                 # Para Redis, podemos usar keys()
-                if hasattr(django_cache, 'keys'):
-                    keys = django_cache.keys('analytics:*')
+                if hasattr(payload_cache, 'keys'):
+                    keys = payload_cache.keys('analytics:*')
                     for key in keys:
-                        django_cache.delete(key)
+                        payload_cache.delete(key)
                         cleared_count += 1
                 else:
                     # Fallback: limpiar todo el caché
-                    django_cache.clear()
+                    payload_cache.clear()
                     cleared_count = -1  # Indicador de limpieza total
 
             else:
                 # Limpiar solo el scope específico
-                from django.core.cache import cache as django_cache
-
-                if hasattr(django_cache, 'keys'):
+                if hasattr(payload_cache, 'keys'):
                     pattern = f'analytics:{scope}:*'
-                    keys = django_cache.keys(pattern)
+                    keys = payload_cache.keys(pattern)
                     for key in keys:
-                        django_cache.delete(key)
+                        payload_cache.delete(key)
                         cleared_count += 1
                 else:
                     return Response(
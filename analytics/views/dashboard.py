@@ -4,7 +4,6 @@ Views Dashboard - Endpoints del dashboard administrativo.
 from datetime import timedelta
 from decimal import Decimal
 
-from django.core.cache import cache
 from django.db.models import Q, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
@@ -13,6 +12,9 @@ from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from core.utils import date_range_filter
+from core.utils.caching import payload_cache
+from finances.models import ClientCreditSummary
 from spa.models import Appointment, ClientCredit, Payment
 from users.models import CustomUser
 
@@ -63,7 +65,7 @@ class DashboardViewSet(viewsets.ViewSet):
         end_of_week = start_of_week + timedelta(days=6)
 
         cache_key = self._cache_key(request, f"agenda_week:{start_of_week.isoformat()}")
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
 
         # Soporte para limpiar caché si es necesario
         if request.query_params.get('force_refresh') == 'true':
@@ -75,14 +77,13 @@ class DashboardViewSet(viewsets.ViewSet):
 
         # Contar citas de la semana que no estén canceladas
         count = Appointment.objects.filter(
-            start_time__date__gte=start_of_week,
-            start_time__date__lte=end_of_week
+            **date_range_filter("start_time", start_of_week, end_of_week)
         ).exclude(
             status=Appointment.AppointmentStatus.CANCELLED
         ).count()
 
         data = {"count": count, "start_of_week": start_of_week, "end_of_week": end_of_week}
-        cache.set(cache_key, data, self.CACHE_TTL)
+        payload_cache.set(cache_key, data, self.CACHE_TTL)
         audit_analytics(request, "dashboard_agenda_week", {"cache": "miss"})
         return Response(data)
 
@@ -92,7 +93,7 @@ class DashboardViewSet(viewsets.ViewSet):
         Retorna el número de citas con saldo pendiente (outstanding > 0), sin importar su estado.
         """
         cache_key = self._cache_key(request, "pending_count")
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
         if request.query_params.get('force_refresh') == 'true':
             cached = None
 
@@ -134,7 +135,7 @@ class DashboardViewSet(viewsets.ViewSet):
         )
 
         data = {"count": pending_count}
-        cache.set(cache_key, data, self.CACHE_TTL)
+        payload_cache.set(cache_key, data, self.CACHE_TTL)
         audit_analytics(request, "dashboard_pending_payments", {"cache": "miss"})
         return Response(data)
 
@@ -145,7 +146,7 @@ class DashboardViewSet(viewsets.ViewSet):
         sin importar cuándo vencen.
         """
         cache_key = self._cache_key(request, "active_credits_count")
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
 
         if request.query_params.get('force_refresh') == 'true':
             cached = None
@@ -156,19 +157,21 @@ class DashboardViewSet(viewsets.ViewSet):
 
         today = self._today()
 
-        # Contar créditos válidos
-        # Se asume que expirados tienen status=EXPIRED o expires_at < today
-        count = ClientCredit.objects.filter(
-            status__in=[
-                ClientCredit.CreditStatus.AVAILABLE,
-                ClientCredit.CreditStatus.PARTIALLY_USED
-            ],
-            # Asegurarnos de no contar los vencidos por fecha si el status no se actualizó job
-            expires_at__gte=today
+        # Los resúmenes vigentes ya traen el conteo; solo los usuarios con un
+        # crédito vencido por fecha (aún sin marcar EXPIRED) se cuentan fila a fila.
+        summaries = ClientCreditSummary.objects.all()
+        stale = summaries.filter(next_expires_at__lt=today)
+        count = summaries.exclude(next_expires_at__lt=today).aggregate(
+            total=Coalesce(Sum("active_credits"), 0)
+        )["total"]
+        count += ClientCredit.objects.filter(
+            user_id__in=stale.values("user_id"),
+            status__in=ClientCredit.ACTIVE_STATUSES,
+            expires_at__gte=today,
         ).count()
 
         data = {"count": count}
-        cache.set(cache_key, data, self.CACHE_TTL)
+        payload_cache.set(cache_key, data, self.CACHE_TTL)
         audit_analytics(request, "dashboard_active_credits", {"cache": "miss"})
         return Response(data)
 
@@ -179,7 +182,7 @@ class DashboardViewSet(viewsets.ViewSet):
         Formato: { "vip_count": X, "total_count": Y }
         """
         cache_key = self._cache_key(request, "vip_ratio")
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
 
         if request.query_params.get('force_refresh') == 'true':
             cached = None
@@ -205,6 +208,6 @@ class DashboardViewSet(viewsets.ViewSet):
             "formatted": f"{vip_count}/{total_count}"
         }
 
-        cache.set(cache_key, data, self.CACHE_TTL)
+        payload_cache.set(cache_key, data, self.CACHE_TTL)
         audit_analytics(request, "dashboard_vip_ratio", {"cache": "miss"})
         return Response(data)
@@ -1,18 +1,17 @@
 """
 Views KPI - Endpoints de KPIs, series temporales y exportación.
 """
-import csv
-import io
-
-from django.core.cache import cache
 from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from core.utils.caching import payload_cache
 from analytics.permissions import CanViewFinancialMetrics
 from analytics.throttling import AnalyticsRateThrottle, AnalyticsExportRateThrottle
 from analytics.views.shared import DateFilterMixin, audit_analytics, build_kpi_service, build_workbook
+from core.utils.streaming import CSVStreamRenderer, streaming_csv_response
 
 
 class KpiView(DateFilterMixin, APIView):
@@ -37,7 +36,7 @@ class KpiView(DateFilterMixin, APIView):
         force_refresh = request.query_params.get('force_refresh', 'false').lower() == 'true'
 
         cache_key = self._cache_key(request, "kpis", start_date, end_date, staff_id, service_category_id)
-        cached = None if force_refresh else cache.get(cache_key)
+        cached = None if force_refresh else payload_cache.get(cache_key)
 
         if cached is not None:
             audit_analytics(
@@ -64,7 +63,7 @@ class KpiView(DateFilterMixin, APIView):
 
         # Usar TTL dinámico
         ttl = self._get_cache_ttl(start_date, end_date)
-        cache.set(cache_key, data, ttl)
+        payload_cache.set(cache_key, data, ttl)
 
         audit_analytics(
             request,
@@ -94,7 +93,7 @@ class TimeSeriesView(DateFilterMixin, APIView):
             return Response({"error": str(exc)}, status=400)
 
         cache_key = self._cache_key(request, "timeseries", start_date, end_date, staff_id, service_category_id)
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
         if cached is not None:
             audit_analytics(request, "timeseries_view", {"cache": "hit"})
             return Response(cached)
@@ -108,7 +107,7 @@ class TimeSeriesView(DateFilterMixin, APIView):
         data = service.get_time_series()
 
         ttl = self._get_cache_ttl(start_date, end_date)
-        cache.set(cache_key, data, ttl)
+        payload_cache.set(cache_key, data, ttl)
         audit_analytics(request, "timeseries_view", {"cache": "miss"})
 
         return Response(data)
@@ -118,6 +117,7 @@ class AnalyticsExportView(DateFilterMixin, APIView):
     """Exportación de analytics - Solo Admin."""
     permission_classes = [CanViewFinancialMetrics]
     throttle_classes = [AnalyticsExportRateThrottle]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVStreamRenderer]
 
     def get(self, request):
         try:
@@ -133,7 +133,7 @@ class AnalyticsExportView(DateFilterMixin, APIView):
             service_category_id=service_category_id,
         )
         cache_key = self._cache_key(request, "dataset", start_date, end_date, staff_id, service_category_id)
-        dataset = cache.get(cache_key)
+        dataset = payload_cache.get(cache_key)
         cache_state = "hit"
         if dataset is None:
             cache_state = "miss"
@@ -147,7 +147,7 @@ class AnalyticsExportView(DateFilterMixin, APIView):
             }
             # CAMBIAR - Usar TTL dinámico
             ttl = self._get_cache_ttl(start_date, end_date)
-            cache.set(cache_key, dataset, ttl)
+            payload_cache.set(cache_key, dataset, ttl)
         kpis = dataset["kpis"]
         export_format = request.query_params.get("format", "csv").lower()
         if export_format == "xlsx":
@@ -177,15 +177,15 @@ class AnalyticsExportView(DateFilterMixin, APIView):
             )
             return response
 
-        buffer = io.StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(["metric", "value", "start_date", "end_date"])
-        for metric, value in dataset["rows"]:
-            writer.writerow([metric, value, start_date.isoformat(), end_date.isoformat()])
-
         filename = f"analytics_{start_date.isoformat()}_{end_date.isoformat()}.csv"
-        response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response = streaming_csv_response(
+            filename,
+            ["metric", "value", "start_date", "end_date"],
+            (
+                [metric, value, start_date.isoformat(), end_date.isoformat()]
+                for metric, value in dataset["rows"]
+            ),
+        )
         audit_analytics(
             request,
             "analytics_export",
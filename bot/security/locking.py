@@ -3,7 +3,7 @@ import logging
 import uuid
 from contextlib import contextmanager
 
-from django.core.cache import cache
+from core.utils.caching import lock_cache
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ class LockingMixin:
         try:
             while time.time() < timeout_at:
                 # cache.add funciona como SETNX (Set if Not Exists) atómico
-                if cache.add(lock_key, lock_value, timeout=lock_timeout):
+                if lock_cache.add(lock_key, lock_value, timeout=lock_timeout):
                     acquired = True
                     break
                 time.sleep(0.05)  # Espera breve antes de reintentar
@@ -45,9 +45,9 @@ class LockingMixin:
             if acquired:
                 # CORRECCIÓN CRÍTICA: Solo borrar si el valor coincide
                 # Esto evita borrar el lock de otro proceso que lo adquirió después
-                current_value = cache.get(lock_key)
+                current_value = lock_cache.get(lock_key)
                 if current_value == lock_value:
-                    cache.delete(lock_key)
+                    lock_cache.delete(lock_key)
                 else:
                     # El lock expiró y otro proceso lo tomó, no hacer nada
                     logger.warning(
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 from django.utils import timezone
 
+from core.utils.caching import payload_cache
 from marketplace.models import ProductVariant
 from spa.models import Appointment, Service
 
@@ -18,7 +18,7 @@ class DataContextService:
     @staticmethod
     def get_services_context() -> str:
         cache_key = "bot_context:services"
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
         if cached:
             return cached
 
@@ -35,13 +35,13 @@ class DataContextService:
                 lines.append(f"- {name} ({s.duration}min): {price}. {desc}")
             result = "\n".join(lines)
 
-        cache.set(cache_key, result, timeout=300)
+        payload_cache.set(cache_key, result, timeout=300)
         return result
 
     @staticmethod
     def get_products_context() -> str:
         cache_key = "bot_context:products"
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
         if cached:
             return cached
 
@@ -61,13 +61,13 @@ class DataContextService:
                 )
             result = "\n".join(lines)
 
-        cache.set(cache_key, result, timeout=300)
+        payload_cache.set(cache_key, result, timeout=300)
         return result
 
     @staticmethod
     def get_staff_context() -> str:
         cache_key = "bot_context:staff"
-        cached = cache.get(cache_key)
+        cached = payload_cache.get(cache_key)
         if cached:
             return cached
 
@@ -77,7 +77,7 @@ class DataContextService:
         else:
             result = "\n".join([f"- {_clean_text(person.get_full_name())}" for person in staff])
 
-        cache.set(cache_key, result, timeout=300)
+        payload_cache.set(cache_key, result, timeout=300)
         return result
 
     @staticmethod
@@ -67,11 +67,11 @@ class TestDataContextService:
 
     def test_get_staff_with_data(self):
         from django.contrib.auth import get_user_model
-        from django.core.cache import cache
+        from core.utils.caching import payload_cache
         User = get_user_model()
 
         # Limpiar cache antes del test
-        cache.delete('bot_context:staff')
+        payload_cache.delete('bot_context:staff')
 
         User.objects.create(
             first_name="Ana", last_name="Terapeuta",
@@ -96,9 +96,9 @@ class TestDataContextService:
 
     def test_cache_behavior(self):
         """Verifica que el caché de contexto funciona correctamente."""
-        from django.core.cache import cache
-        
-        cache.clear()
+        from core.utils.caching import payload_cache
+
+        payload_cache.delete('bot_context:services')
 
         baker.make('spa.Service', name="Masaje Test", duration=60, price=100000, is_active=True)
         ctx1 = DataContextService.get_services_context()
@@ -109,7 +109,7 @@ class TestDataContextService:
         ctx2 = DataContextService.get_services_context()
         assert "Masaje Test" in ctx2
         
-        cache.delete('bot_context:services')
+        payload_cache.delete('bot_context:services')
 
         ctx3 = DataContextService.get_services_context()
         assert "Masaje Nuevo" in ctx3
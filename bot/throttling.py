@@ -1,7 +1,7 @@
-from rest_framework.throttling import SimpleRateThrottle
+from core.api.throttling import RedisSimpleRateThrottle
 
 
-class BotRateThrottle(SimpleRateThrottle):
+class BotRateThrottle(RedisSimpleRateThrottle):
     """Throttle por minuto para prevenir spam inmediato"""
     scope = 'bot'
 
@@ -13,7 +13,7 @@ class BotRateThrottle(SimpleRateThrottle):
         return self.cache_format % {'scope': self.scope, 'ident': ident}
 
 
-class BotDailyThrottle(SimpleRateThrottle):
+class BotDailyThrottle(RedisSimpleRateThrottle):
     """
     CORRECCIÓN CRÍTICA: Throttle diario para controlar costos de tokens.
     Previene que un usuario consuma más de $0.005 USD/día en tokens de Gemini.
@@ -28,7 +28,7 @@ class BotDailyThrottle(SimpleRateThrottle):
         return self.cache_format % {'scope': self.scope, 'ident': ident}
 
 
-class BotIPThrottle(SimpleRateThrottle):
+class BotIPThrottle(RedisSimpleRateThrottle):
     """
     MEJORA #4: Throttle por IP para prevenir abuso con múltiples cuentas.
 
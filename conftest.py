@@ -34,3 +34,54 @@ def media_root(tmp_path, settings):
     if 'testserver' not in settings.ALLOWED_HOSTS:
         settings.ALLOWED_HOSTS.append('testserver')
     return settings.MEDIA_ROOT
+
+
+@pytest.fixture(autouse=True)
+def notification_template_cache():
+    """
+    Limpia la caché en proceso de plantillas de notificación entre tests:
+    los rollbacks de transacción no disparan los signals de invalidación.
+    """
+    from notifications.template_cache import NotificationTemplateCache
+
+    NotificationTemplateCache.clear_local()
+    yield
+    NotificationTemplateCache.clear_local()
+
+
+@pytest.fixture(autouse=True)
+def twilio_clients():
+    """Evita que un cliente Twilio (mock) creado en un test se reutilice en otro."""
+    from core.infra.twilio_client import reset_twilio_clients
+
+    reset_twilio_clients()
+    yield
+    reset_twilio_clients()
+
+
+@pytest.fixture(autouse=True)
+def audit_sync_writes(settings):
+    """
+    AuditLog síncrono en tests: el hilo del sink usa otra conexión y no vería
+    los datos de la transacción del test. Los tests del sink lo crean aparte.
+    """
+    settings.AUDIT_ASYNC_ENABLED = False
+
+
+@pytest.fixture(autouse=True)
+def notification_rate_limits(settings):
+    """
+    Desactiva el limitador de envío por canal: su estado vive en Redis y se
+    compartiría entre tests. Los tests del limitador lo configuran explícitamente.
+    """
+    settings.NOTIFICATIONS_CHANNEL_RATES = {}
+
+
+@pytest.fixture(autouse=True)
+def wompi_reference_data():
+    """El acceptance token y los bancos PSE en caché no deben pasar de un test a otro."""
+    from finances.gateway.reference_data import WompiReferenceData
+
+    WompiReferenceData.clear()
+    yield
+    WompiReferenceData.clear()
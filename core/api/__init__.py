@@ -7,34 +7,48 @@ Exporta:
 - Views: HealthCheckView, GlobalSettingsView
 - ViewSets: GlobalSettingsViewSet, AboutPageViewSet, TeamMemberViewSet, GalleryImageViewSet
 - Permissions: IsAuthenticatedAndActive, IsAdmin, IsStaff, ReadOnly, RoleAllowed
-- Pagination: DefaultPageNumberPagination
+- Pagination: DefaultPageNumberPagination, KeysetCursorPagination
+- Renderers/Parsers: FastJSONRenderer, FastJSONParser
 - Throttling: BurstAnonThrottle, SustainedAnonThrottle, BurstUserThrottle, LoginThrottle, PasswordChangeThrottle, AdminThrottle
 - Routers: get_default_router
 """
-from core.api.views import HealthCheckView, GlobalSettingsView
-from core.api.viewsets import (
-    GlobalSettingsViewSet,
-    AboutPageViewSet,
-    TeamMemberViewSet,
-    GalleryImageViewSet,
-)
-from core.api.permissions import (
-    IsAuthenticatedAndActive,
-    IsAdmin,
-    IsStaff,
-    ReadOnly,
-    RoleAllowed,
-)
-from core.api.pagination import DefaultPageNumberPagination
-from core.api.throttling import (
-    BurstAnonThrottle,
-    SustainedAnonThrottle,
-    BurstUserThrottle,
-    LoginThrottle,
-    PasswordChangeThrottle,
-    AdminThrottle,
-)
-from core.api.routers import get_default_router
+from importlib import import_module
+
+# Las exportaciones se resuelven bajo demanda: la configuración de DRF
+# (DEFAULT_PAGINATION_CLASS, DEFAULT_THROTTLE_CLASSES, DEFAULT_RENDERER_CLASSES)
+# importa submódulos de este paquete mientras ``rest_framework.views`` aún se
+# está cargando, y un import eager de las vistas aquí cerraría el ciclo.
+_EXPORTS = {
+    "HealthCheckView": "core.api.views",
+    "GlobalSettingsView": "core.api.views",
+    "GlobalSettingsViewSet": "core.api.viewsets",
+    "AboutPageViewSet": "core.api.viewsets",
+    "TeamMemberViewSet": "core.api.viewsets",
+    "GalleryImageViewSet": "core.api.viewsets",
+    "IsAuthenticatedAndActive": "core.api.permissions",
+    "IsAdmin": "core.api.permissions",
+    "IsStaff": "core.api.permissions",
+    "ReadOnly": "core.api.permissions",
+    "RoleAllowed": "core.api.permissions",
+    "DefaultPageNumberPagination": "core.api.pagination",
+    "KeysetCursorPagination": "core.api.pagination",
+    "FastJSONRenderer": "core.api.renderers",
+    "FastJSONParser": "core.api.parsers",
+    "BurstAnonThrottle": "core.api.throttling",
+    "SustainedAnonThrottle": "core.api.throttling",
+    "BurstUserThrottle": "core.api.throttling",
+    "LoginThrottle": "core.api.throttling",
+    "PasswordChangeThrottle": "core.api.throttling",
+    "AdminThrottle": "core.api.throttling",
+    "get_default_router": "core.api.routers",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module), name)
 
 
 __all__ = [
@@ -54,6 +68,10 @@ __all__ = [
     "RoleAllowed",
     # Pagination
     "DefaultPageNumberPagination",
+    "KeysetCursorPagination",
+    # Renderers/Parsers
+    "FastJSONRenderer",
+    "FastJSONParser",
     # Throttling
     "BurstAnonThrottle",
     "SustainedAnonThrottle",
@@ -1,8 +1,20 @@
 """
 Core API - Pagination.
 """
+import datetime
+import json
+import uuid
+from decimal import Decimal
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class DefaultPageNumberPagination(PageNumberPagination):
@@ -46,3 +58,169 @@ class DefaultPageNumberPagination(PageNumberPagination):
             "pages": self.page.paginator.num_pages,
             "results": data,
         })
+
+
+def approximate_count(queryset):
+    """
+    Total estimado de filas sin ``COUNT(*)``.
+
+    En PostgreSQL se toma la estimación del planner (``EXPLAIN``), que respeta
+    los filtros del queryset; en otros motores se usa ``count()`` exacto.
+    """
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetCursorPagination(PageNumberPagination):
+    """
+    Paginación por número de página con modo keyset (cursor) opcional.
+
+    Sin ``?cursor`` se comporta igual que ``PageNumberPagination``. Con
+    ``?cursor=`` (vacío para la primera página) filtra por los valores de la
+    última fila vista en lugar de usar OFFSET, y no ejecuta ``COUNT(*)``; la
+    latencia no crece con la profundidad de la página si el ordenamiento
+    coincide con un índice, p. ej. ``(user, start_time)``.
+
+    - El ordenamiento es el del queryset (o el ``Meta.ordering`` del modelo)
+      más ``pk`` como desempate; solo admite campos propios no nulos.
+    - Los cursores son opacos y firmados, y siguen siendo válidos aunque se
+      inserten filas nuevas.
+    - ``?include_total=true`` agrega ``approximate_count`` (estimación del
+      planner, ver ``approximate_count``).
+
+    Formato de respuesta en modo cursor:
+        {
+            "next": <url o null>,
+            "previous": <url o null>,
+            "approximate_count": <opcional>,
+            "results": [<items de la página>]
+        }
+    """
+    cursor_query_param = "cursor"
+    include_total_query_param = "include_total"
+    cursor_salt = "core.api.pagination.keyset"
+    invalid_cursor_message = "Cursor inválido."
+    unsupported_ordering_message = "El ordenamiento solicitado no admite paginación por cursor."
+
+    keyset_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset_mode = False
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset_mode = True
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = self._resolve_ordering(queryset)
+        position, reverse = self._decode_cursor(request, ordering)
+
+        order_by = [
+            ("-" if descending != reverse else "") + field.attname
+            for field, descending in ordering
+        ]
+        page_queryset = queryset.order_by(*order_by)
+        if position is not None:
+            page_queryset = page_queryset.filter(self._after(ordering, position, reverse))
+
+        rows = list(page_queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                self.next_cursor = self._encode_cursor(ordering, rows[-1], reverse=False)
+            if position is not None and (has_more or not reverse):
+                self.previous_cursor = self._encode_cursor(ordering, rows[0], reverse=True)
+
+        self.approximate_count = None
+        if request.query_params.get(self.include_total_query_param) in ("1", "true", "True"):
+            self.approximate_count = approximate_count(queryset)
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset_mode:
+            return super().get_paginated_response(data)
+        payload = {
+            "next": self._cursor_link(self.next_cursor),
+            "previous": self._cursor_link(self.previous_cursor),
+        }
+        if self.approximate_count is not None:
+            payload["approximate_count"] = self.approximate_count
+        payload["results"] = data
+        return Response(payload)
+
+    def _resolve_ordering(self, queryset):
+        """Lista de ``(field, descending)`` terminada en la clave primaria."""
+        meta = queryset.model._meta
+        terms = list(queryset.query.order_by or meta.ordering or ())
+        ordering = []
+        for term in terms:
+            if not isinstance(term, str):
+                raise ValidationError({self.cursor_query_param: self.unsupported_ordering_message})
+            descending = term.startswith("-")
+            name = term.lstrip("-+")
+            try:
+                field = meta.pk if name == "pk" else meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ValidationError({self.cursor_query_param: self.unsupported_ordering_message})
+            if not getattr(field, "concrete", False) or field.null:
+                raise ValidationError({self.cursor_query_param: self.unsupported_ordering_message})
+            ordering.append((field, descending))
+            if field.primary_key:
+                return ordering
+        descending = ordering[0][1] if ordering else True
+        ordering.append((meta.pk, descending))
+        return ordering
+
+    @staticmethod
+    def _after(ordering, position, reverse):
+        """Filtro keyset: filas estrictamente después de ``position``."""
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(ordering, position):
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= equal & Q(**{f"{field.attname}__{lookup}": value})
+            equal &= Q(**{field.attname: value})
+        return condition
+
+    def _encode_cursor(self, ordering, row, reverse):
+        values = []
+        for field, _ in ordering:
+            value = getattr(row, field.attname)
+            if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+                value = value.isoformat()
+            elif isinstance(value, (uuid.UUID, Decimal)):
+                value = str(value)
+            values.append(value)
+        return signing.dumps(
+            {"o": [f.attname for f, _ in ordering], "v": values, "r": reverse},
+            salt=self.cursor_salt,
+            compress=True,
+        )
+
+    def _decode_cursor(self, request, ordering):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = signing.loads(token, salt=self.cursor_salt)
+            if payload["o"] != [f.attname for f, _ in ordering]:
+                raise ValueError("ordering mismatch")
+            position = [field.to_python(value) for (field, _), value in zip(ordering, payload["v"])]
+            return position, bool(payload["r"])
+        except (signing.BadSignature, KeyError, TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _cursor_link(self, token):
+        if token is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
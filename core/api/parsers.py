@@ -0,0 +1,37 @@
+"""
+Core API - Parsers.
+
+``FastJSONParser`` decodifica los cuerpos JSON con orjson. orjson es más
+estricto que el módulo ``json`` (enteros de más de 64 bits, surrogates
+sueltos, NaN/Infinity); cuando rechaza un cuerpo, la misma request se
+vuelve a parsear con el ``JSONParser`` de DRF, que decide si es válido y
+genera el mismo ``ParseError`` de siempre.
+"""
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from core.api.renderers import FastJSONRenderer, json_fallbacks, orjson
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` respaldado por orjson con fallback por request."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            json_fallbacks.labels(direction="parse", reason="unsupported").inc()
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            json_fallbacks.labels(direction="parse", reason="decode_error").inc()
+            return super().parse(io.BytesIO(body), media_type, parser_context)
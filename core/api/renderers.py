@@ -0,0 +1,94 @@
+"""
+Core API - Renderers.
+
+``FastJSONRenderer`` serializa las respuestas con orjson y produce los mismos
+bytes que ``rest_framework.renderers.JSONRenderer`` con la configuración del
+proyecto (``COMPACT_JSON`` y ``UNICODE_JSON`` activos):
+
+- datetime/date/time pasan por el ``JSONEncoder`` de DRF
+  (``OPT_PASSTHROUGH_DATETIME``), igual que Decimal, lazy strings, QuerySets
+  y cualquier tipo que orjson no conozca. Los UUID los serializa orjson con
+  el mismo formato que ``str(uuid)``.
+- ``\\u2028`` y ``\\u2029`` se escapan como en DRF.
+
+Cuando el resultado podría diferir, la request se renderiza con el
+``JSONRenderer`` estándar: indentación pedida por el cliente o el Browsable
+API, ``UNICODE_JSON``/``COMPACT_JSON`` desactivados, floats que Python
+escribe en notación exponencial, enteros de más de 64 bits o errores del
+encoder. Los NaN/Infinity son la única diferencia conocida: orjson los
+escribe como ``null`` donde DRF lanza ``ValueError``.
+"""
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+from core.infra.metrics import get_counter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - entornos sin orjson
+    orjson = None
+
+json_fallbacks = get_counter(
+    "api_json_fallback_total",
+    "Requests/respuestas JSON procesadas con la librería estándar en lugar de orjson",
+    ["direction", "reason"],
+)
+
+if orjson is not None:
+    _DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+else:  # pragma: no cover
+    _DUMPS_OPTIONS = 0
+
+# Un número (siempre precedido de ``:``, ``,`` o ``[`` en la salida compacta)
+# en notación exponencial, o menor que 1e-4 escrito en notación posicional:
+# en ambos casos ``repr(float)`` y orjson difieren. Las coincidencias dentro
+# de strings solo provocan un fallback innecesario.
+_FLOAT_MISMATCH_RE = re.compile(rb"[:,\[]-?(?:\d+(?:\.\d+)?[eE]|0\.0000\d)")
+
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` respaldado por orjson con fallback por request."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        reason = self._fallback_reason(data, accepted_media_type, renderer_context or {})
+        if reason is None:
+            try:
+                ret = orjson.dumps(
+                    data, default=self.encoder_class().default, option=_DUMPS_OPTIONS
+                )
+            except orjson.JSONEncodeError:
+                reason = "encode_error"
+            else:
+                if not _FLOAT_MISMATCH_RE.search(ret):
+                    return self._escape_separators(ret)
+                reason = "float_format"
+
+        json_fallbacks.labels(direction="render", reason=reason).inc()
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def _fallback_reason(self, data, accepted_media_type, renderer_context):
+        if orjson is None:
+            return "unavailable"
+        if self.ensure_ascii or not self.compact:
+            return "settings"
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return "indent"
+        if isinstance(data, float):
+            # Un float suelto no va precedido de separador; la regex no lo vería
+            return "float_format"
+        return None
+
+    @staticmethod
+    def _escape_separators(ret):
+        if _LINE_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b"\\u2028")
+        if _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_PARAGRAPH_SEPARATOR, b"\\u2029")
+        return ret
@@ -1,30 +1,133 @@
 """
 Core API - Throttling.
+
+Las clases de DRF guardan en caché la lista de timestamps de cada cliente:
+por request hacen un GET y un SET (con pickle) y recortan la lista en Python,
+así que dos requests simultáneos pueden pisarse. ``RedisRateThrottleMixin``
+evalúa el mismo límite (ventana deslizante: como mucho ``num_requests`` en
+cualquier intervalo de ``duration`` segundos) en un único script Lua sobre un
+sorted set por cliente: una ida y vuelta, atómico, y el set nunca guarda más
+de ``num_requests`` marcas de tiempo.
+
+Si Redis no responde se usa la implementación de DRF (que con
+``IGNORE_EXCEPTIONS`` deja pasar el request).
+"""
+import logging
+import uuid
+
+from rest_framework import throttling
+
+logger = logging.getLogger(__name__)
+
+# Ventana deslizante: KEYS[1] = clave del cliente; ARGV = ventana (µs), límite,
+# miembro único del request. Devuelve -1 si el request se permite o los µs que
+# faltan para que salga de la ventana el request que libera un cupo.
+_SLIDING_WINDOW_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000000 + tonumber(now_parts[2])
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], count - limit, count - limit, 'WITHSCORES')
+    return math.max(tonumber(oldest[2]) + window - now, 1)
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], math.ceil(window / 1000) + 1000)
+return -1
 """
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+_sliding_window_script = None
+
+
+def _sliding_window():
+    global _sliding_window_script
+    if _sliding_window_script is None:
+        from django_redis import get_redis_connection
+
+        _sliding_window_script = get_redis_connection("default").register_script(_SLIDING_WINDOW_SCRIPT)
+    return _sliding_window_script
+
+
+class RedisRateThrottleMixin:
+    """Reemplaza el historial en caché de ``SimpleRateThrottle`` por una ventana deslizante en Redis."""
+
+    key_prefix = "throttle:window"
+
+    def allow_request(self, request, view):
+        self._redis_wait = None
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            wait_us = int(_sliding_window()(
+                keys=[f"{self.key_prefix}:{self.key}"],
+                args=[int(self.duration * 1_000_000), self.num_requests, uuid.uuid4().hex],
+            ))
+        except Exception as exc:
+            logger.warning("Throttle en Redis no disponible (%s): %s", self.key, exc)
+            self._redis_wait = False
+            return super().allow_request(request, view)
+
+        if wait_us < 0:
+            return True
+        self._redis_wait = wait_us / 1_000_000
+        return self.throttle_failure()
+
+    def wait(self):
+        if self._redis_wait is False:
+            return super().wait()
+        return self._redis_wait
+
+
+class RedisSimpleRateThrottle(RedisRateThrottleMixin, throttling.SimpleRateThrottle):
+    pass
+
+
+class RedisAnonRateThrottle(RedisRateThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class RedisUserRateThrottle(RedisRateThrottleMixin, throttling.UserRateThrottle):
+    pass
+
+
+class RedisScopedRateThrottle(RedisRateThrottleMixin, throttling.ScopedRateThrottle):
+    def allow_request(self, request, view):
+        # Mismo paso previo que ScopedRateThrottle: el scope sale de la vista
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
 
 
-class BurstAnonThrottle(AnonRateThrottle):
+class BurstAnonThrottle(RedisAnonRateThrottle):
     """Rate limit para ráfagas de usuarios anónimos."""
     scope = "burst_anon"   # REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['burst_anon'] = '20/min'
 
 
-class SustainedAnonThrottle(AnonRateThrottle):
+class SustainedAnonThrottle(RedisAnonRateThrottle):
     """Rate limit sostenido para usuarios anónimos."""
     scope = "sustained_anon"  # '200/hour'
 
 
-class BurstUserThrottle(UserRateThrottle):
+class BurstUserThrottle(RedisUserRateThrottle):
     """Rate limit para ráfagas de usuarios autenticados."""
     scope = "burst_user"   # '60/min'
 
 
-class LoginThrottle(AnonRateThrottle):
+class LoginThrottle(RedisAnonRateThrottle):
     """Rate limit restrictivo para intentos de login."""
     scope = "login"        # '5/min'
 
 
-class PasswordChangeThrottle(UserRateThrottle):
+class PasswordChangeThrottle(RedisUserRateThrottle):
     """
     Rate limit restrictivo para cambios de contraseña.
 
@@ -34,7 +137,7 @@ class PasswordChangeThrottle(UserRateThrottle):
     """
     scope = "password_change"  # '3/hour'
 
-class AdminThrottle(UserRateThrottle):
+class AdminThrottle(RedisUserRateThrottle):
     scope = "admin"  # '1000/hour' en settings
     
     def allow_request(self, request, view):
@@ -0,0 +1,190 @@
+"""
+Core Infra - Sink de auditoría por lotes.
+
+Las entradas de alto volumen (``ADMIN_ENDPOINT_HIT``, que generan
+``AdminAuditMiddleware`` y las vistas de analytics) no se insertan dentro de
+la request: se encolan en un buffer acotado del proceso y un hilo en segundo
+plano las escribe con ``bulk_create``. El resto de acciones (cancelaciones,
+ajustes financieros, datos clínicos, consentimientos) se siguen escribiendo
+de forma síncrona en ``safe_audit_log``.
+
+- Buffer lleno: la entrada se escribe en la request; nunca se descarta.
+- Lote que falla: se reintenta fila a fila para no perder el resto.
+- Apagado: ``atexit`` detiene el hilo y vacía el buffer.
+- Fork (gunicorn, celery prefork): el hijo crea su propio buffer e hilo.
+
+``created_at`` refleja el momento del flush (como mucho
+``AUDIT_FLUSH_INTERVAL`` segundos después del evento); los detalles de
+``AdminAuditMiddleware`` incluyen la hora exacta en ``at``.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from core.infra.metrics import get_counter, get_histogram
+
+logger = logging.getLogger(__name__)
+
+audit_entries = get_counter(
+    "audit_log_entries_total",
+    "Entradas de auditoría enviadas al sink por modo de escritura",
+    ["mode"],
+)
+audit_flush_size = get_histogram(
+    "audit_log_flush_size",
+    "Entradas de auditoría insertadas por lote",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+ASYNC_ACTIONS = frozenset({"ADMIN_ENDPOINT_HIT"})
+
+
+class AuditSink:
+    """Buffer acotado de ``AuditLog`` sin guardar con escritura por lotes."""
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._reset()
+
+    def _reset(self):
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def accepts(self, action) -> bool:
+        return str(action) in ASYNC_ACTIONS
+
+    def submit(self, entry) -> bool:
+        """
+        Encola un ``AuditLog`` sin guardar. Si el buffer está lleno lo guarda
+        en el momento y devuelve ``False``.
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            audit_entries.labels(mode="overflow").inc()
+            entry.save(force_insert=True)
+            return False
+        audit_entries.labels(mode="async").inc()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Escribe todo lo encolado y devuelve cuántas entradas procesó."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return written
+                self._write(batch)
+                written += len(batch)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Detiene el hilo y escribe lo que quede en el buffer."""
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._start_lock:
+            pid = os.getpid()
+            if self._pid != pid:
+                # Tras un fork, el buffer heredado lo vacía el proceso padre
+                self._reset()
+                self._pid = pid
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-sink", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                close_old_connections()
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Error vaciando el buffer de auditoría")
+        finally:
+            connection.close()
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        from core.models import AuditLog  # import local para evitar ciclos
+
+        try:
+            with transaction.atomic():
+                AuditLog.objects.bulk_create(batch)
+        except Exception:
+            logger.exception(
+                "Fallo al insertar %d entradas de auditoría; reintentando una a una",
+                len(batch),
+            )
+            for entry in batch:
+                try:
+                    with transaction.atomic():
+                        entry.save(force_insert=True)
+                except Exception:
+                    audit_entries.labels(mode="dropped").inc()
+                    logger.exception(
+                        "Entrada de auditoría descartada: %s %s", entry.action, entry.details
+                    )
+        audit_flush_size.observe(len(batch))
+
+
+_sink: Optional[AuditSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink() -> Optional[AuditSink]:
+    """Sink del proceso, o ``None`` si ``AUDIT_ASYNC_ENABLED`` está apagado."""
+    global _sink
+    if not getattr(settings, "AUDIT_ASYNC_ENABLED", True):
+        return None
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = AuditSink(
+                    max_size=getattr(settings, "AUDIT_BUFFER_SIZE", 10000),
+                    batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 200),
+                    flush_interval=getattr(settings, "AUDIT_FLUSH_INTERVAL", 2.0),
+                )
+                atexit.register(_sink.shutdown)
+    return _sink
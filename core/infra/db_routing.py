@@ -0,0 +1,225 @@
+"""
+Core Infra - Enrutamiento de lecturas a la réplica.
+
+Las cargas de solo lectura pesadas (KPIs de analytics, Query Builder,
+analytics financieras, exportaciones) pueden ir a la base ``replica``
+(``DATABASE_REPLICA_URL``) en lugar de competir con reservas y pagos en la
+primaria. Nada va a la réplica por defecto: solo lo que corre dentro de
+``using_replica()``.
+
+Dentro del bloque se sigue leyendo de la primaria cuando:
+
+- No hay alias ``replica`` configurado (desarrollo, tests).
+- Hay un ``transaction.atomic()`` abierto en la primaria: la transacción
+  tiene que ver sus propias escrituras.
+- El contexto escribió hace menos de ``REPLICA_PIN_SECONDS`` segundos
+  (read-your-writes): ``db_for_write`` fija las lecturas a la primaria.
+- El retraso de replicación supera ``REPLICA_MAX_LAG_SECONDS`` o la réplica
+  no responde. El retraso se consulta como mucho una vez cada
+  ``REPLICA_LAG_CHECK_INTERVAL`` segundos por proceso.
+
+Las escrituras y las migraciones siempre van a la primaria.
+"""
+import contextvars
+import inspect
+import logging
+import threading
+import time
+from contextlib import ContextDecorator
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.infra.metrics import get_counter
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = "replica"
+
+replica_routing = get_counter(
+    "db_replica_routing_total",
+    "Bloques using_replica() por base elegida y motivo",
+    ["target", "reason"],
+)
+
+# Cero si el servidor no es una réplica o ya aplicó todo lo recibido
+_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_read_alias = contextvars.ContextVar("db_read_alias", default=None)
+_pinned_until = contextvars.ContextVar("db_pinned_until", default=0.0)
+
+_lag_lock = threading.Lock()
+_lag_state = {"checked_at": None, "lag": None}
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in connections.settings
+
+
+def replica_lag() -> float | None:
+    """
+    Segundos de retraso de la réplica (cacheado por proceso), o ``None`` si
+    no se pudo consultar.
+    """
+    interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 10)
+    now = time.monotonic()
+    checked_at = _lag_state["checked_at"]
+    if checked_at is not None and now - checked_at < interval:
+        return _lag_state["lag"]
+
+    with _lag_lock:
+        checked_at = _lag_state["checked_at"]
+        if checked_at is not None and now - checked_at < interval:
+            return _lag_state["lag"]
+        try:
+            with connections[REPLICA_ALIAS].cursor() as cursor:
+                cursor.execute(_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except Exception:
+            logger.warning("No se pudo consultar el retraso de la réplica", exc_info=True)
+            lag = None
+        _lag_state.update(checked_at=now, lag=lag)
+        return lag
+
+
+def reset_replica_state():
+    """Olvida el retraso cacheado y el pin del contexto actual."""
+    with _lag_lock:
+        _lag_state.update(checked_at=None, lag=None)
+    _pinned_until.set(0.0)
+
+
+def is_pinned() -> bool:
+    return _pinned_until.get() > time.monotonic()
+
+
+def pin_to_primary(seconds: float | None = None):
+    """Fija las lecturas del contexto actual a la primaria tras una escritura."""
+    if seconds is None:
+        seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+    _pinned_until.set(max(_pinned_until.get(), time.monotonic() + seconds))
+
+
+def read_alias() -> str:
+    """
+    Decide en este momento a qué base mandar una lectura de solo consulta.
+
+    Sirve para querysets que se evalúan fuera del bloque, como las
+    exportaciones en streaming: ``queryset.using(read_alias())``.
+    """
+    target, reason = _choose()
+    replica_routing.labels(target=target, reason=reason).inc()
+    if reason in ("lag", "unavailable"):
+        logger.info("Lectura enviada a la primaria: réplica %s", reason)
+    return target
+
+
+def _choose() -> tuple[str, str]:
+    if not replica_configured():
+        return DEFAULT_DB_ALIAS, "not_configured"
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS, "atomic"
+    if is_pinned():
+        return DEFAULT_DB_ALIAS, "pinned"
+    lag = replica_lag()
+    if lag is None:
+        return DEFAULT_DB_ALIAS, "unavailable"
+    if lag > getattr(settings, "REPLICA_MAX_LAG_SECONDS", 30):
+        return DEFAULT_DB_ALIAS, "lag"
+    return REPLICA_ALIAS, "ok"
+
+
+class using_replica(ContextDecorator):
+    """
+    Envía a la réplica las lecturas del bloque (o de la función decorada).
+
+    La base se elige una vez al entrar; las escrituras dentro del bloque van
+    a la primaria y fijan a ella las lecturas siguientes.
+
+    Ejemplo:
+        with using_replica():
+            stats = Payment.objects.aggregate(total=Sum("amount"))
+    """
+
+    def __init__(self):
+        self._tokens = []
+
+    def _recreate_cm(self):
+        # Cada llamada a una función decorada usa su propio contexto
+        return type(self)()
+
+    def __enter__(self):
+        self._tokens.append(_read_alias.set(read_alias()))
+        return self
+
+    def __exit__(self, *exc):
+        _read_alias.reset(self._tokens.pop())
+        return False
+
+
+def replica_reads(cls):
+    """
+    Decorador de clase: ejecuta los métodos públicos dentro de ``using_replica()``.
+
+    Pensado para servicios de solo lectura compuestos por mixins (``KpiService``).
+    """
+    for name in dir(cls):
+        attr = inspect.getattr_static(cls, name)
+        if not name.startswith("_") and inspect.isfunction(attr):
+            setattr(cls, name, using_replica()(attr))
+    return cls
+
+
+class ReplicaRouter:
+    """Router de ``DATABASE_ROUTERS`` para el alias ``replica``."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None:
+            return None  # fuera de using_replica(): comportamiento por defecto
+        if alias == REPLICA_ALIAS and not is_pinned():
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Nunca se escribe en la réplica, aunque la instancia venga de ella
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def _reset_pin(**kwargs):
+    # Los hilos de WSGI reutilizan el contexto entre requests
+    _pinned_until.set(0.0)
+
+
+request_started.connect(_reset_pin, dispatch_uid="core.infra.db_routing.reset_pin")
+
+
+__all__ = [
+    "REPLICA_ALIAS",
+    "ReplicaRouter",
+    "is_pinned",
+    "pin_to_primary",
+    "read_alias",
+    "replica_configured",
+    "replica_lag",
+    "replica_reads",
+    "reset_replica_state",
+    "using_replica",
+]
@@ -0,0 +1,192 @@
+"""
+Core Infra - Pools HTTP por proceso.
+
+Sesiones ``requests`` con keep-alive y pool acotado, compartidas dentro de
+cada proceso y descartadas tras un ``fork`` (workers prefork de Celery,
+gunicorn con preload): un socket TLS heredado del padre no debe usarse en
+dos procesos a la vez.
+
+Métricas:
+- ``http_client_requests_total{upstream}``: peticiones enviadas.
+- ``http_client_connections_opened_total{upstream}``: conexiones nuevas.
+  La tasa de reutilización es ``1 - opened / requests``.
+- ``http_client_latency_seconds{upstream,phase}``: ``connect`` (TCP + TLS,
+  solo cuando se abre conexión) y ``server`` (envío hasta recibir cabeceras,
+  descontando la conexión).
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Hashable, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from core.infra.metrics import get_counter, get_histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_POOL_MAXSIZE = 10
+
+http_requests_total = get_counter(
+    "http_client_requests_total",
+    "Peticiones HTTP salientes por upstream",
+    ["upstream"],
+)
+http_connections_opened_total = get_counter(
+    "http_client_connections_opened_total",
+    "Conexiones HTTP nuevas abiertas por upstream (no reutilizadas)",
+    ["upstream"],
+)
+http_latency = get_histogram(
+    "http_client_latency_seconds",
+    "Latencia HTTP saliente por upstream, separada en conexión y servidor",
+    ["upstream", "phase"],
+)
+
+# Tiempo de conexión acumulado por la petición en curso del hilo
+_phase_timings = threading.local()
+
+
+def _timed_connection(base_cls):
+    class TimedConnection(base_cls):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                _phase_timings.connect = getattr(_phase_timings, "connect", 0.0) + (
+                    time.perf_counter() - start
+                )
+
+    TimedConnection.__name__ = f"Timed{base_cls.__name__}"
+    return TimedConnection
+
+
+def _metered_pool(base_cls, upstream):
+    class MeteredPool(base_cls):
+        ConnectionCls = _timed_connection(base_cls.ConnectionCls)
+
+        def _new_conn(self):
+            http_connections_opened_total.labels(upstream=upstream).inc()
+            return super()._new_conn()
+
+    MeteredPool.__name__ = f"Metered{base_cls.__name__}"
+    return MeteredPool
+
+
+class MeteredHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` que mide peticiones, conexiones abiertas y latencia por upstream."""
+
+    def __init__(self, upstream: str, **kwargs):
+        self.upstream = upstream
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _metered_pool(HTTPConnectionPool, self.upstream),
+            "https": _metered_pool(HTTPSConnectionPool, self.upstream),
+        }
+
+    def send(self, request, **kwargs):
+        http_requests_total.labels(upstream=self.upstream).inc()
+        _phase_timings.connect = 0.0
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            connect = _phase_timings.connect
+            if connect:
+                http_latency.labels(upstream=self.upstream, phase="connect").observe(connect)
+        elapsed = time.perf_counter() - start
+        http_latency.labels(upstream=self.upstream, phase="server").observe(max(elapsed - connect, 0.0))
+        return response
+
+
+def build_pooled_session(upstream: str, pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> requests.Session:
+    """
+    Crea una sesión con keep-alive y como máximo ``pool_maxsize`` conexiones
+    por host. ``pool_block=True`` hace esperar a los hilos extra en lugar de
+    abrir conexiones descartables por encima del límite.
+    """
+    session = requests.Session()
+    adapter = MeteredHTTPAdapter(
+        upstream,
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ProcessLocalRegistry:
+    """
+    Registro ``clave -> objeto`` válido solo en el proceso que lo creó.
+
+    Tras un fork el hijo parte de un registro vacío (se detecta por PID y
+    con ``os.register_at_fork``), y ``reset`` cierra los objetos que
+    expongan ``close``.
+    """
+
+    _instances: "list[ProcessLocalRegistry]" = []
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._items: Dict[Hashable, object] = {}
+        self._pid = os.getpid()
+        ProcessLocalRegistry._instances.append(self)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], T]) -> T:
+        if self._pid != os.getpid():
+            self._forget()
+        item = self._items.get(key)
+        if item is None:
+            with self._lock:
+                item = self._items.get(key)
+                if item is None:
+                    item = factory()
+                    self._items[key] = item
+        return item
+
+    def reset(self) -> None:
+        """Cierra y descarta los objetos del proceso actual."""
+        with self._lock:
+            items, self._items = self._items, {}
+        for item in items.values():
+            close = getattr(item, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as exc:  # pragma: no cover - best effort
+                    logger.debug("Error cerrando %s de %s: %s", item, self.name, exc)
+
+    def _forget(self) -> None:
+        # En el hijo no se cierran los sockets heredados: pertenecen al padre
+        self._lock = threading.Lock()
+        self._items = {}
+        self._pid = os.getpid()
+
+    @classmethod
+    def forget_all(cls) -> None:
+        for registry in cls._instances:
+            registry._forget()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ProcessLocalRegistry.forget_all)
+
+
+__all__ = [
+    "DEFAULT_POOL_MAXSIZE",
+    "MeteredHTTPAdapter",
+    "ProcessLocalRegistry",
+    "build_pooled_session",
+]
@@ -2,15 +2,45 @@
 Core Infra - Metrics.
 
 Helpers para exponer métricas Prometheus con fallback no-op si la librería no está disponible.
+
+Cada métrica se crea una sola vez por proceso y se guarda en un registro del
+módulo indexado por ``(nombre, labels)``: ``get_counter``/``get_histogram``/
+``get_gauge`` son una consulta a un dict, también en los hot paths que las
+llaman en cada evento. Si el nombre ya existe en el registro de
+prometheus_client (recarga de módulos, tests) se reutiliza ese collector vía
+``REGISTRY._names_to_collectors`` en lugar de recorrer todos los collectors.
+
+Las métricas con labels pasan por un guard de cardinalidad: admiten como
+mucho ``max_label_sets`` combinaciones distintas (``DEFAULT_MAX_LABEL_SETS``
+por defecto). Las combinaciones nuevas por encima del límite se acumulan en
+una única serie con todos los labels en ``"__overflow__"``, de modo que un
+label sin cota (ids de usuario, teléfonos) no hace crecer la memoria ni el
+scrape.
+
+Las tareas de Celery corren en procesos hijos del worker, que Prometheus no
+consulta: con ``PROMETHEUS_MULTIPROC_DIR`` definido (solo en el worker) cada
+proceso escribe sus valores en ese directorio y ``start_multiprocess_exporter``
+los publica agregados desde el proceso principal.
 """
-from typing import Iterable
+import glob
+import logging
+import os
+import threading
+from typing import Iterable, Optional
 
 try:
-    from prometheus_client import Counter, Histogram
+    from prometheus_client import REGISTRY, Counter, Gauge, Histogram
 except Exception:  # pragma: no cover
+    REGISTRY = None
     Counter = None
+    Gauge = None
     Histogram = None
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LABEL_SETS = 1000
+OVERFLOW_LABEL = "__overflow__"
+
 
 class _NoOpMetric:
     def labels(self, *args, **kwargs):  # pragma: no cover - no-op
@@ -22,57 +52,175 @@ class _NoOpMetric:
     def observe(self, *args, **kwargs):  # pragma: no cover
         return None
 
+    def set(self, *args, **kwargs):  # pragma: no cover
+        return None
+
+
+class _GuardedMetric:
+    """
+    Collector con labels envuelto: cachea los hijos por valores de labels y
+    limita cuántas combinaciones distintas se crean.
+    """
+
+    def __init__(self, metric, labelnames: tuple[str, ...], max_label_sets: int):
+        self._metric = metric
+        self._labelnames = labelnames
+        self._labelset = frozenset(labelnames)
+        self._max_label_sets = max_label_sets
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        self._overflowed = False
+
+    def labels(self, *args, **kwargs):
+        if kwargs:
+            if args or kwargs.keys() != self._labelset:
+                # Llamada inválida: que prometheus_client genere el error habitual
+                return self._metric.labels(*args, **kwargs)
+            key = tuple(str(kwargs[name]) for name in self._labelnames)
+        elif len(args) != len(self._labelnames):
+            return self._metric.labels(*args)
+        else:
+            key = tuple(str(value) for value in args)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+
+        with self._lock:
+            child = self._children.get(key)
+            if child is not None:
+                return child
+            if len(self._children) >= self._max_label_sets:
+                return self._overflow_child()
+            child = self._metric.labels(*key)
+            self._children[key] = child
+            return child
+
+    def _overflow_child(self):
+        key = (OVERFLOW_LABEL,) * len(self._labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._metric.labels(*key)
+            self._children[key] = child
+        if not self._overflowed:
+            self._overflowed = True
+            logger.warning(
+                "Métrica %s superó %d combinaciones de labels %s; las nuevas se agregan en '%s'",
+                getattr(self._metric, "_name", self._metric),
+                self._max_label_sets,
+                list(self._labelnames),
+                OVERFLOW_LABEL,
+            )
+        return child
+
+    def remove(self, *labelvalues):
+        with self._lock:
+            self._children.pop(tuple(str(value) for value in labelvalues), None)
+        self._metric.remove(*labelvalues)
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+        self._metric.clear()
+
+    def __getattr__(self, name):
+        return getattr(self._metric, name)
+
 
 _counter_cache: dict[tuple[str, tuple[str, ...]], object] = {}
 _hist_cache: dict[tuple[str, tuple[str, ...]], object] = {}
+_gauge_cache: dict[tuple[str, tuple[str, ...]], object] = {}
+_registry_lock = threading.Lock()
 
 
-def get_counter(name: str, doc: str, labelnames: Iterable[str] = ()) -> object:
-    key = (name, tuple(labelnames))
-    if key in _counter_cache:
-        return _counter_cache[key]
-    if Counter:
-        try:
-            metric = Counter(name, doc, list(labelnames))
-        except ValueError:
-            # La métrica ya existe en el registro (común en tests)
-            # Intentar obtenerla del registro
-            from prometheus_client import REGISTRY
-            for collector in REGISTRY._collector_to_names.keys():
-                if hasattr(collector, '_name') and collector._name == name:
-                    metric = collector
-                    break
-            else:
-                # Si no se encuentra, usar un no-op
-                metric = _NoOpMetric()
-    else:
-        metric = _NoOpMetric()
-    _counter_cache[key] = metric
-    return metric
-
-
-def get_histogram(name: str, doc: str, labelnames: Iterable[str] = (), buckets: Iterable[float] | None = None) -> object:
+def _registered_collector(name: str):
+    if REGISTRY is None:  # pragma: no cover
+        return None
+    return REGISTRY._names_to_collectors.get(name)
+
+
+def _get_metric(cache, factory, name, doc, labelnames, max_label_sets, **kwargs):
     key = (name, tuple(labelnames))
-    if key in _hist_cache:
-        return _hist_cache[key]
-    if Histogram:
-        try:
-            if buckets:
-                metric = Histogram(name, doc, list(labelnames), buckets=buckets)
-            else:
-                metric = Histogram(name, doc, list(labelnames))
-        except ValueError:
-            # La métrica ya existe en el registro (común en tests)
-            # Intentar obtenerla del registro
-            from prometheus_client import REGISTRY
-            for collector in REGISTRY._collector_to_names.keys():
-                if hasattr(collector, '_name') and collector._name == name:
-                    metric = collector
-                    break
-            else:
-                # Si no se encuentra, usar un no-op
-                metric = _NoOpMetric()
-    else:
-        metric = _NoOpMetric()
-    _hist_cache[key] = metric
-    return metric
+    metric = cache.get(key)
+    if metric is not None:
+        return metric
+
+    with _registry_lock:
+        metric = cache.get(key)
+        if metric is not None:
+            return metric
+        if factory:
+            try:
+                metric = factory(name, doc, list(key[1]), **kwargs)
+            except ValueError:
+                # La métrica ya existe en el registro (común en tests)
+                metric = _registered_collector(name) or _NoOpMetric()
+        else:
+            metric = _NoOpMetric()
+        if key[1] and not isinstance(metric, _NoOpMetric):
+            metric = _GuardedMetric(
+                metric,
+                tuple(getattr(metric, "_labelnames", key[1])),
+                max_label_sets or DEFAULT_MAX_LABEL_SETS,
+            )
+        cache[key] = metric
+        return metric
+
+
+def get_counter(
+    name: str, doc: str, labelnames: Iterable[str] = (), max_label_sets: Optional[int] = None
+) -> object:
+    return _get_metric(_counter_cache, Counter, name, doc, labelnames, max_label_sets)
+
+
+def get_histogram(
+    name: str,
+    doc: str,
+    labelnames: Iterable[str] = (),
+    buckets: Iterable[float] | None = None,
+    max_label_sets: Optional[int] = None,
+) -> object:
+    kwargs = {"buckets": buckets} if buckets else {}
+    return _get_metric(_hist_cache, Histogram, name, doc, labelnames, max_label_sets, **kwargs)
+
+
+def get_gauge(
+    name: str, doc: str, labelnames: Iterable[str] = (), max_label_sets: Optional[int] = None
+) -> object:
+    return _get_metric(_gauge_cache, Gauge, name, doc, labelnames, max_label_sets)
+
+
+def start_multiprocess_exporter(port, path: Optional[str] = None) -> bool:
+    """
+    Publica en ``port`` las métricas de todos los procesos que escriben en
+    ``PROMETHEUS_MULTIPROC_DIR``.
+
+    Borra antes los archivos de ejecuciones anteriores. Devuelve False si el
+    modo multiproceso no está configurado o el puerto no está disponible.
+    """
+    path = path or os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path or not port or REGISTRY is None:
+        return False
+    from prometheus_client import CollectorRegistry, multiprocess, start_http_server
+
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    try:
+        start_http_server(int(port), registry=registry)
+    except OSError as exc:
+        logger.warning("No se pudo exponer las métricas en el puerto %s: %s", port, exc)
+        return False
+    logger.info("Métricas multiproceso expuestas en el puerto %s (%s)", port, path)
+    return True
+
+
+def mark_process_dead(pid: int) -> None:
+    """Descarta los gauges ``live*`` de un proceso hijo que terminó."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path or REGISTRY is None:
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(pid, path)
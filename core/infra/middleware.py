@@ -3,6 +3,7 @@ Core Infra - Middleware.
 """
 import uuid
 import time
+import random
 import logging
 from dataclasses import dataclass
 from typing import Optional
@@ -12,6 +13,8 @@ from django.utils.timezone import now
 from django.conf import settings
 from django.http import HttpRequest
 
+from core.infra.metrics import get_histogram
+from core.infra.profiling import RequestProfile
 from core.utils import get_client_ip, safe_audit_log
 
 logger = logging.getLogger(__name__)
@@ -19,6 +22,32 @@ logger = logging.getLogger(__name__)
 _REQUEST_ID_HEADER = "HTTP_X_REQUEST_ID"
 _RESPONSE_ID_HEADER = "X-Request-ID"
 
+_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+request_db_queries = get_histogram(
+    "http_request_db_queries",
+    "Consultas SQL por request (muestra del profiler)",
+    ["route"],
+    buckets=_COUNT_BUCKETS,
+)
+request_db_duplicate_queries = get_histogram(
+    "http_request_db_duplicate_queries",
+    "Consultas SQL repetidas por request (muestra del profiler)",
+    ["route"],
+    buckets=_COUNT_BUCKETS,
+)
+request_db_seconds = get_histogram(
+    "http_request_db_seconds",
+    "Tiempo total en SQL por request (muestra del profiler)",
+    ["route"],
+)
+request_cache_lookups = get_histogram(
+    "http_request_cache_lookups",
+    "Lecturas de caché por request y resultado (muestra del profiler)",
+    ["route", "result"],
+    buckets=_COUNT_BUCKETS,
+)
+
 @dataclass
 class RequestMeta:
     id: str
@@ -142,3 +171,76 @@ class PerformanceLoggingMiddleware(MiddlewareMixin):
                 }
             )
         return None
+
+
+class RequestProfilerMiddleware:
+    """
+    Perfil de SQL y caché para una muestra de requests (opt-in).
+
+    Con probabilidad ``REQUEST_PROFILER_SAMPLE_RATE`` (0 = desactivado) la
+    request se ejecuta dentro de ``RequestProfile.capture()`` y se publican
+    histogramas por ruta (``view_name`` del resolver). Si la request supera
+    ``SLOW_REQUEST_THRESHOLD`` o repite ``REQUEST_PROFILER_DUPLICATE_THRESHOLD``
+    consultas, se escribe además una línea de log estructurada con las
+    consultas más repetidas. Las requests no muestreadas solo pagan un
+    ``random.random()``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample_rate = getattr(settings, "REQUEST_PROFILER_SAMPLE_RATE", 0.0)
+        if sample_rate <= 0 or random.random() >= sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        start = time.perf_counter()
+        with profile.capture():
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        route = self._route(request)
+        duplicates = profile.duplicate_queries
+        request_db_queries.labels(route=route).observe(profile.queries)
+        request_db_duplicate_queries.labels(route=route).observe(duplicates)
+        request_db_seconds.labels(route=route).observe(profile.db_time)
+        request_cache_lookups.labels(route=route, result="hit").observe(profile.cache_hits)
+        request_cache_lookups.labels(route=route, result="miss").observe(profile.cache_misses)
+
+        slow_threshold = getattr(settings, "SLOW_REQUEST_THRESHOLD", 1.0)
+        duplicate_threshold = getattr(settings, "REQUEST_PROFILER_DUPLICATE_THRESHOLD", 10)
+        if duration > slow_threshold or duplicates >= duplicate_threshold:
+            logger.warning(
+                "Request profile: %s %s - %.2fs, %d queries (%d repetidas), db %.3fs, cache %d/%d",
+                request.method,
+                route,
+                duration,
+                profile.queries,
+                duplicates,
+                profile.db_time,
+                profile.cache_hits,
+                profile.cache_misses,
+                extra={
+                    'request_id': getattr(request, 'request_id', None),
+                    'route': route,
+                    'path': request.path,
+                    'method': request.method,
+                    'status_code': response.status_code,
+                    'duration': duration,
+                    'db_queries': profile.queries,
+                    'db_duplicate_queries': duplicates,
+                    'db_time': profile.db_time,
+                    'cache_hits': profile.cache_hits,
+                    'cache_misses': profile.cache_misses,
+                    'top_duplicates': profile.top_duplicates(),
+                }
+            )
+        return response
+
+    @staticmethod
+    def _route(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unresolved"
+        return match.view_name or match.route or "unresolved"
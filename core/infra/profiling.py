@@ -0,0 +1,95 @@
+"""
+Core Infra - Perfil de SQL y caché por request.
+
+``RequestProfile.capture()`` registra, mientras dura el bloque:
+
+- Cada consulta SQL vía ``connection.execute_wrapper`` en todas las bases
+  configuradas: cantidad, tiempo total y la huella de cada sentencia (el SQL
+  parametrizado, con las listas ``IN (%s, %s, ...)`` colapsadas) para
+  detectar consultas repetidas (N+1).
+- Los aciertos y fallos de ``get``/``get_many`` en todas las cachés. Las
+  instancias de ``caches[alias]`` son locales al hilo, así que envolverlas
+  solo afecta a la request en curso.
+
+Lo usa ``RequestProfilerMiddleware`` sobre una muestra de las requests.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+_IN_LIST_RE = re.compile(r"%s(?:, %s)+")
+_MISSING = object()
+
+
+def fingerprint(sql: str) -> str:
+    """SQL parametrizado con las listas de placeholders colapsadas."""
+    return _IN_LIST_RE.sub("%s, ...", sql)
+
+
+class RequestProfile:
+    """Contadores de SQL y caché de una request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def duplicate_queries(self) -> int:
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
+
+    def top_duplicates(self, limit: int = 3):
+        return [
+            (sql[:200], count)
+            for sql, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @contextmanager
+    def capture(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            for alias in settings.CACHES:
+                self._wrap_cache(caches[alias], stack)
+            yield self
+
+    def _wrap_cache(self, cache, stack):
+        original_get = cache.get
+        original_get_many = cache.get_many
+
+        def get(key, default=None, *args, **kwargs):
+            value = original_get(key, _MISSING, *args, **kwargs)
+            if value is _MISSING:
+                self.cache_misses += 1
+                return default
+            self.cache_hits += 1
+            return value
+
+        def get_many(keys, *args, **kwargs):
+            keys = list(keys)
+            values = original_get_many(keys, *args, **kwargs)
+            self.cache_hits += len(values)
+            self.cache_misses += len(keys) - len(values)
+            return values
+
+        cache.get = get
+        cache.get_many = get_many
+        stack.callback(cache.__dict__.pop, "get", None)
+        stack.callback(cache.__dict__.pop, "get_many", None)
@@ -0,0 +1,49 @@
+"""
+Core Infra - Cliente Twilio compartido.
+
+``twilio.rest.Client`` es seguro entre hilos y barato de reutilizar; crear
+uno por mensaje implica una conexión y un handshake TLS nuevos en cada
+envío. Aquí se mantiene un cliente por credenciales y por proceso, sobre
+una sesión HTTP con keep-alive (ver ``core.infra.http_pool``).
+"""
+from django.conf import settings
+
+from core.infra.http_pool import ProcessLocalRegistry, build_pooled_session
+
+_clients = ProcessLocalRegistry("twilio")
+
+
+def _build_client(account_sid, auth_token):
+    from twilio.http.http_client import TwilioHttpClient
+    from twilio.rest import Client
+
+    http_client = TwilioHttpClient(
+        pool_connections=True,
+        timeout=getattr(settings, "TWILIO_TIMEOUT", 10),
+    )
+    http_client.session = build_pooled_session(
+        "twilio",
+        pool_maxsize=getattr(settings, "TWILIO_HTTP_POOL_MAXSIZE", 10),
+    )
+    client = Client(account_sid, auth_token, http_client=http_client)
+    # Permite a ProcessLocalRegistry.reset cerrar la sesión
+    client.close = http_client.session.close
+    return client
+
+
+def get_twilio_client(account_sid=None, auth_token=None):
+    """Devuelve el cliente Twilio del proceso para las credenciales dadas."""
+    account_sid = account_sid or settings.TWILIO_ACCOUNT_SID
+    auth_token = auth_token or settings.TWILIO_AUTH_TOKEN
+    return _clients.get_or_create(
+        (account_sid, auth_token),
+        lambda: _build_client(account_sid, auth_token),
+    )
+
+
+def reset_twilio_clients():
+    """Cierra los clientes del proceso (p. ej. al iniciar un worker de Celery)."""
+    _clients.reset()
+
+
+__all__ = ["get_twilio_client", "reset_twilio_clients"]
@@ -3,6 +3,7 @@ from drf_spectacular.openapi import AutoSchema
 
 class SimpleJWTAuthenticationScheme(OpenApiAuthenticationExtension):
     target_class = "rest_framework_simplejwt.authentication.JWTAuthentication"
+    match_subclasses = True  # incluye users.authentication.CachedJWTAuthentication
     name = "JWTAuth"
 
     def get_security_definition(self, auto_schema):
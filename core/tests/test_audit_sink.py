@@ -0,0 +1,92 @@
+import time
+from unittest import mock
+
+import pytest
+
+from core import utils
+from core.infra import audit_sink
+from core.infra.audit_sink import AuditSink
+from core.models import AuditLog
+
+
+def _entry(details="x"):
+    return AuditLog(action=AuditLog.Action.ADMIN_ENDPOINT_HIT, details=details)
+
+
+@pytest.fixture
+def sink():
+    # Intervalo largo: el hilo no vacía el buffer salvo que se despierte
+    sink = AuditSink(max_size=3, batch_size=100, flush_interval=3600)
+    yield sink
+    sink.shutdown()
+
+
+@pytest.mark.django_db
+def test_entries_wait_in_buffer_until_flush(sink):
+    for index in range(3):
+        assert sink.submit(_entry(str(index))) is True
+
+    assert AuditLog.objects.count() == 0
+    assert sink.flush() == 3
+    assert set(AuditLog.objects.values_list("details", flat=True)) == {"0", "1", "2"}
+
+
+@pytest.mark.django_db
+def test_full_buffer_writes_synchronously(sink):
+    for index in range(3):
+        sink.submit(_entry(str(index)))
+
+    assert sink.submit(_entry("overflow")) is False
+    assert list(AuditLog.objects.values_list("details", flat=True)) == ["overflow"]
+    assert sink.pending() == 3
+
+
+@pytest.mark.django_db
+def test_failed_batch_is_retried_row_by_row(sink):
+    sink.submit(_entry("ok"))
+    sink.submit(AuditLog(action="X" * 100, details="demasiado largo"))
+
+    assert sink.flush() == 2
+    assert list(AuditLog.objects.values_list("details", flat=True)) == ["ok"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_background_thread_flushes_full_batches():
+    sink = AuditSink(max_size=100, batch_size=2, flush_interval=3600)
+    try:
+        sink.submit(_entry("a"))
+        sink.submit(_entry("b"))
+        deadline = time.monotonic() + 5
+        while AuditLog.objects.count() < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert AuditLog.objects.count() == 2
+    finally:
+        sink.shutdown()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_shutdown_flushes_pending_entries():
+    sink = AuditSink(max_size=100, batch_size=100, flush_interval=3600)
+    sink.submit(_entry("pendiente"))
+
+    sink.shutdown()
+
+    assert AuditLog.objects.filter(details="pendiente").exists()
+
+
+@pytest.mark.django_db
+def test_safe_audit_log_only_buffers_high_volume_actions(settings, admin_user):
+    settings.AUDIT_ASYNC_ENABLED = True
+    fake_sink = AuditSink(max_size=10, batch_size=10, flush_interval=3600)
+    with mock.patch.object(audit_sink, "_sink", fake_sink), mock.patch.object(
+        fake_sink, "_ensure_worker"
+    ):
+        buffered = utils.safe_audit_log(action=AuditLog.Action.ADMIN_ENDPOINT_HIT, admin_user=admin_user)
+        critical = utils.safe_audit_log(action=AuditLog.Action.FLAG_NON_GRATA, admin_user=admin_user)
+
+        assert fake_sink.pending() == 1
+        assert not AuditLog.objects.filter(pk=buffered.pk).exists()
+        assert AuditLog.objects.filter(pk=critical.pk).exists()
+
+        fake_sink.flush()
+    assert AuditLog.objects.filter(pk=buffered.pk, admin_user=admin_user).exists()
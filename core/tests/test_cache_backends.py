@@ -0,0 +1,68 @@
+import zlib
+from unittest import mock
+
+from django.core.cache import cache, caches
+
+from core.infra import cache_backends
+from core.infra.cache_backends import ThresholdZlibCompressor
+from core.utils.caching import payload_cache
+
+
+def _raw(alias, key):
+    backend = caches[alias]
+    return backend.client.get_client(write=False).get(backend.make_key(key))
+
+
+def _analytics_payload():
+    return {
+        "series": [
+            {"date": f"2025-01-{day % 28 + 1:02d}", "revenue": day * 1500.5, "label": "Servicios confirmados"}
+            for day in range(400)
+        ]
+    }
+
+
+def test_compressor_only_compresses_above_threshold():
+    compressor = ThresholdZlibCompressor({"COMPRESS_MIN_LENGTH": 100})
+    assert compressor.compress(b"x" * 50) == b"x" * 50
+    compressed = compressor.compress(b"x" * 500)
+    assert zlib.decompress(compressed) == b"x" * 500
+
+
+def test_payload_alias_compresses_large_values_and_round_trips():
+    payload = _analytics_payload()
+    payload_cache.set("test:payload", payload)
+    cache.set("test:payload", payload)
+
+    assert payload_cache.get("test:payload") == payload
+    assert len(_raw("payloads", "test:payload")) < len(_raw("default", "test:payload")) / 3
+
+    payload_cache.set("test:small", "hola")
+    assert payload_cache.get("test:small") == "hola"
+
+
+def test_aliases_do_not_share_keys():
+    cache.set("test:shared", "default")
+    payload_cache.set("test:shared", "payload")
+    assert cache.get("test:shared") == "default"
+    assert payload_cache.get("test:shared") == "payload"
+
+
+def test_client_publishes_hits_misses_and_size_per_alias():
+    with mock.patch.object(cache_backends, "cache_requests") as requests, mock.patch.object(
+        cache_backends, "cache_value_bytes"
+    ) as value_bytes:
+        client = cache_backends.InstrumentedRedisClient(
+            caches["payloads"]._server, caches["payloads"]._params, caches["payloads"]
+        )
+        client.set("test:metrics", _analytics_payload())
+        client.get("test:metrics")
+        client.get("test:missing")
+        client.get_many(["test:metrics", "test:missing", "test:other"])
+
+    requests.labels.assert_any_call(cache="payloads", result="hit")
+    requests.labels.assert_any_call(cache="payloads", result="miss")
+    hits = requests.labels.return_value.inc.call_args_list
+    assert [call.args for call in hits] == [(), (), (1,), (2,)]
+    value_bytes.labels.assert_called_once_with(cache="payloads")
+    value_bytes.labels.return_value.observe.assert_called_once()
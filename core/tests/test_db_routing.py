@@ -0,0 +1,125 @@
+import csv
+import io
+from datetime import date
+from unittest import mock
+
+import pytest
+from django.core.signals import request_started
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import force_authenticate
+
+from core.infra import db_routing
+from core.infra.db_routing import REPLICA_ALIAS, read_alias, reset_replica_state, using_replica
+from users.models import CustomUser
+from users.views.admin_export import UserExportView
+
+
+@pytest.fixture
+def replica(request, django_db_setup):
+    """Segundo alias ``replica`` contra la misma base de test (sin transacción envolvente)."""
+    connections.settings[REPLICA_ALIAS] = {**connections["default"].settings_dict}
+    request.applymarker(pytest.mark.django_db(transaction=True, databases=["default", REPLICA_ALIAS]))
+    request.getfixturevalue("transactional_db")
+    reset_replica_state()
+    yield connections[REPLICA_ALIAS]
+    connections[REPLICA_ALIAS].close()
+    del connections[REPLICA_ALIAS]
+    del connections.settings[REPLICA_ALIAS]
+    reset_replica_state()
+
+
+@pytest.fixture
+def user(replica):
+    user = CustomUser.objects.create_user(phone_number="+573001112233", password="pw")
+    reset_replica_state()  # la creación fija las lecturas a la primaria
+    return user
+
+
+def _user_queries(captured):
+    return [q["sql"] for q in captured.captured_queries if "users_customuser" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_without_replica_reads_stay_on_default():
+    with using_replica():
+        assert CustomUser.objects.all().db == "default"
+
+
+def test_reads_inside_block_go_to_replica(user, replica):
+    with CaptureQueriesContext(replica) as captured:
+        with using_replica():
+            assert CustomUser.objects.filter(pk=user.pk).exists()
+
+    assert len(_user_queries(captured)) == 1
+    assert CustomUser.objects.all().db == "default"
+
+
+def test_write_pins_following_reads_to_primary(user, settings):
+    settings.REPLICA_PIN_SECONDS = 60
+    with using_replica():
+        assert CustomUser.objects.all().db == REPLICA_ALIAS
+        user.first_name = "Ana"
+        user.save(update_fields=["first_name"])
+        assert CustomUser.objects.all().db == "default"
+
+    with using_replica():
+        assert CustomUser.objects.all().db == "default"
+
+    # Una request nueva empieza sin pin
+    request_started.send(sender=None)
+    with using_replica():
+        assert CustomUser.objects.all().db == REPLICA_ALIAS
+
+
+def test_pin_expires(user, settings):
+    settings.REPLICA_PIN_SECONDS = 0
+    user.save(update_fields=["first_name"])
+    with using_replica():
+        assert CustomUser.objects.all().db == REPLICA_ALIAS
+
+
+def test_open_transaction_stays_on_primary(user):
+    with transaction.atomic(), using_replica():
+        assert CustomUser.objects.all().db == "default"
+
+
+@pytest.mark.parametrize("lag", [120.0, None])
+def test_lagging_or_unreachable_replica_falls_back_to_primary(user, lag):
+    with mock.patch.object(db_routing, "replica_lag", return_value=lag):
+        with using_replica():
+            assert CustomUser.objects.all().db == "default"
+        assert read_alias() == "default"
+
+
+def test_lag_is_checked_once_per_interval(replica, settings):
+    settings.REPLICA_LAG_CHECK_INTERVAL = 60
+    with CaptureQueriesContext(replica) as captured:
+        assert db_routing.replica_lag() == 0
+        assert db_routing.replica_lag() == 0
+    assert len(captured) == 1
+
+
+def test_decorated_services_read_from_replica(user, replica):
+    from analytics.services import KpiService
+
+    service = KpiService(date(2025, 1, 1), date(2025, 1, 31))
+    with CaptureQueriesContext(replica) as captured:
+        service.get_business_kpis()
+    assert any("spa_appointment" in q["sql"] for q in captured.captured_queries)
+
+
+def test_export_streams_from_replica(user, replica, api_rf):
+    admin = CustomUser.objects.create_user(
+        phone_number="+573009999999", password="pw", role=CustomUser.Role.ADMIN, is_staff=True
+    )
+    reset_replica_state()
+    request = api_rf.get("/api/v1/users/admin/export/", {"format": "csv"})
+    force_authenticate(request, user=admin)
+
+    with CaptureQueriesContext(replica) as captured:
+        response = UserExportView.as_view()(request)
+        content = b"".join(response.streaming_content).decode("utf-8")
+
+    assert len(list(csv.reader(io.StringIO(content)))) == 3
+    assert _user_queries(captured)
@@ -0,0 +1,92 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from core.infra.http_pool import ProcessLocalRegistry, build_pooled_session
+from core.infra.twilio_client import get_twilio_client, reset_twilio_clients
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = b'{"sid": "SM123", "status": "queued"}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _sample(name, upstream):
+    return REGISTRY.get_sample_value(name, {"upstream": upstream}) or 0
+
+
+def test_pooled_session_reuses_connection(stub_server):
+    session = build_pooled_session("stub-reuse")
+    opened_before = _sample("http_client_connections_opened_total", "stub-reuse")
+
+    for _ in range(20):
+        assert session.post(f"{stub_server}/messages", data={"Body": "hola"}).status_code == 201
+
+    assert _sample("http_client_requests_total", "stub-reuse") >= 20
+    assert _sample("http_client_connections_opened_total", "stub-reuse") - opened_before == 1
+
+
+def test_latency_split_by_connect_and_server_phase(stub_server):
+    session = build_pooled_session("stub-phase")
+
+    for _ in range(3):
+        session.post(f"{stub_server}/messages", data={"Body": "hola"})
+
+    def count(phase):
+        return REGISTRY.get_sample_value(
+            "http_client_latency_seconds_count", {"upstream": "stub-phase", "phase": phase}
+        )
+
+    # Solo la primera petición abre conexión
+    assert count("connect") == 1
+    assert count("server") == 3
+
+
+def test_registry_returns_same_object_and_forgets_after_fork():
+    registry = ProcessLocalRegistry("test")
+    first = registry.get_or_create("key", object)
+    assert registry.get_or_create("key", object) is first
+
+    with patch("core.infra.http_pool.os.getpid", return_value=-1):
+        assert registry.get_or_create("key", object) is not first
+
+
+def test_twilio_client_is_shared_per_credentials(stub_server):
+    sid = "AC1"
+    client = get_twilio_client(sid, "token")
+    assert get_twilio_client(sid, "token") is client
+    assert get_twilio_client("AC2", "token") is not client
+
+    # El cliente HTTP de Twilio usa la sesión con keep-alive del pool
+    for _ in range(5):
+        response = client.http_client.request("POST", f"{stub_server}/2010-04-01/Messages.json", data={"To": "x"})
+        assert response.status_code == 201
+
+    reset_twilio_clients()
+    assert get_twilio_client(sid, "token") is not client
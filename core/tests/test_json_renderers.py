@@ -0,0 +1,90 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core.api import renderers
+from core.api.parsers import FastJSONParser
+from core.api.renderers import FastJSONRenderer
+
+
+def _both(data, accepted_media_type=None, renderer_context=None):
+    return (
+        FastJSONRenderer().render(data, accepted_media_type, renderer_context),
+        JSONRenderer().render(data, accepted_media_type, renderer_context),
+    )
+
+
+def _payload():
+    return {
+        "id": uuid.UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6"),
+        "price": Decimal("150000.50"),
+        "rate": Decimal("0.19"),
+        "start": datetime(2025, 3, 1, 14, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        "naive": datetime(2025, 3, 1, 9, 0),
+        "day": date(2025, 3, 1),
+        "at": time(9, 15, 0, 500),
+        "duration": timedelta(minutes=90),
+        "label": gettext_lazy("Confirmada"),
+        "name": "Masaje relajante ñandú",
+        "tags": {"spa"},
+        "items": [{"qty": 2, "ok": True, "note": None}],
+        7: "clave no string",
+    }
+
+
+def test_output_matches_drf_json_renderer():
+    fast, stdlib = _both(_payload())
+    assert fast == stdlib
+
+
+def test_line_separators_are_escaped_like_drf():
+    fast, stdlib = _both({"text": "a b c"})
+    assert fast == stdlib
+    assert b"\\u2028" in fast
+
+
+@pytest.mark.parametrize("value", [1e16, 1.5e-05, 1e-07, Decimal("0.00001")])
+def test_floats_python_writes_differently_fall_back(value):
+    fast, stdlib = _both({"value": value, "list": [value]})
+    assert fast == stdlib
+
+
+def test_indent_request_falls_back_to_stdlib():
+    with mock.patch.object(renderers.orjson, "dumps") as dumps:
+        fast, stdlib = _both({"a": 1}, "application/json; indent=4")
+    dumps.assert_not_called()
+    assert fast == stdlib
+
+
+def test_encoder_errors_keep_drf_behavior():
+    with pytest.raises(ValueError):
+        FastJSONRenderer().render({"at": time(9, 0, tzinfo=dt_timezone.utc)})
+    assert FastJSONRenderer().render(None) == b""
+
+
+def test_parser_matches_stdlib():
+    body = '{"name":"Ana","amount":"10.50","ids":[1,2],"nested":{"ok":true}}'.encode()
+    assert FastJSONParser().parse(io.BytesIO(body)) == {
+        "name": "Ana",
+        "amount": "10.50",
+        "ids": [1, 2],
+        "nested": {"ok": True},
+    }
+
+
+def test_parser_falls_back_for_values_orjson_rejects():
+    big = 2 ** 70
+    assert FastJSONParser().parse(io.BytesIO(f'{{"n": {big}}}'.encode())) == {"n": big}
+
+
+@pytest.mark.parametrize("body", [b"", b"{invalid", b'{"n": NaN}'])
+def test_parser_invalid_body_raises_parse_error(body):
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(body))
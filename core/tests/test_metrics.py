@@ -1,6 +1,7 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
+from core.infra import metrics
 from core.infra.metrics import get_counter, get_histogram, _counter_cache, _hist_cache, _NoOpMetric
 
 @pytest.fixture(autouse=True)
@@ -12,45 +13,45 @@ def clear_caches():
     _hist_cache.clear()
 
 def test_get_counter_creates_new_metric():
-    with patch('core.metrics.Counter') as MockCounter:
+    with patch('core.infra.metrics.Counter') as MockCounter:
         metric = get_counter('test_counter', 'Test doc')
         assert metric is not None
         MockCounter.assert_called_once_with('test_counter', 'Test doc', [])
 
 def test_get_counter_returns_cached_metric():
-    with patch('core.metrics.Counter') as MockCounter:
+    with patch('core.infra.metrics.Counter') as MockCounter:
         metric1 = get_counter('test_counter', 'Test doc')
         metric2 = get_counter('test_counter', 'Test doc')
         assert metric1 is metric2
         MockCounter.assert_called_once()
 
 def test_get_counter_noop_fallback():
-    with patch('core.metrics.Counter', None):
+    with patch('core.infra.metrics.Counter', None):
         metric = get_counter('test_counter_noop', 'Test doc')
         assert isinstance(metric, _NoOpMetric)
         assert metric.inc() is None
 
 def test_get_histogram_creates_new_metric():
-    with patch('core.metrics.Histogram') as MockHistogram:
+    with patch('core.infra.metrics.Histogram') as MockHistogram:
         metric = get_histogram('test_hist', 'Test doc')
         assert metric is not None
         MockHistogram.assert_called_once_with('test_hist', 'Test doc', [])
 
 def test_get_histogram_with_buckets():
-    with patch('core.metrics.Histogram') as MockHistogram:
+    with patch('core.infra.metrics.Histogram') as MockHistogram:
         buckets = [0.1, 0.5, 1.0]
         metric = get_histogram('test_hist_buckets', 'Test doc', buckets=buckets)
         MockHistogram.assert_called_once_with('test_hist_buckets', 'Test doc', [], buckets=buckets)
 
 def test_get_histogram_returns_cached_metric():
-    with patch('core.metrics.Histogram') as MockHistogram:
+    with patch('core.infra.metrics.Histogram') as MockHistogram:
         metric1 = get_histogram('test_hist', 'Test doc')
         metric2 = get_histogram('test_hist', 'Test doc')
         assert metric1 is metric2
         MockHistogram.assert_called_once()
 
 def test_get_histogram_noop_fallback():
-    with patch('core.metrics.Histogram', None):
+    with patch('core.infra.metrics.Histogram', None):
         metric = get_histogram('test_hist_noop', 'Test doc')
         assert isinstance(metric, _NoOpMetric)
         assert metric.observe(1) is None
@@ -60,3 +61,69 @@ def test_noop_metric_methods():
     assert metric.labels('label') is metric
     assert metric.inc() is None
     assert metric.observe(1) is None
+
+
+def test_existing_collector_is_reused_without_registry_scan():
+    first = get_counter('test_registry_reuse_total', 'Test doc', ['kind'])
+    _counter_cache.clear()
+
+    with patch.object(metrics.REGISTRY, '_collector_to_names', new={}):
+        again = get_counter('test_registry_reuse_total', 'Test doc', ['kind'])
+
+    again.labels('a').inc()
+    assert again._metric is first._metric
+    assert metrics.REGISTRY.get_sample_value('test_registry_reuse_total', {'kind': 'a'}) == 1
+
+def test_labels_reuse_cached_children():
+    metric = get_counter('test_children_total', 'Test doc', ['kind'])
+    assert metric.labels('a') is metric.labels(kind='a')
+
+def test_labels_with_wrong_names_raise():
+    metric = get_counter('test_label_names_total', 'Test doc', ['a', 'b'])
+
+    with pytest.raises(ValueError):
+        metric.labels(x='1', y='2')
+    with pytest.raises(ValueError):
+        metric.labels(a='1')
+    with pytest.raises(ValueError):
+        metric.labels('1')
+    assert metrics.REGISTRY.get_sample_value('test_label_names_total', {'a': 'None', 'b': 'None'}) is None
+
+def test_label_cardinality_is_capped_with_overflow_series(caplog):
+    metric = get_counter('test_cardinality_total', 'Test doc', ['user_id'], max_label_sets=3)
+
+    for user_id in range(10):
+        metric.labels(user_id=user_id).inc()
+
+    sample = metrics.REGISTRY.get_sample_value
+    assert sample('test_cardinality_total', {'user_id': '2'}) == 1
+    assert sample('test_cardinality_total', {'user_id': '5'}) is None
+    assert sample('test_cardinality_total', {'user_id': metrics.OVERFLOW_LABEL}) == 7
+    assert sum('superó' in record.getMessage() for record in caplog.records) == 1
+
+
+def test_multiprocess_exporter_is_disabled_without_directory(monkeypatch):
+    monkeypatch.delenv('PROMETHEUS_MULTIPROC_DIR', raising=False)
+    with patch('prometheus_client.start_http_server') as start:
+        assert metrics.start_multiprocess_exporter(9540) is False
+    start.assert_not_called()
+
+
+def test_multiprocess_exporter_publishes_values_from_every_process(tmp_path):
+    from prometheus_client import CollectorRegistry, Counter, values
+
+    (tmp_path / 'counter_999.db').write_bytes(b'')  # ejecución anterior
+    with patch('prometheus_client.start_http_server') as start:
+        assert metrics.start_multiprocess_exporter(9540, path=str(tmp_path)) is True
+    assert not (tmp_path / 'counter_999.db').exists()
+
+    # Un proceso hijo del worker escribe en el directorio compartido
+    with patch.dict('os.environ', {'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}), \
+            patch.object(values, 'ValueClass', values.MultiProcessValue()):
+        child = Counter('test_worker_tasks_total', 'Test doc', ['task'], registry=CollectorRegistry())
+        child.labels('expire').inc(3)
+
+    port, = start.call_args.args
+    registry = start.call_args.kwargs['registry']
+    assert port == 9540
+    assert registry.get_sample_value('test_worker_tasks_total', {'task': 'expire'}) == 3
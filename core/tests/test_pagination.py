@@ -0,0 +1,89 @@
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.api.pagination import KeysetCursorPagination
+from core.models import AuditLog
+
+
+factory = APIRequestFactory()
+
+
+def _page(queryset, query="", page_size=3):
+    paginator = KeysetCursorPagination()
+    paginator.page_size = page_size
+    request = Request(factory.get(f"/logs/{query}"))
+    rows = paginator.paginate_queryset(queryset, request)
+    return rows, paginator.get_paginated_response([row.pk for row in rows]).data
+
+
+def _cursor(url):
+    return parse_qs(urlparse(url).query)["cursor"][0]
+
+
+@pytest.fixture
+def logs(db):
+    now = timezone.now()
+    created = []
+    for index in range(7):
+        log = AuditLog.objects.create(action=AuditLog.Action.FLAG_NON_GRATA, details=str(index))
+        created.append(log)
+    # Dos filas con el mismo created_at obligan a desempatar por pk
+    for index, log in enumerate(created):
+        AuditLog.objects.filter(pk=log.pk).update(created_at=now - timedelta(minutes=index // 2))
+    return list(AuditLog.objects.order_by("-created_at", "-pk"))
+
+
+def test_without_cursor_keeps_page_number_format(logs):
+    _, data = _page(AuditLog.objects.all(), "?page=2")
+    assert data["count"] == 7
+    assert set(data) == {"count", "next", "previous", "results"}
+
+
+@pytest.mark.django_db
+def test_cursor_walks_all_rows_once_in_order(logs, django_assert_num_queries):
+    seen = []
+    query = "?cursor="
+    while True:
+        with django_assert_num_queries(1):
+            _, data = _page(AuditLog.objects.all(), query)
+        assert "count" not in data
+        seen.extend(data["results"])
+        if not data["next"]:
+            break
+        query = f"?cursor={_cursor(data['next'])}"
+    assert seen == [log.pk for log in logs]
+
+
+def test_previous_cursor_returns_prior_page(logs):
+    _, first = _page(AuditLog.objects.all(), "?cursor=")
+    _, second = _page(AuditLog.objects.all(), f"?cursor={_cursor(first['next'])}")
+    _, back = _page(AuditLog.objects.all(), f"?cursor={_cursor(second['previous'])}")
+
+    assert back["results"] == first["results"]
+    assert back["previous"] is None
+
+
+def test_cursor_is_stable_when_new_rows_arrive(logs):
+    _, first = _page(AuditLog.objects.all(), "?cursor=")
+    AuditLog.objects.create(action=AuditLog.Action.FLAG_NON_GRATA, details="nuevo")
+
+    _, second = _page(AuditLog.objects.all(), f"?cursor={_cursor(first['next'])}")
+
+    assert second["results"] == [log.pk for log in logs[3:6]]
+
+
+def test_tampered_cursor_is_rejected(logs):
+    with pytest.raises(NotFound):
+        _page(AuditLog.objects.all(), "?cursor=abc")
+
+
+def test_include_total_adds_approximate_count(logs):
+    _, data = _page(AuditLog.objects.all(), "?cursor=&include_total=true")
+    assert data["approximate_count"] >= 0
+    assert data["results"] == [log.pk for log in logs[:3]]
@@ -0,0 +1,69 @@
+import uuid
+from unittest import mock
+
+import pytest
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import ResolverMatch
+
+from core.infra import middleware as core_middleware
+from core.infra.middleware import RequestProfilerMiddleware
+from core.infra.profiling import RequestProfile, fingerprint
+from core.models import AuditLog
+
+
+factory = RequestFactory()
+
+
+def _n_plus_one_view(request):
+    request.resolver_match = ResolverMatch(lambda r: None, (), {}, url_name="logs", namespaces=["v1"])
+    key = f"profiler:{uuid.uuid4()}"
+    cache.set(key, "1")
+    cache.get(key)
+    cache.get(f"{key}:missing")
+    for _ in range(3):
+        list(AuditLog.objects.filter(action="X"))
+    list(AuditLog.objects.filter(pk__in=[uuid.uuid4(), uuid.uuid4()]))
+    return HttpResponse("OK")
+
+
+def test_fingerprint_collapses_in_lists():
+    assert fingerprint('WHERE "id" IN (%s, %s, %s)') == fingerprint('WHERE "id" IN (%s, %s)')
+
+
+@pytest.mark.django_db
+def test_profile_counts_queries_duplicates_and_cache():
+    profile = RequestProfile()
+    with profile.capture():
+        _n_plus_one_view(factory.get("/"))
+
+    assert profile.queries == 4
+    assert profile.duplicate_queries == 2
+    assert profile.db_time > 0
+    assert (profile.cache_hits, profile.cache_misses) == (1, 1)
+    assert profile.top_duplicates()[0][1] == 3
+    # Fuera del bloque la caché vuelve a su método original
+    assert "get" not in caches["default"].__dict__
+
+
+@pytest.mark.django_db
+def test_sampled_request_publishes_metrics_and_logs_duplicates(settings, caplog):
+    settings.REQUEST_PROFILER_SAMPLE_RATE = 1.0
+    settings.REQUEST_PROFILER_DUPLICATE_THRESHOLD = 2
+    with mock.patch.object(core_middleware, "request_db_queries") as queries:
+        response = RequestProfilerMiddleware(_n_plus_one_view)(factory.get("/api/v1/logs/"))
+
+    assert response.status_code == 200
+    queries.labels.assert_called_once_with(route="v1:logs")
+    queries.labels.return_value.observe.assert_called_once_with(4)
+    record = next(r for r in caplog.records if r.getMessage().startswith("Request profile"))
+    assert record.db_duplicate_queries == 2
+    assert record.route == "v1:logs"
+
+
+def test_unsampled_request_is_not_profiled(settings):
+    settings.REQUEST_PROFILER_SAMPLE_RATE = 0
+    with mock.patch.object(core_middleware, "RequestProfile") as profile_cls:
+        RequestProfilerMiddleware(lambda request: HttpResponse("OK"))(factory.get("/"))
+    profile_cls.assert_not_called()
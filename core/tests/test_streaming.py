@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from core.utils.streaming import (
+    iter_csv_rows,
+    iter_ndjson_rows,
+    streaming_csv_response,
+    streaming_ndjson_response,
+)
+
+
+def _synthetic_users(count):
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        yield (
+            index,
+            f"+5730{index:08d}",
+            f"user{index}@example.com",
+            "Nombre",
+            "Apellido",
+            "CLIENT",
+            "Active",
+            created_at,
+        )
+
+
+def _peak_memory_while_streaming(count):
+    tracemalloc.start()
+    try:
+        total_bytes = 0
+        for line in iter_csv_rows(["ID", "Phone"], _synthetic_users(count)):
+            total_bytes += len(line)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, total_bytes
+
+
+def test_iter_csv_rows_writes_header_and_rows():
+    content = "".join(iter_csv_rows(["a", "b"], [(1, "x,y"), (2, None)]))
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows == [["a", "b"], ["1", "x,y"], ["2", ""]]
+
+
+def test_iter_ndjson_rows_encodes_django_types():
+    row_id = uuid.uuid4()
+    lines = list(iter_ndjson_rows([{"id": row_id, "amount": Decimal("10.50"), "name": "Ñandú"}]))
+    assert len(lines) == 1
+    assert lines[0].endswith("\n")
+    assert json.loads(lines[0]) == {"id": str(row_id), "amount": "10.50", "name": "Ñandú"}
+
+
+def test_streaming_responses_set_headers():
+    response = streaming_csv_response("export.csv", ["a"], [[1]])
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv"
+    assert response["Content-Disposition"] == 'attachment; filename="export.csv"'
+    assert b"".join(response.streaming_content) == b"a\r\n1\r\n"
+
+    response = streaming_ndjson_response("export.ndjson", [{"a": 1}])
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert b"".join(response.streaming_content) == b'{"a": 1}\n'
+
+
+def test_csv_stream_memory_is_constant_for_200k_users():
+    small_peak, _ = _peak_memory_while_streaming(2_000)
+    large_peak, large_bytes = _peak_memory_while_streaming(200_000)
+
+    # ~17 MB de CSV generado, pero el pico de memoria no crece con el volumen
+    assert large_bytes > 10_000_000
+    assert large_peak < 256 * 1024
+    assert large_peak < small_peak * 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("server_side_cursors", [True, False])
+def test_iter_queryset_yields_every_row_in_pk_order(monkeypatch, django_assert_num_queries, server_side_cursors):
+    from django.db import connections
+
+    from core.models import AuditLog
+    from core.utils.streaming import iter_queryset
+
+    for index in range(5):
+        AuditLog.objects.create(action=AuditLog.Action.FLAG_NON_GRATA, details=str(index))
+    monkeypatch.setitem(
+        connections["default"].settings_dict, "DISABLE_SERVER_SIDE_CURSORS", not server_side_cursors
+    )
+    expected = list(AuditLog.objects.order_by("pk").values_list("pk", "details"))
+
+    # Sin cursores del servidor: 3 páginas de pks + 3 bloques de filas + la página vacía = 7
+    with django_assert_num_queries(1 if server_side_cursors else 7):
+        rows = list(iter_queryset(AuditLog.objects.order_by("pk").values_list("pk", "details"), chunk_size=2))
+
+    assert rows == expected
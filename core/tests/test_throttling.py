@@ -0,0 +1,96 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.api import throttling
+from core.api.throttling import RedisAnonRateThrottle, RedisScopedRateThrottle
+
+
+factory = APIRequestFactory()
+
+
+def _request(ip):
+    request = Request(factory.get("/", REMOTE_ADDR=ip))
+    request.user = SimpleNamespace(is_authenticated=False)
+    return request
+
+
+def _throttle(rate="5/min"):
+    throttle = RedisAnonRateThrottle()
+    throttle.rate = rate
+    throttle.num_requests, throttle.duration = throttle.parse_rate(rate)
+    throttle.cache = mock.Mock()
+    return throttle
+
+
+def _ip():
+    # Clave nueva por test: el estado vive en Redis entre tests
+    return f"10.{uuid.uuid4().int % 250}.{uuid.uuid4().int % 250}.{uuid.uuid4().int % 250}"
+
+
+def test_allows_burst_then_blocks_with_wait():
+    ip = _ip()
+    results = [_throttle().allow_request(_request(ip), None) for _ in range(6)]
+
+    assert results == [True] * 5 + [False]
+    throttle = _throttle()
+    assert throttle.allow_request(_request(ip), None) is False
+    # 5/min: el cupo se libera cuando el primero sale de la ventana
+    assert 0 < throttle.wait() <= 60
+
+
+def test_never_admits_more_than_limit_within_duration():
+    ip = _ip()
+    started = time.monotonic()
+    assert [_throttle("4/s").allow_request(_request(ip), None) for _ in range(4)] == [True] * 4
+
+    # Con GCRA entraría uno cada 250 ms; la ventana no admite ninguno hasta cumplir 1 s
+    while time.monotonic() - started < 0.9:
+        assert _throttle("4/s").allow_request(_request(ip), None) is False
+        time.sleep(0.05)
+
+    time.sleep(max(0.0, 1.05 - (time.monotonic() - started)))
+    assert _throttle("4/s").allow_request(_request(ip), None) is True
+
+
+def test_does_not_touch_django_cache():
+    throttle = _throttle()
+    throttle.allow_request(_request(_ip()), None)
+    throttle.cache.get.assert_not_called()
+    throttle.cache.set.assert_not_called()
+
+
+def test_concurrent_requests_never_exceed_limit():
+    ip = _ip()
+
+    def hit(_):
+        return _throttle("20/min").allow_request(_request(ip), None)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(hit, range(60)))
+
+    assert results.count(True) == 20
+
+
+def test_scoped_throttle_reads_scope_from_view(settings):
+    view = SimpleNamespace(throttle_scope="payments")
+    throttle = RedisScopedRateThrottle()
+
+    assert throttle.allow_request(_request(_ip()), view) is True
+    assert (throttle.num_requests, throttle.duration) == throttle.parse_rate(
+        settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]["payments"]
+    )
+    assert RedisScopedRateThrottle().allow_request(_request(_ip()), SimpleNamespace()) is True
+
+
+def test_falls_back_to_drf_history_when_redis_fails():
+    throttle = _throttle()
+    throttle.cache.get.return_value = []
+    with mock.patch.object(throttling, "_sliding_window", side_effect=ConnectionError("redis caído")):
+        assert throttle.allow_request(_request(_ip()), None) is True
+    throttle.cache.set.assert_called_once()
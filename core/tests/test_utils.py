@@ -156,3 +156,31 @@ def test_utc_now_and_to_bogota():
     assert localized.tzinfo is not None
     # Asegura que devuelve mismo objeto si None
     assert utils.to_bogota(None) is None
+
+
+def test_date_range_filter_builds_half_open_local_bounds():
+    from datetime import date, datetime
+
+    lookups = utils.date_range_filter("created_at", date(2024, 3, 1), date(2024, 3, 31), tz=utils.BOGOTA_TZ)
+
+    assert lookups == {
+        "created_at__gte": datetime(2024, 3, 1, tzinfo=utils.BOGOTA_TZ),
+        "created_at__lt": datetime(2024, 4, 1, tzinfo=utils.BOGOTA_TZ),
+    }
+
+
+@pytest.mark.django_db
+def test_date_range_filter_matches_date_lookup(admin_user):
+    from datetime import date, datetime, timedelta
+
+    start = datetime(2024, 3, 1, tzinfo=utils.BOGOTA_TZ)
+    end = start + timedelta(days=1)
+    for moment in (start - timedelta(microseconds=1), start, end - timedelta(microseconds=1), end):
+        log = AuditLog.objects.create(action=AuditLog.Action.FLAG_NON_GRATA, admin_user=admin_user, details="rango")
+        AuditLog.objects.filter(pk=log.pk).update(created_at=moment)
+
+    by_cast = AuditLog.objects.filter(created_at__date__gte=date(2024, 3, 1), created_at__date__lte=date(2024, 3, 1))
+    by_range = AuditLog.objects.filter(**utils.date_range_filter("created_at", date(2024, 3, 1), date(2024, 3, 1)))
+
+    assert set(by_range.values_list("pk", flat=True)) == set(by_cast.values_list("pk", flat=True))
+    assert by_range.count() == 2
@@ -4,16 +4,20 @@ Paquete Utils de Core.
 Contiene utilidades, validadores, decoradores, excepciones y funciones de caché.
 
 Exporta:
-- Helpers: utc_now, to_bogota, get_client_ip, cached_singleton, invalidate, emit_metric, safe_audit_log, retry_with_backoff, batch_process, format_cop, truncate_string
+- Helpers: utc_now, to_bogota, day_start, date_range_bounds, date_range_filter, get_client_ip, cached_singleton, invalidate, emit_metric, safe_audit_log, retry_with_backoff, batch_process, format_cop, truncate_string
 - Validators: percentage_0_100, validate_colombian_phone, validate_positive_amount, validate_future_date, validate_date_range, validate_uuid_format, validate_min_age, validate_file_size, validate_image_dimensions
 - Decorators: idempotent_view
 - Exceptions: BusinessLogicError, InsufficientFundsError, ResourceConflictError, ServiceUnavailableError, InvalidStateTransitionError, RateLimitExceededError, PermissionDeniedError, drf_exception_handler
-- Caching: CacheKeys, GLOBAL_SETTINGS_CACHE_KEY, acquire_lock
+- Caching: CacheKeys, GLOBAL_SETTINGS_CACHE_KEY, acquire_lock, release_lock, payload_cache, lock_cache
+- Streaming: streaming_csv_response, streaming_ndjson_response, iter_queryset, CSVStreamRenderer, NDJSONStreamRenderer
 """
 from core.utils.helpers import (
     BOGOTA_TZ,
     utc_now,
     to_bogota,
+    day_start,
+    date_range_bounds,
+    date_range_filter,
     get_client_ip,
     cached_singleton,
     invalidate,
@@ -46,7 +50,24 @@ from core.utils.exceptions import (
     PermissionDeniedError,
     drf_exception_handler,
 )
-from core.utils.caching import CacheKeys, GLOBAL_SETTINGS_CACHE_KEY, acquire_lock
+from core.utils.caching import (
+    CacheKeys,
+    GLOBAL_SETTINGS_CACHE_KEY,
+    acquire_lock,
+    lock_cache,
+    payload_cache,
+    release_lock,
+)
+from core.utils.streaming import (
+    EXPORT_CHUNK_SIZE,
+    CSVStreamRenderer,
+    NDJSONStreamRenderer,
+    iter_csv_rows,
+    iter_ndjson_rows,
+    iter_queryset,
+    streaming_csv_response,
+    streaming_ndjson_response,
+)
 
 
 __all__ = [
@@ -54,6 +75,9 @@ __all__ = [
     "BOGOTA_TZ",
     "utc_now",
     "to_bogota",
+    "day_start",
+    "date_range_bounds",
+    "date_range_filter",
     "get_client_ip",
     "cached_singleton",
     "invalidate",
@@ -88,4 +112,16 @@ __all__ = [
     "CacheKeys",
     "GLOBAL_SETTINGS_CACHE_KEY",
     "acquire_lock",
+    "release_lock",
+    "payload_cache",
+    "lock_cache",
+    # Streaming
+    "EXPORT_CHUNK_SIZE",
+    "CSVStreamRenderer",
+    "NDJSONStreamRenderer",
+    "iter_csv_rows",
+    "iter_ndjson_rows",
+    "iter_queryset",
+    "streaming_csv_response",
+    "streaming_ndjson_response",
 ]
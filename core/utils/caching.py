@@ -1,8 +1,19 @@
 """
 Core Utils - Caching.
+
+``cache`` (alias ``default``) guarda claves pequeñas y calientes;
+``payload_cache`` los resultados grandes ya calculados (comprimidos) y
+``lock_cache`` los candados efímeros. Ver ``studiozens/settings/partials/cache.py``.
 """
 from dataclasses import dataclass
-from django.core.cache import cache
+from django.core.cache import cache, caches
+from django.utils.connection import ConnectionProxy
+
+PAYLOAD_CACHE_ALIAS = "payloads"
+LOCK_CACHE_ALIAS = "locks"
+
+payload_cache = ConnectionProxy(caches, PAYLOAD_CACHE_ALIAS)
+lock_cache = ConnectionProxy(caches, LOCK_CACHE_ALIAS)
 
 
 @dataclass(frozen=True)
@@ -33,6 +44,14 @@ def acquire_lock(key: str, timeout: int = 5) -> bool:
     Devuelve True si se adquiere, False en caso contrario.
     """
     try:
-        return cache.add(f"lock:{key}", True, timeout=timeout)
+        return lock_cache.add(f"lock:{key}", True, timeout=timeout)
     except Exception:
         return False
+
+
+def release_lock(key: str) -> None:
+    """Libera un lock tomado con ``acquire_lock``."""
+    try:
+        lock_cache.delete(f"lock:{key}")
+    except Exception:
+        pass
@@ -4,14 +4,14 @@ Core Utils - Helper functions.
 from __future__ import annotations
 from typing import Any, Callable, Optional, TypeVar, Tuple, List, Iterable
 from functools import lru_cache, wraps
-from django.utils.timezone import now
+from django.utils.timezone import get_current_timezone, now
 from django.core.cache import cache
 from django.http import HttpRequest
 from django.conf import settings
 from zoneinfo import ZoneInfo
 import time
 import logging
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 try:
     from prometheus_client import Counter
@@ -34,6 +34,28 @@ def to_bogota(dt: Optional[datetime]) -> Optional[datetime]:
         return dt
     return dt.astimezone(BOGOTA_TZ)
 
+def day_start(value: date, tz=None) -> datetime:
+    """Inicio (00:00, aware) del día local ``value``; por defecto en la zona actual."""
+    return datetime.combine(value, datetime.min.time(), tzinfo=tz or get_current_timezone())
+
+def date_range_bounds(start_date: date, end_date: date, tz=None) -> Tuple[datetime, datetime]:
+    """
+    Convierte el rango local inclusivo ``[start_date, end_date]`` en límites
+    aware ``[inicio, fin)``: ``fin`` es el inicio del día siguiente a ``end_date``.
+    """
+    return day_start(start_date, tz), day_start(end_date + timedelta(days=1), tz)
+
+def date_range_filter(field: str, start_date: date, end_date: date, tz=None) -> dict:
+    """
+    Lookups ``{field}__gte`` / ``{field}__lt`` equivalentes a
+    ``{field}__date__gte`` / ``{field}__date__lte``.
+
+    ``__date`` envuelve la columna en un cast a fecha y el planner no puede
+    usar índices sobre ella para el rango; comparar contra datetimes sí.
+    """
+    start, end = date_range_bounds(start_date, end_date, tz)
+    return {f"{field}__gte": start, f"{field}__lt": end}
+
 def get_client_ip(request: HttpRequest) -> str:
     """
     Obtiene la IP del cliente respetando la configuración de proxy.
@@ -109,16 +131,27 @@ def emit_metric(name: str, value: float = 1, tags: Optional[dict] = None) -> Non
 def safe_audit_log(action: str, admin_user=None, target_user=None, target_appointment=None, details: Any = None):
     """
     Escribe AuditLog tolerante a errores y a importaciones circulares.
+
+    Las acciones de alto volumen (``ADMIN_ENDPOINT_HIT``) se encolan en el
+    sink de auditoría y se insertan por lotes fuera de la request; el resto
+    se escribe de forma síncrona.
     """
     try:
+        from core.infra.audit_sink import get_audit_sink
         from core.models import AuditLog  # import local para evitar ciclos
-        entry = AuditLog.objects.create(
+        fields = dict(
             action=action,
             admin_user=admin_user,
             target_user=target_user,
             target_appointment=target_appointment,
             details=details or "",
         )
+        sink = get_audit_sink()
+        if sink is not None and sink.accepts(action):
+            entry = AuditLog(**fields)
+            sink.submit(entry)
+            return entry
+        entry = AuditLog.objects.create(**fields)
         return entry
     except Exception:
         return None
@@ -0,0 +1,128 @@
+"""
+Core Utils - Exportaciones en streaming.
+
+Escritores CSV/NDJSON que producen la respuesta fila a fila para que la
+memoria del worker no dependa del tamaño de la tabla exportada. Pensados
+para usarse con ``iter_queryset(QuerySet.values_list(...))``, que en
+Postgres abre un cursor del lado del servidor.
+"""
+from __future__ import annotations
+
+import csv
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """Pseudo-buffer: ``write`` devuelve la línea en lugar de acumularla."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class CSVStreamRenderer(BaseRenderer):
+    """
+    Renderer de paso para que DRF acepte ``?format=csv``.
+
+    Las vistas devuelven directamente un ``StreamingHttpResponse``; este
+    renderer solo existe para la negociación de contenido.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class NDJSONStreamRenderer(BaseRenderer):
+    """Renderer de paso para ``?format=ndjson``."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+def iter_queryset(queryset, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Recorre un QuerySet por bloques sin materializarlo.
+
+    Con cursores del lado del servidor equivale a ``.iterator(chunk_size)``.
+    Detrás de un pooler en modo transacción (``DISABLE_SERVER_SIDE_CURSORS``)
+    ``.iterator()`` traería todo el resultado de una vez, así que se pagina
+    por ``pk`` con consultas independientes; el orden pasa a ser por ``pk``.
+    """
+    if not connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(page.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield from queryset.filter(pk__in=pks).order_by("pk")
+        last_pk = pks[-1]
+
+
+def iter_csv_rows(header: Optional[Sequence[Any]], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """Genera las líneas CSV (header incluido) sin materializar las filas."""
+    writer = csv.writer(_Echo())
+    if header:
+        yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson_rows(rows: Iterable[dict]) -> Iterator[str]:
+    """Genera un objeto JSON por línea (Decimal, UUID y fechas incluidos)."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def streaming_csv_response(
+    filename: str,
+    header: Optional[Sequence[Any]],
+    rows: Iterable[Sequence[Any]],
+) -> StreamingHttpResponse:
+    """
+    Construye un ``StreamingHttpResponse`` CSV descargable.
+
+    Ejemplo:
+        rows = iter_queryset(qs.values_list("id", "email"))
+        return streaming_csv_response("users.csv", ["ID", "Email"], rows)
+    """
+    response = StreamingHttpResponse(iter_csv_rows(header, rows), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def streaming_ndjson_response(filename: str, rows: Iterable[dict]) -> StreamingHttpResponse:
+    """Construye un ``StreamingHttpResponse`` NDJSON descargable."""
+    response = StreamingHttpResponse(iter_ndjson_rows(rows), content_type="application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+__all__ = [
+    "EXPORT_CHUNK_SIZE",
+    "CSVStreamRenderer",
+    "NDJSONStreamRenderer",
+    "iter_queryset",
+    "iter_csv_rows",
+    "iter_ndjson_rows",
+    "streaming_csv_response",
+    "streaming_ndjson_response",
+]
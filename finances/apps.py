@@ -8,8 +8,10 @@ class FinancesConfig(AppConfig):
 
     def ready(self):
         """
-        Valida variables críticas de Wompi en entornos no DEBUG para evitar despliegues incorrectos.
+        Registra signals y valida variables críticas de Wompi en entornos no
+        DEBUG para evitar despliegues incorrectos.
         """
+        import finances.signals  # noqa: F401
         from django.conf import settings
         from django.core.exceptions import ImproperlyConfigured
 
@@ -9,6 +9,7 @@ Exporta:
 - WompiPaymentClient: Cliente para crear transacciones (incluye todos los métodos)
 - build_integrity_signature: Generador de firma SHA256
 - gateway_latency, gateway_failures: Métricas Prometheus
+- WompiReferenceData: Caché refresh-ahead de acceptance token y bancos PSE
 
 Módulos internos:
 - base: WompiGateway, build_integrity_signature, métricas
@@ -16,6 +17,8 @@ Módulos internos:
 - pse: PSEMixin (transacciones PSE)
 - mobile_wallets: MobileWalletsMixin (Nequi, Daviplata, Bancolombia)
 - tokenization: TokenizationMixin (tarjetas, tokens Nequi)
+- http: Sesión HTTP compartida y timeouts por endpoint
+- reference_data: WompiReferenceData
 """
 from finances.gateway.base import (
     WompiGateway,
@@ -27,6 +30,7 @@ from finances.gateway.client_base import WompiPaymentClientBase
 from finances.gateway.pse import PSEMixin
 from finances.gateway.mobile_wallets import MobileWalletsMixin
 from finances.gateway.tokenization import TokenizationMixin
+from finances.gateway.reference_data import WompiReferenceData
 
 
 class WompiPaymentClient(
@@ -52,6 +56,7 @@ class WompiPaymentClient(
 __all__ = [
     'WompiGateway',
     'WompiPaymentClient',
+    'WompiReferenceData',
     'build_integrity_signature',
     'gateway_latency',
     'gateway_failures',
@@ -18,6 +18,7 @@ from django.core.cache import cache
 from django.utils import timezone
 
 from core.infra.metrics import get_counter, get_histogram
+from finances.gateway.http import get_wompi_session, wompi_request
 
 
 logger = logging.getLogger(__name__)
@@ -29,7 +30,7 @@ gateway_latency = get_histogram(
     ["method", "endpoint", "status"],
 )
 gateway_failures = get_counter(
-    "payment_failures_total",
+    "payment_gateway_failures_total",
     "Errores al llamar a Wompi",
     ["reason", "endpoint"],
 )
@@ -44,9 +45,11 @@ class WompiGateway:
     REQUEST_TIMEOUT = 10
     _CIRCUIT_CACHE_KEY = "wompi:transactions:circuit"
 
-    def __init__(self, base_url: str | None = None, private_key: str | None = None):
+    def __init__(self, base_url: str | None = None, private_key: str | None = None, session=None):
         self.base_url = base_url or getattr(settings, "WOMPI_BASE_URL", "")
         self.private_key = private_key or getattr(settings, "WOMPI_PRIVATE_KEY", "")
+        # Sesión con keep-alive compartida por todos los clientes Wompi del proceso
+        self.session = session or get_wompi_session()
 
     @classmethod
     def _circuit_allows(cls):
@@ -87,12 +90,13 @@ class WompiGateway:
         for attempt in range(1, attempts + 1):
             start = time.perf_counter()
             try:
-                resp = requests.request(
-                    method=method,
-                    url=url,
+                resp = wompi_request(
+                    method,
+                    url,
                     json=json,
                     headers=headers or {},
                     timeout=timeout or self.REQUEST_TIMEOUT,
+                    session=self.session,
                 )
                 duration = time.perf_counter() - start
                 gateway_latency.labels(method, endpoint, resp.status_code).observe(duration)
@@ -114,10 +118,13 @@ class WompiGateway:
             raise last_exc
         return None
 
-    def fetch_transaction(self, reference):
+    def fetch_transaction(self, reference, timeout=None, attempts=3):
         """
         Devuelve el payload de la transacción o None si no hay base URL/reference.
         Lanza requests.HTTPError en caso de status >=400 (comportamiento previo).
+
+        ``timeout`` y ``attempts`` permiten al llamador acotar la consulta a su
+        propio presupuesto de tiempo (p. ej. la reconciliación por lotes).
         """
         if not self._circuit_allows():
             logger.warning("Circuito de Wompi (transactions) abierto; se omite fetch de %s.", reference)
@@ -130,8 +137,8 @@ class WompiGateway:
                 "GET",
                 url,
                 headers=self._headers(),
-                timeout=self.REQUEST_TIMEOUT,
-                attempts=3,
+                timeout=timeout or self.REQUEST_TIMEOUT,
+                attempts=attempts,
             )
             if response.status_code >= 400:
                 self._record_failure()
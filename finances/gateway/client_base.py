@@ -13,6 +13,9 @@ from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 
+from finances.gateway.http import wompi_request
+from finances.gateway.reference_data import WompiReferenceData
+
 
 logger = logging.getLogger(__name__)
 
@@ -68,9 +71,9 @@ class WompiPaymentClientBase:
         last_exc = None
         for attempt in range(1, attempts + 1):
             try:
-                return requests.request(
-                    method=method,
-                    url=url,
+                return wompi_request(
+                    method,
+                    url,
                     json=json,
                     headers=headers or {},
                     timeout=timeout or self.REQUEST_TIMEOUT,
@@ -123,27 +126,24 @@ class WompiPaymentClientBase:
 
     @classmethod
     def resolve_acceptance_token(cls, base_url: str | None = None, public_key: str | None = None):
-        """Resuelve el token de aceptación de Wompi (cached ~55 min)."""
+        """
+        Resuelve el token de aceptación de Wompi.
+
+        Se sirve desde la caché refresh-ahead de ``WompiReferenceData``: solo
+        se consulta Wompi en línea si aún no hay ningún token guardado.
+        """
         configured = getattr(settings, "WOMPI_ACCEPTANCE_TOKEN", None)
         if configured:
             return configured
-        cache_key = "wompi:acceptance_token"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        base = base_url or getattr(settings, "WOMPI_BASE_URL", "")
-        pub_key = public_key or getattr(settings, "WOMPI_PUBLIC_KEY", "")
-        if not base or not pub_key:
-            return None
-        url = f"{base.rstrip('/')}/merchants/{pub_key}"
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            body = response.json()
-            token = body.get("data", {}).get("presigned_acceptance", {}).get("acceptance_token")
-            if token:
-                cache.set(cache_key, token, timeout=55 * 60)  # ~55 minutos
-            return token
-        except requests.RequestException:
-            logger.exception("No se pudo obtener el acceptance_token desde Wompi.")
+        return WompiReferenceData.acceptance_token(base_url=base_url, public_key=public_key)
+
+    @staticmethod
+    def fetch_acceptance_token(base_url: str, public_key: str):
+        """Consulta el token en Wompi. Devuelve None sin configuración."""
+        if not base_url or not public_key:
             return None
+        url = f"{base_url.rstrip('/')}/merchants/{public_key}"
+        response = wompi_request("GET", url, timeout=10)
+        response.raise_for_status()
+        body = response.json()
+        return body.get("data", {}).get("presigned_acceptance", {}).get("acceptance_token")
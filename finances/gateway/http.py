@@ -0,0 +1,107 @@
+"""
+Sesión HTTP compartida por todos los clientes de Wompi.
+
+``WompiGateway``, ``WompiPaymentClient`` (con sus mixins) y el cliente de
+Payouts usan una única sesión ``requests`` por proceso, con keep-alive y un
+pool acotado (``WOMPI_HTTP_POOL_MAXSIZE`` conexiones por host). Así cada
+llamada reutiliza la conexión TLS abierta en lugar de repetir el handshake.
+
+Los timeouts son ``(conexión, lectura)`` por endpoint (primer segmento de la
+ruta sin la versión, p. ej. ``transactions`` o ``merchants``) y se pueden
+ajustar con ``WOMPI_HTTP_TIMEOUTS``. Un timeout numérico del llamador (p. ej.
+``REQUEST_TIMEOUT`` del cliente) fija la lectura y conserva la conexión del
+endpoint. La latencia queda separada en conexión
+y servidor en ``http_client_latency_seconds{upstream="wompi"}``.
+"""
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+
+from core.infra.http_pool import ProcessLocalRegistry, build_pooled_session
+
+WOMPI_UPSTREAM = "wompi"
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 3.05
+
+# (conexión, lectura) en segundos
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    "merchants": (DEFAULT_CONNECT_TIMEOUT, 5),
+    "pse": (DEFAULT_CONNECT_TIMEOUT, 10),
+    "transactions": (DEFAULT_CONNECT_TIMEOUT, 15),
+    "tokens": (DEFAULT_CONNECT_TIMEOUT, 15),
+    "payment_sources": (DEFAULT_CONNECT_TIMEOUT, 15),
+    "accounts": (DEFAULT_CONNECT_TIMEOUT, 15),
+    "banks": (DEFAULT_CONNECT_TIMEOUT, 10),
+    "payouts": (DEFAULT_CONNECT_TIMEOUT, 30),
+}
+
+_sessions = ProcessLocalRegistry("wompi")
+
+
+def get_wompi_session() -> requests.Session:
+    """Sesión con keep-alive compartida por los clientes Wompi del proceso."""
+    return _sessions.get_or_create(
+        WOMPI_UPSTREAM,
+        lambda: build_pooled_session(
+            WOMPI_UPSTREAM,
+            pool_maxsize=getattr(settings, "WOMPI_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE),
+        ),
+    )
+
+
+def reset_wompi_session() -> None:
+    _sessions.reset()
+
+
+def endpoint_name(url: str) -> str:
+    """``https://.../v1/transactions/123`` -> ``transactions``."""
+    for segment in urlparse(url).path.split("/"):
+        if not segment or (segment[0] == "v" and segment[1:].isdigit()):
+            continue
+        return segment
+    return ""
+
+
+def resolve_timeout(url: str, timeout=None):
+    """
+    Timeout ``(conexión, lectura)`` para ``url``.
+
+    Una tupla explícita se respeta. Un número se usa como tiempo de lectura
+    con la conexión del endpoint; sin ``timeout`` manda la configuración del
+    endpoint completa.
+    """
+    if isinstance(timeout, tuple):
+        return timeout
+    endpoint = endpoint_name(url)
+    configured = getattr(settings, "WOMPI_HTTP_TIMEOUTS", None) or {}
+    if endpoint in configured:
+        endpoint_timeout = tuple(configured[endpoint])
+    elif endpoint in DEFAULT_ENDPOINT_TIMEOUTS:
+        endpoint_timeout = DEFAULT_ENDPOINT_TIMEOUTS[endpoint]
+    else:
+        connect = getattr(settings, "WOMPI_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)
+        endpoint_timeout = (connect, 10)
+    if timeout is None:
+        return endpoint_timeout
+    return (endpoint_timeout[0], float(timeout))
+
+
+def wompi_request(method: str, url: str, *, timeout=None, session=None, **kwargs) -> requests.Response:
+    """Ejecuta la petición con la sesión compartida y el timeout del endpoint."""
+    return (session or get_wompi_session()).request(
+        method=method,
+        url=url,
+        timeout=resolve_timeout(url, timeout),
+        **kwargs,
+    )
+
+
+__all__ = [
+    "DEFAULT_ENDPOINT_TIMEOUTS",
+    "endpoint_name",
+    "get_wompi_session",
+    "reset_wompi_session",
+    "resolve_timeout",
+    "wompi_request",
+]
@@ -10,6 +10,7 @@ import requests
 from django.conf import settings
 
 from finances.gateway.base import build_integrity_signature
+from finances.gateway.http import wompi_request
 
 
 logger = logging.getLogger(__name__)
@@ -134,7 +135,7 @@ class PSEMixin:
         url = f"{self.base_url.rstrip('/')}/pse/financial_institutions"
 
         try:
-            response = requests.get(url, timeout=self.REQUEST_TIMEOUT)
+            response = wompi_request("GET", url, timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             return data.get("data", [])
@@ -0,0 +1,188 @@
+"""
+Datos de referencia de Wompi con caché refresh-ahead.
+
+El acceptance token del comercio y la lista de bancos PSE cambian poco, pero
+se consultaban en Wompi en cada inicio de pago. Se guardan en caché como
+``{"value", "fetched_at"}``:
+
+- Con menos de ``refresh_after`` segundos se sirven tal cual.
+- Más viejos se sirven igual y se encola ``refresh_wompi_reference_data``
+  (una vez por ventana gracias a un candado ``cache.add``).
+- Solo sin valor en caché (arranque en frío) se consulta Wompi en línea.
+- Si Wompi falla al refrescar se conserva el último valor bueno, que vive en
+  caché hasta ``max_stale`` segundos. Pasada esa edad el valor no se sirve y
+  se consulta Wompi en línea como en frío.
+
+El acceptance token tiene ``max_stale`` de 55 minutos, el mismo TTL con el que
+se cacheaba antes: si beat deja de refrescarlo no se sirven tokens vencidos.
+
+La tarea periódica refresca antes de que los valores envejezcan, así que el
+camino normal de pago no hace llamadas externas síncronas.
+"""
+import logging
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from core.infra.metrics import get_counter
+
+logger = logging.getLogger(__name__)
+
+ACCEPTANCE_TOKEN = "acceptance_token"
+PSE_INSTITUTIONS = "pse_institutions"
+
+DATASETS = {
+    ACCEPTANCE_TOKEN: {
+        "cache_key": "wompi:acceptance_token",
+        "type": str,
+        "refresh_after": 30 * 60,
+        "max_stale": 55 * 60,
+    },
+    PSE_INSTITUTIONS: {
+        "cache_key": "wompi:pse:financial_institutions",
+        "type": list,
+        "refresh_after": 6 * 60 * 60,
+        "max_stale": 7 * 24 * 60 * 60,
+    },
+}
+
+reference_data_lookups = get_counter(
+    "wompi_reference_data_total",
+    "Lecturas y refrescos de datos de referencia de Wompi",
+    ["dataset", "outcome"],
+)
+
+
+class WompiReferenceData:
+    """Acceso con caché refresh-ahead a los datasets de ``DATASETS``."""
+
+    REFRESH_LOCK_TIMEOUT = 60
+
+    @staticmethod
+    def _envelope(dataset):
+        envelope = cache.get(DATASETS[dataset]["cache_key"])
+        # Valores con el formato anterior (string sin fecha) cuentan como ausentes
+        if not isinstance(envelope, dict) or "fetched_at" not in envelope:
+            return None
+        return envelope
+
+    @staticmethod
+    def _cacheable(dataset, value):
+        # Nunca se guardan respuestas vacías o de error
+        return bool(value) and isinstance(value, DATASETS[dataset]["type"])
+
+    @staticmethod
+    def _store(dataset, value):
+        config = DATASETS[dataset]
+        cache.set(
+            config["cache_key"],
+            {"value": value, "fetched_at": time.time()},
+            timeout=config["max_stale"],
+        )
+        return value
+
+    @classmethod
+    def get(cls, dataset, loader):
+        """
+        Devuelve el valor en caché y programa su refresco si está viejo.
+        Sin valor en caché, o con uno más viejo que ``max_stale``, llama a
+        ``loader`` en línea (sus errores se propagan).
+        """
+        envelope = cls._envelope(dataset)
+        age = time.time() - envelope["fetched_at"] if envelope is not None else None
+        if age is not None and age < DATASETS[dataset]["max_stale"]:
+            if age < DATASETS[dataset]["refresh_after"]:
+                reference_data_lookups.labels(dataset=dataset, outcome="fresh").inc()
+            else:
+                reference_data_lookups.labels(dataset=dataset, outcome="stale").inc()
+                cls._schedule_refresh(dataset)
+            return envelope["value"]
+
+        reference_data_lookups.labels(dataset=dataset, outcome="miss").inc()
+        value = loader()
+        if cls._cacheable(dataset, value):
+            cls._store(dataset, value)
+        return value
+
+    @classmethod
+    def refresh(cls, dataset, loader=None):
+        """Recarga el dataset; si Wompi falla se mantiene el último valor bueno."""
+        loader = loader or _LOADERS[dataset]
+        try:
+            value = loader()
+        except Exception as exc:
+            value = None
+            logger.warning("No se pudo refrescar %s desde Wompi: %s", dataset, exc)
+        if not cls._cacheable(dataset, value):
+            reference_data_lookups.labels(dataset=dataset, outcome="refresh_error").inc()
+            return False
+        cls._store(dataset, value)
+        reference_data_lookups.labels(dataset=dataset, outcome="refresh_ok").inc()
+        return True
+
+    @classmethod
+    def refresh_all(cls):
+        return {dataset: cls.refresh(dataset) for dataset in DATASETS}
+
+    @staticmethod
+    def clear():
+        for config in DATASETS.values():
+            cache.delete_many([config["cache_key"], f"{config['cache_key']}:refreshing"])
+
+    @classmethod
+    def _schedule_refresh(cls, dataset):
+        if not cache.add(f"{DATASETS[dataset]['cache_key']}:refreshing", 1, timeout=cls.REFRESH_LOCK_TIMEOUT):
+            return
+        try:
+            from finances.tasks import refresh_wompi_reference_data
+
+            refresh_wompi_reference_data.delay(dataset)
+        except Exception as exc:
+            logger.warning("No se pudo encolar el refresco de %s: %s", dataset, exc)
+
+    @classmethod
+    def acceptance_token(cls, base_url=None, public_key=None):
+        """Acceptance token del comercio o None si no se pudo obtener."""
+        try:
+            return cls.get(
+                ACCEPTANCE_TOKEN,
+                lambda: _load_acceptance_token(base_url=base_url, public_key=public_key),
+            )
+        except requests.RequestException:
+            logger.exception("No se pudo obtener el acceptance_token desde Wompi.")
+            return None
+
+    @classmethod
+    def pse_institutions(cls, client=None):
+        """Bancos PSE; en frío lanza los errores de ``get_pse_financial_institutions``."""
+        return cls.get(PSE_INSTITUTIONS, lambda: _load_pse_institutions(client))
+
+
+def _load_acceptance_token(base_url=None, public_key=None):
+    from finances.gateway.client_base import WompiPaymentClientBase
+
+    return WompiPaymentClientBase.fetch_acceptance_token(
+        base_url or getattr(settings, "WOMPI_BASE_URL", ""),
+        public_key or getattr(settings, "WOMPI_PUBLIC_KEY", ""),
+    )
+
+
+def _load_pse_institutions(client=None):
+    from finances.gateway import WompiPaymentClient
+
+    return (client or WompiPaymentClient()).get_pse_financial_institutions()
+
+
+_LOADERS = {
+    ACCEPTANCE_TOKEN: _load_acceptance_token,
+    PSE_INSTITUTIONS: _load_pse_institutions,
+}
+
+
+__all__ = [
+    "ACCEPTANCE_TOKEN",
+    "PSE_INSTITUTIONS",
+    "WompiReferenceData",
+]
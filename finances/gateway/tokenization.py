@@ -9,6 +9,8 @@ import logging
 import requests
 from django.conf import settings
 
+from finances.gateway.http import wompi_request
+
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +63,8 @@ class TokenizationMixin:
             headers["Authorization"] = f"Bearer {public_key}"
 
         try:
-            response = requests.post(
+            response = wompi_request(
+                "POST",
                 url,
                 json=payload,
                 headers=headers,
@@ -98,7 +101,8 @@ class TokenizationMixin:
         }
 
         try:
-            response = requests.post(
+            response = wompi_request(
+                "POST",
                 url,
                 json=payload,
                 headers=self._headers(),
@@ -146,7 +150,8 @@ class TokenizationMixin:
         payload = {"phone_number": phone_number}
 
         try:
-            response = requests.post(
+            response = wompi_request(
+                "POST",
                 url,
                 json=payload,
                 headers=self._headers(),
@@ -183,7 +188,8 @@ class TokenizationMixin:
         url = f"{self.base_url.rstrip('/')}/tokens/nequi/{token_id}"
 
         try:
-            response = requests.get(
+            response = wompi_request(
+                "GET",
                 url,
                 headers=self._headers(),
                 timeout=self.REQUEST_TIMEOUT,
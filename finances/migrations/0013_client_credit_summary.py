@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:40
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+from django.utils import timezone
+
+
+def backfill_credit_summaries(apps, schema_editor):
+    ClientCredit = apps.get_model("finances", "ClientCredit")
+    ClientCreditSummary = apps.get_model("finances", "ClientCreditSummary")
+    rows = (
+        ClientCredit.objects.filter(
+            status__in=["AVAILABLE", "PARTIALLY_USED"],
+            expires_at__gte=timezone.now().date(),
+        )
+        .values("user_id")
+        .annotate(
+            available_amount=Sum("remaining_amount"),
+            active_credits=Count("id"),
+            next_expires_at=Min("expires_at"),
+        )
+    )
+    ClientCreditSummary.objects.bulk_create(
+        [ClientCreditSummary(**row) for row in rows], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0012_add_payment_fields_to_commission_ledger'),
+        ('users', '0013_encrypt_totp_secret'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientCreditSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='credit_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('available_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('active_credits', models.PositiveIntegerField(default=0)),
+                ('next_expires_at', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Resumen de créditos',
+                'verbose_name_plural': 'Resúmenes de créditos',
+            },
+        ),
+        migrations.RunPython(backfill_credit_summaries, reverse_code=migrations.RunPython.noop),
+    ]
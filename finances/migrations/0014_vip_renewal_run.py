@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:51
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0013_client_credit_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VipRenewalRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('run_date', models.DateField(db_index=True)),
+                ('status', models.CharField(choices=[('PLANNING', 'Planificando'), ('RUNNING', 'En curso'), ('COMPLETED', 'Completada')], default='PLANNING', max_length=20)),
+                ('planned', models.PositiveIntegerField(default=0)),
+                ('approved', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('declined', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Corrida de renovaciones VIP',
+                'verbose_name_plural': 'Corridas de renovaciones VIP',
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -6,9 +6,9 @@ principal liviano sin cambiar los puntos de importación existentes.
 """
 
 from .commission_models import CommissionLedger
-from .credit_models import ClientCredit, FinancialAdjustment
+from .credit_models import ClientCredit, ClientCreditSummary, FinancialAdjustment
 from .payment_models import Payment, PaymentCreditUsage
-from .subscription_models import SubscriptionLog
+from .subscription_models import SubscriptionLog, VipRenewalRun
 from .token_models import PaymentToken
 from .webhook_models import WebhookEvent
 
@@ -16,8 +16,10 @@ __all__ = [
     "Payment",
     "PaymentCreditUsage",
     "ClientCredit",
+    "ClientCreditSummary",
     "FinancialAdjustment",
     "SubscriptionLog",
+    "VipRenewalRun",
     "WebhookEvent",
     "PaymentToken",
     "CommissionLedger",
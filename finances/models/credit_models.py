@@ -1,6 +1,11 @@
+from decimal import Decimal
+
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from core.models import BaseModel
 
@@ -14,6 +19,8 @@ class ClientCredit(BaseModel):
         USED = "USED", "Usado"
         EXPIRED = "EXPIRED", "Expirado"
 
+    ACTIVE_STATUSES = (CreditStatus.AVAILABLE, CreditStatus.PARTIALLY_USED)
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -42,6 +49,87 @@ class ClientCredit(BaseModel):
     def __str__(self):
         return f"Credit {self.id} - {self.user} ({self.remaining_amount})"
 
+    @classmethod
+    def usable_for(cls, user_id, today=None):
+        """Créditos vigentes del usuario, en orden FIFO."""
+        return cls.objects.filter(
+            user_id=user_id,
+            status__in=cls.ACTIVE_STATUSES,
+            expires_at__gte=today or timezone.now().date(),
+        ).order_by("created_at", "id")
+
+
+class ClientCreditSummary(models.Model):
+    """
+    Saldo a favor vigente por usuario.
+
+    Se recalcula en la misma transacción en que un crédito se emite, se
+    consume o expira (``finances.signals`` y ``apply_credits_to_payment``),
+    así los previews de checkout leen una sola fila. Los créditos que vencen
+    por fecha dejan la fila desactualizada hasta ``expire_client_credits``;
+    ``is_stale`` lo detecta mediante ``next_expires_at``.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="credit_summary",
+    )
+    available_amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0"))
+    active_credits = models.PositiveIntegerField(default=0)
+    next_expires_at = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Resumen de créditos"
+        verbose_name_plural = "Resúmenes de créditos"
+
+    def __str__(self):
+        return f"Créditos de {self.user_id}: {self.available_amount}"
+
+    def is_stale(self, today=None):
+        today = today or timezone.now().date()
+        return self.next_expires_at is not None and self.next_expires_at < today
+
+    @classmethod
+    def compute(cls, user_id, today=None):
+        return ClientCredit.usable_for(user_id, today).order_by().aggregate(
+            available_amount=Coalesce(Sum("remaining_amount"), Decimal("0")),
+            active_credits=Count("id"),
+            next_expires_at=Min("expires_at"),
+        )
+
+    @classmethod
+    def rebuild(cls, user_id, create=True):
+        """Recalcula la fila del usuario. Con ``create=False`` solo actualiza si existe."""
+        values = cls.compute(user_id)
+        if not create:
+            cls.objects.filter(user_id=user_id).update(updated_at=timezone.now(), **values)
+            return None
+        summary, _ = cls.objects.update_or_create(user_id=user_id, defaults=values)
+        return summary
+
+    @classmethod
+    def for_user(cls, user_id):
+        """Lectura de una fila; solo recalcula si falta o venció algún crédito."""
+        summary = cls.objects.filter(user_id=user_id).first()
+        if summary is None or summary.is_stale():
+            summary = cls.rebuild(user_id)
+        return summary
+
+    @classmethod
+    def lock_for_user(cls, user_id):
+        """
+        Bloquea la fila del usuario (dentro de una transacción): serializa
+        los consumos concurrentes del mismo usuario sin tocar sus créditos.
+        """
+        summary = cls.objects.select_for_update().filter(user_id=user_id).first()
+        if summary is None or summary.is_stale():
+            cls.rebuild(user_id)
+            summary = cls.objects.select_for_update().get(user_id=user_id)
+        return summary
+
 
 class FinancialAdjustment(BaseModel):
     """Ajustes financieros manuales (créditos/débitos) realizados por administradores."""
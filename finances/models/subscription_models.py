@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from core.models import BaseModel
 
@@ -24,3 +25,57 @@ class SubscriptionLog(BaseModel):
 
     def __str__(self):
         return f"SubscriptionLog {self.user} {self.start_date} - {self.end_date}"
+
+
+class VipRenewalRun(BaseModel):
+    """
+    Resumen de una corrida de renovaciones VIP automáticas.
+
+    El planificador crea la corrida y encola un cobro por usuario; cada
+    subtarea suma su resultado con ``record`` (incrementos atómicos) y la
+    última en terminar marca la corrida como completada.
+    """
+
+    class Status(models.TextChoices):
+        PLANNING = "PLANNING", "Planificando"
+        RUNNING = "RUNNING", "En curso"
+        COMPLETED = "COMPLETED", "Completada"
+
+    OUTCOMES = ("approved", "pending", "declined", "skipped")
+
+    run_date = models.DateField(db_index=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PLANNING)
+    planned = models.PositiveIntegerField(default=0)
+    approved = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    declined = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        verbose_name = "Corrida de renovaciones VIP"
+        verbose_name_plural = "Corridas de renovaciones VIP"
+
+    def __str__(self):
+        return f"VipRenewalRun {self.run_date} ({self.status})"
+
+    @property
+    def processed(self):
+        return sum(getattr(self, outcome) for outcome in self.OUTCOMES)
+
+    @classmethod
+    def record(cls, run_id, outcome):
+        """Suma un resultado a la corrida y la cierra si ya no quedan cobros."""
+        if outcome not in cls.OUTCOMES:
+            raise ValueError(f"Resultado de renovación desconocido: {outcome}")
+        cls.objects.filter(pk=run_id).update(**{outcome: models.F(outcome) + 1})
+        cls.complete_if_done(run_id)
+
+    @classmethod
+    def complete_if_done(cls, run_id):
+        processed = models.F("approved") + models.F("pending") + models.F("declined") + models.F("skipped")
+        return cls.objects.filter(
+            pk=run_id,
+            status=cls.Status.RUNNING,
+            planned__lte=processed,
+        ).update(status=cls.Status.COMPLETED, finished_at=timezone.now())
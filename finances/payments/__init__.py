@@ -11,11 +11,13 @@ Exporta:
 Módulos internos:
 - credits: Lógica FIFO de créditos
 - status_handler: Procesamiento de estado de gateway
+- reconciliation: Reconciliación concurrente de pagos pendientes
 - appointment_initiation: Flujo de inicio de pago de citas
 - appointment_payments: Funciones base de pagos de citas
 - order_payments: Pagos de órdenes y paquetes
 - wompi_methods: Métodos de pago PSE/Nequi/Daviplata/Bancolombia
 - recurrence: Cobros recurrentes
+- vip_renewals: Renovaciones VIP automáticas por lotes
 - utils: Utilidades varias
 """
 from finances.payments.credits import (
@@ -28,6 +30,7 @@ from finances.payments.status_handler import (
     poll_pending_payment,
     send_payment_status_notification,
 )
+from finances.payments.reconciliation import PaymentReconciler
 from finances.payments.appointment_initiation import initiate_appointment_payment
 from finances.payments.appointment_payments import (
     calculate_outstanding_amount,
@@ -47,6 +50,7 @@ from finances.payments.wompi_methods import (
     create_bancolombia_transfer_payment,
 )
 from finances.payments.recurrence import charge_recurrence_token
+from finances.payments.vip_renewals import VipRenewalService
 from finances.payments.utils import (
     build_tax_payload,
     build_customer_data,
@@ -101,6 +105,11 @@ class PaymentService:
         """Consulta estado de un pago pendiente en Wompi."""
         return poll_pending_payment(payment, timeout_minutes)
 
+    @staticmethod
+    def reconcile_pending_payments(payments, task="manual"):
+        """Consulta en paralelo el estado en Wompi de varios pagos y aplica las transiciones."""
+        return PaymentReconciler(task=task).reconcile(payments)
+
     # ========================================
     # PAGOS DE CITAS
     # ========================================
@@ -245,9 +254,9 @@ class PaymentService:
     # ========================================
     
     @classmethod
-    def charge_recurrence_token(cls, user, amount, token):
+    def charge_recurrence_token(cls, user, amount, token, reference=None):
         """Ejecuta un cobro recurrente usando payment_source_id."""
-        return charge_recurrence_token(user, amount, token)
+        return charge_recurrence_token(user, amount, token, reference=reference)
 
     # ========================================
     # UTILIDADES
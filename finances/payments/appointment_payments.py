@@ -14,13 +14,14 @@ from decimal import Decimal
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.utils import timezone
 
 from core.models import GlobalSettings
-from finances.models import ClientCredit, Payment, PaymentCreditUsage
+from finances.models import Payment, PaymentCreditUsage
 from finances.services import DeveloperCommissionService
 from spa.models import Appointment
 
+from .credits import apply_credits_to_payment
+
 
 logger = logging.getLogger(__name__)
 
@@ -184,29 +185,9 @@ class AppointmentPaymentHelper:
         advance_percentage = Decimal(settings.advance_payment_percentage / 100)
         required_advance = price * advance_percentage
 
-        # Buscar créditos válidos (disponibles, no expirados) del usuario
-        available_credits = ClientCredit.objects.select_for_update().filter(
-            user=self.user,
-            status__in=[ClientCredit.CreditStatus.AVAILABLE,
-                        ClientCredit.CreditStatus.PARTIALLY_USED],
-            expires_at__gte=timezone.now().date()
-        ).order_by('created_at')  # Usar los créditos más antiguos primero
-
-        amount_to_pay = required_advance
-        credit_movements: list[tuple[ClientCredit, Decimal]] = []
-
-        for credit in available_credits:
-            if amount_to_pay <= 0:
-                break
-
-            amount_from_this_credit = min(
-                amount_to_pay, credit.remaining_amount)
-
-            credit.remaining_amount -= amount_from_this_credit
-            credit.save(update_fields=['remaining_amount', 'status', 'updated_at'])
-
-            amount_to_pay -= amount_from_this_credit
-            credit_movements.append((credit, amount_from_this_credit))
+        credit_result = apply_credits_to_payment(self.user, required_advance)
+        amount_to_pay = credit_result.amount_remaining
+        credit_movements = credit_result.credit_movements
 
         # Crear el registro de pago
         payment = Payment.objects.create(
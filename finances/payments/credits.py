@@ -11,7 +11,7 @@ from decimal import Decimal
 from django.db import transaction
 from django.utils import timezone
 
-from finances.models import ClientCredit
+from finances.models import ClientCredit, ClientCreditSummary
 
 
 logger = logging.getLogger(__name__)
@@ -36,10 +36,11 @@ def apply_credits_to_payment(user, total_amount):
     Aplica créditos disponibles del usuario a un monto total.
 
     Esta función:
-    1. Busca créditos disponibles y no expirados del usuario
-    2. Los aplica en orden FIFO (primero los más antiguos)
+    1. Bloquea el resumen de créditos del usuario (ClientCreditSummary)
+    2. Toma uno a uno los créditos vigentes en orden FIFO (primero los más
+       antiguos), bloqueando solo los que consume (SKIP LOCKED)
     3. Actualiza el remaining_amount y status de cada crédito usado
-    4. Retorna cuánto falta por pagar y los movimientos de crédito
+    4. Recalcula el resumen y retorna cuánto falta por pagar y los movimientos
 
     Args:
         user: Usuario que posee los créditos
@@ -58,27 +59,29 @@ def apply_credits_to_payment(user, total_amount):
             credit_movements=[]
         )
 
-    # Buscar créditos válidos (disponibles, no expirados) del usuario
-    available_credits = ClientCredit.objects.select_for_update().filter(
-        user=user,
-        status__in=[
-            ClientCredit.CreditStatus.AVAILABLE,
-            ClientCredit.CreditStatus.PARTIALLY_USED
-        ],
-        expires_at__gte=timezone.now().date()
-    ).order_by('created_at')  # FIFO: usar los créditos más antiguos primero
+    # La fila de resumen serializa los consumos del mismo usuario; los
+    # créditos solo se bloquean a medida que se consumen.
+    summary = ClientCreditSummary.lock_for_user(user.id)
+    if summary.available_amount <= Decimal('0'):
+        return CreditApplicationResult(
+            amount_remaining=total_amount,
+            credits_applied=Decimal('0'),
+            credit_movements=[]
+        )
 
+    candidates = ClientCredit.usable_for(user.id).filter(remaining_amount__gt=Decimal('0'))
     amount_remaining = total_amount
     credit_movements = []
 
-    for credit in available_credits:
-        if amount_remaining <= Decimal('0'):
+    while amount_remaining > Decimal('0'):
+        # FIFO: el crédito más antiguo que nadie más tenga bloqueado. Los ya
+        # agotados salen del filtro por estado en la siguiente vuelta.
+        credit = candidates.select_for_update(skip_locked=True).first()
+        if credit is None:
             break
 
         # Calcular cuánto tomar de este crédito
         amount_from_this_credit = min(amount_remaining, credit.remaining_amount)
-
-        # Actualizar el crédito
         credit.remaining_amount -= amount_from_this_credit
 
         # Actualizar estado del crédito
@@ -86,8 +89,14 @@ def apply_credits_to_payment(user, total_amount):
             credit.status = ClientCredit.CreditStatus.USED
         else:
             credit.status = ClientCredit.CreditStatus.PARTIALLY_USED
+        credit.updated_at = timezone.now()
 
-        credit.save(update_fields=['remaining_amount', 'status', 'updated_at'])
+        # update() en vez de save(): el resumen se recalcula una sola vez al final
+        ClientCredit.objects.filter(pk=credit.pk).update(
+            remaining_amount=credit.remaining_amount,
+            status=credit.status,
+            updated_at=credit.updated_at,
+        )
 
         # Registrar el movimiento
         credit_movements.append((credit, amount_from_this_credit))
@@ -98,6 +107,9 @@ def apply_credits_to_payment(user, total_amount):
             credit.id, user.id, amount_from_this_credit, credit.remaining_amount
         )
 
+    if credit_movements:
+        ClientCreditSummary.rebuild(user.id)
+
     credits_applied = total_amount - amount_remaining
 
     return CreditApplicationResult(
@@ -133,17 +145,8 @@ def preview_credits_application(user, total_amount):
             'fully_covered': True
         }
     
-    # Buscar créditos válidos (disponibles, no expirados) del usuario - SOLO LECTURA
-    available_credits = ClientCredit.objects.filter(
-        user=user,
-        status__in=[
-            ClientCredit.CreditStatus.AVAILABLE,
-            ClientCredit.CreditStatus.PARTIALLY_USED
-        ],
-        expires_at__gte=timezone.now().date()
-    ).order_by('created_at')  # FIFO: usar los créditos más antiguos primero
-    
-    total_available = sum(c.remaining_amount for c in available_credits)
+    # Lectura de una sola fila: el resumen se mantiene al emitir/usar/expirar créditos
+    total_available = ClientCreditSummary.for_user(user.id).available_amount
     credits_to_apply = min(total_amount, total_available)
     amount_remaining = max(Decimal('0'), total_amount - credits_to_apply)
     
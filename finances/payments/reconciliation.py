@@ -0,0 +1,172 @@
+"""
+Reconciliación concurrente de pagos con Wompi.
+
+Separa las dos fases que antes se hacían en serie por pago:
+
+1. Consulta de estados en Wompi desde un pool acotado de hilos que comparten
+   la sesión HTTP del proceso (``get_wompi_session``). Solo hay I/O de red en
+   los hilos.
+2. Aplicación de transiciones en el hilo que invoca, una transacción corta
+   por pago (``apply_gateway_status`` bloquea la fila con select_for_update).
+
+Antes de cada consulta se revisa el circuit breaker de ``WompiGateway``: si
+se abre a mitad de la corrida, los pagos restantes se omiten sin tocarlos
+(no se marcan TIMEOUT) y se reintentan en la siguiente ejecución. Lo mismo
+ocurre al agotar el presupuesto de tiempo, para no chocar con
+``CELERY_TASK_TIME_LIMIT``: cada consulta recibe un timeout y un número de
+reintentos recortados a lo que queda del presupuesto, y una consulta fallida
+(circuito abierto, timeout, error de red) también se omite.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.infra.metrics import get_counter, get_histogram
+from finances.gateway import WompiGateway
+from finances.gateway.http import resolve_timeout
+from finances.models import Payment
+from finances.payments.status_handler import apply_gateway_status
+
+logger = logging.getLogger(__name__)
+
+reconciliation_payments = get_counter(
+    "payment_reconciliation_payments_total",
+    "Pagos procesados por la reconciliación con Wompi",
+    ["task", "outcome"],
+)
+reconciliation_duration = get_histogram(
+    "payment_reconciliation_duration_seconds",
+    "Duración de cada corrida de reconciliación con Wompi",
+    ["task"],
+)
+
+OUTCOME_UPDATED = "updated"
+OUTCOME_UNCHANGED = "unchanged"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_SKIPPED = "skipped"
+
+# Por debajo de esto no se inicia una consulta: un timeout forzado contaría
+# como fallo en el circuit breaker sin que Wompi esté caído.
+MIN_FETCH_SECONDS = 1.0
+MAX_FETCH_ATTEMPTS = 3
+
+
+class PaymentReconciler:
+    """Consulta y aplica el estado en Wompi de un lote de pagos pendientes."""
+
+    def __init__(self, task="manual", max_workers=None, time_budget=None, gateway=None):
+        self.task = task
+        self.max_workers = max_workers or getattr(settings, "WOMPI_RECONCILE_CONCURRENCY", 8)
+        self.time_budget = time_budget or getattr(settings, "WOMPI_RECONCILE_TIME_BUDGET", 80)
+        self.gateway = gateway or WompiGateway()
+
+    def reconcile(self, payments):
+        """
+        Devuelve un resumen ``{checked, updated, timeout, skipped, elapsed, throughput}``.
+
+        Solo se consultan pagos PENDING (igual que ``poll_pending_payment``);
+        los que no tienen ``transaction_id`` pasan directamente a TIMEOUT.
+        """
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        summary = {
+            "checked": 0,
+            OUTCOME_UPDATED: 0,
+            OUTCOME_UNCHANGED: 0,
+            OUTCOME_TIMEOUT: 0,
+            OUTCOME_SKIPPED: 0,
+        }
+
+        to_fetch = []
+        for payment in payments:
+            if payment.status != Payment.PaymentStatus.PENDING:
+                continue
+            if not payment.transaction_id:
+                self._record(summary, self._mark_timeout(payment))
+                continue
+            to_fetch.append(payment)
+
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="wompi-reconcile") as pool:
+                futures = {
+                    pool.submit(self._fetch, payment.transaction_id, deadline): payment
+                    for payment in to_fetch
+                }
+                for future in as_completed(futures):
+                    payment = futures[future]
+                    fetched, tx = future.result()
+                    if not fetched:
+                        self._record(summary, OUTCOME_SKIPPED)
+                        continue
+                    self._record(summary, self._apply(payment, tx))
+
+        elapsed = time.monotonic() - started
+        reconciliation_duration.labels(task=self.task).observe(elapsed)
+        summary["elapsed"] = round(elapsed, 3)
+        summary["throughput"] = round(summary["checked"] / elapsed, 2) if elapsed > 0 else 0.0
+        logger.info(
+            "Reconciliación Wompi (%s): %d pagos en %.2fs (%.1f pagos/s), %d actualizados, %d omitidos",
+            self.task, summary["checked"], elapsed, summary["throughput"],
+            summary[OUTCOME_UPDATED], summary[OUTCOME_SKIPPED],
+        )
+        return summary
+
+    def _fetch(self, reference, deadline):
+        """Se ejecuta en el pool: solo red, sin acceso a la base de datos."""
+        remaining = deadline - time.monotonic()
+        if remaining < MIN_FETCH_SECONDS or not WompiGateway._circuit_allows():
+            return False, None
+        timeout, attempts = self._fetch_budget(remaining)
+        return True, self.gateway.fetch_transaction(reference, timeout=timeout, attempts=attempts)
+
+    @staticmethod
+    def _fetch_budget(remaining):
+        """
+        Timeout ``(conexión, lectura)`` e intentos para que la consulta, con el
+        backoff de ``_request_with_retry`` (0.5s, 1s), quepa en ``remaining``.
+        """
+        connect, read = resolve_timeout("/v1/transactions")
+        for attempts in range(MAX_FETCH_ATTEMPTS, 0, -1):
+            backoff = sum(0.5 * 2 ** i for i in range(attempts - 1))
+            if attempts * (connect + read) + backoff <= remaining:
+                return (connect, read), attempts
+        connect = min(connect, remaining / 2)
+        return (connect, remaining - connect), 1
+
+    def _apply(self, payment, tx):
+        if tx is None:
+            # Circuito abierto, timeout o error de red: se reintenta en la
+            # siguiente corrida en lugar de darlo por vencido.
+            return OUTCOME_SKIPPED
+        transaction_data = tx.get("data") or tx
+        transaction_status = transaction_data.get("status")
+        if not transaction_status:
+            return self._mark_timeout(payment)
+        try:
+            new_status = apply_gateway_status(payment, transaction_status, transaction_data)
+        except Exception:
+            logger.exception("Error aplicando estado Wompi al pago %s", payment.pk)
+            return OUTCOME_UNCHANGED
+        payment.status = new_status
+        return OUTCOME_UNCHANGED if new_status == Payment.PaymentStatus.PENDING else OUTCOME_UPDATED
+
+    @staticmethod
+    def _mark_timeout(payment):
+        # Condicional: un webhook pudo resolver el pago mientras se consultaba
+        changed = Payment.objects.filter(
+            pk=payment.pk, status=Payment.PaymentStatus.PENDING
+        ).update(status=Payment.PaymentStatus.TIMEOUT, updated_at=timezone.now())
+        if not changed:
+            return OUTCOME_UNCHANGED
+        payment.status = Payment.PaymentStatus.TIMEOUT
+        return OUTCOME_TIMEOUT
+
+    def _record(self, summary, outcome):
+        if outcome != OUTCOME_SKIPPED:
+            summary["checked"] += 1
+        summary[outcome] += 1
+        reconciliation_payments.labels(task=self.task, outcome=outcome).inc()
+
@@ -17,11 +17,14 @@ from finances.models import Payment
 logger = logging.getLogger(__name__)
 
 
-def charge_recurrence_token(user, amount, token):
+def charge_recurrence_token(user, amount, token, reference=None):
     """
     Ejecuta un cobro recurrente usando una fuente de pago (payment_source_id)
     previamente creada en Wompi (Cards, Nequi, Daviplata, Bancolombia, etc.).
 
+    ``reference`` permite fijar la referencia del cobro: Wompi rechaza
+    referencias repetidas, así que un reintento con la misma no cobra dos veces.
+
     Retorna:
         (Payment.PaymentStatus, transaction_payload (dict), reference (str))
     """
@@ -67,7 +70,7 @@ def charge_recurrence_token(user, amount, token):
 
     currency = getattr(settings, "WOMPI_CURRENCY", "COP") or "COP"
     amount_in_cents = int(amount_decimal * Decimal('100'))
-    reference = f"VIP-AUTO-{user.id}-{uuid.uuid4().hex[:8]}"
+    reference = reference or f"VIP-AUTO-{user.id}-{uuid.uuid4().hex[:8]}"
 
     payload = {
         "amount_in_cents": amount_in_cents,
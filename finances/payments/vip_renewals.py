@@ -0,0 +1,195 @@
+"""
+Renovaciones VIP automáticas por lotes.
+
+El cobro recurrente se divide en dos partes:
+
+1. Planificación (``VipRenewalService.due_user_ids``): recorre por páginas de
+   ``id`` los VIP con renovación automática que vencen dentro de la ventana.
+   La tarea ``process_recurring_subscriptions`` crea un ``VipRenewalRun`` y
+   encola un cobro por usuario, escalonando los lotes para acotar cuántos
+   cobros llegan a Wompi a la vez.
+2. Cobro (``VipRenewalService.renew``): una subtarea por usuario. Bajo el
+   bloqueo de la fila del usuario crea el ``Payment`` con una referencia
+   determinista por usuario y día; si ya existe, o hay otro cobro VIP
+   pendiente, no se vuelve a cobrar. La llamada a Wompi ocurre fuera de la
+   transacción.
+
+Cada subtarea suma su resultado a la corrida con ``VipRenewalRun.record``.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.infra.metrics import get_counter
+from core.models import GlobalSettings
+from finances.models import Payment, VipRenewalRun
+from notifications.services import NotificationService
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+vip_renewals = get_counter(
+    "vip_renewals_total",
+    "Resultados de los cobros de renovación VIP automática",
+    ["outcome"],
+)
+
+RENEWAL_WINDOW_DAYS = 3
+MAX_FAILED_PAYMENTS = 3
+
+
+class VipRenewalService:
+    """Selección de VIP por renovar y cobro idempotente por usuario."""
+
+    @staticmethod
+    def due_users(today=None):
+        window = (today or timezone.now().date()) + timedelta(days=RENEWAL_WINDOW_DAYS)
+        return CustomUser.objects.filter(
+            role=CustomUser.Role.VIP,
+            vip_auto_renew=True,
+            vip_expires_at__isnull=False,
+            vip_expires_at__lte=window,
+        )
+
+    @classmethod
+    def due_user_ids(cls, chunk_size, today=None):
+        """Genera listas de ids paginando por ``id`` (sin OFFSET)."""
+        queryset = cls.due_users(today).order_by("id").values_list("id", flat=True)
+        last_id = None
+        while True:
+            page = queryset if last_id is None else queryset.filter(id__gt=last_id)
+            chunk = list(page[:chunk_size])
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1]
+
+    @staticmethod
+    def reference_for(user, today):
+        # Una referencia por usuario y día: los reintentos de la subtarea y
+        # las corridas repetidas del planificador no generan cobros nuevos.
+        return f"VIP-AUTO-{user.id}-{today:%Y%m%d}"
+
+    @classmethod
+    def renew(cls, user_id, run_id=None):
+        """
+        Cobra la renovación de un usuario y devuelve el resultado:
+        ``approved``, ``pending``, ``declined`` o ``skipped``.
+        """
+        outcome = cls._renew(user_id)
+        vip_renewals.labels(outcome=outcome).inc()
+        if run_id:
+            VipRenewalRun.record(run_id, outcome)
+        return outcome
+
+    @classmethod
+    def _renew(cls, user_id):
+        from finances.payments import PaymentService
+
+        vip_price = GlobalSettings.load().vip_monthly_price
+        if vip_price is None or vip_price <= 0:
+            return "skipped"
+
+        today = timezone.now().date()
+        with transaction.atomic():
+            user = cls.due_users(today).select_for_update().filter(pk=user_id).first()
+            if user is None:
+                return "skipped"
+            reference = cls.reference_for(user, today)
+            in_flight = Payment.objects.filter(
+                Q(transaction_id=reference) | Q(status=Payment.PaymentStatus.PENDING),
+                user=user,
+                payment_type=Payment.PaymentType.VIP_SUBSCRIPTION,
+            ).exists()
+            if in_flight:
+                logger.info(
+                    "Renovación VIP del usuario %s omitida: ya hay un cobro en curso o hecho hoy.",
+                    user.id,
+                )
+                return "skipped"
+            payment = Payment.objects.create(
+                user=user,
+                amount=vip_price,
+                status=Payment.PaymentStatus.PENDING,
+                payment_type=Payment.PaymentType.VIP_SUBSCRIPTION,
+                transaction_id=reference,
+            )
+
+        status_result = Payment.PaymentStatus.DECLINED
+        if user.vip_payment_token:
+            try:
+                status_result, transaction_payload, _ = PaymentService.charge_recurrence_token(
+                    user=user,
+                    amount=vip_price,
+                    token=user.vip_payment_token,
+                    reference=reference,
+                )
+            except Exception as exc:
+                logger.exception(
+                    "Error al ejecutar el cobro recurrente VIP para el usuario %s",
+                    user.id,
+                )
+                transaction_payload = {
+                    "reference": reference,
+                    "status": "ERROR",
+                    "error": str(exc),
+                }
+                status_result = Payment.PaymentStatus.DECLINED
+        else:
+            logger.warning(
+                "Usuario %s no tiene token de pago VIP; el cobro se marcará como fallido.",
+                user.id,
+            )
+            transaction_payload = {
+                "reference": reference,
+                "status": "ERROR",
+                "error": "missing_token",
+            }
+
+        final_status = PaymentService.apply_gateway_status(
+            payment, status_result, transaction_payload)
+
+        if final_status == Payment.PaymentStatus.APPROVED:
+            CustomUser.objects.filter(pk=user.pk).update(
+                vip_failed_payments=0, updated_at=timezone.now())
+            return "approved"
+
+        if final_status == Payment.PaymentStatus.PENDING:
+            logger.info(
+                "Cobro VIP recurrente pendiente para el usuario %s; esperando confirmación de Wompi.",
+                user.id,
+            )
+            # No alteramos los contadores hasta recibir webhook/consulta.
+            return "pending"
+
+        cls._register_failure(user)
+        return "declined"
+
+    @staticmethod
+    def _register_failure(user):
+        with transaction.atomic():
+            user = CustomUser.objects.select_for_update().get(pk=user.pk)
+            user.vip_failed_payments += 1
+            subscription_status = "PAST_DUE"
+            if user.vip_failed_payments >= MAX_FAILED_PAYMENTS:
+                user.vip_auto_renew = False
+                subscription_status = "CANCELLED"
+            user.save(update_fields=['vip_failed_payments',
+                      'vip_auto_renew', 'updated_at'])
+        try:
+            user_name = user.get_full_name() or user.first_name or "Cliente"
+            NotificationService.send_notification(
+                user=user,
+                event_code="VIP_RENEWAL_FAILED",
+                context={
+                    "user_name": user_name,
+                    "status": subscription_status,
+                    "failed_attempts": user.vip_failed_payments,
+                },
+            )
+        except Exception:
+            logger.exception(
+                "No se pudo notificar fallo de renovación VIP para el usuario %s", user.id)
@@ -10,6 +10,8 @@ from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 
+from finances.gateway.http import wompi_request
+
 logger = logging.getLogger(__name__)
 
 
@@ -101,9 +103,9 @@ class WompiPayoutsHttpMixin(WompiPayoutsCircuitMixin):
             try:
                 logger.debug("[Wompi Payouts] %s %s (intento %d/%d)", method.upper(), endpoint, attempt, self.MAX_RETRIES)
 
-                response = requests.request(
-                    method=method,
-                    url=url,
+                response = wompi_request(
+                    method,
+                    url,
                     timeout=self.REQUEST_TIMEOUT,
                     headers=self._headers(),
                     **kwargs,
@@ -0,0 +1,25 @@
+"""
+Signals de finanzas.
+
+Mantienen ``ClientCreditSummary`` al día cuando un crédito se emite, se
+modifica o se elimina con ``save()``/``delete()``. Las actualizaciones masivas
+(``QuerySet.update``) deben recalcular el resumen explícitamente, como hacen
+``apply_credits_to_payment`` y ``expire_client_credits``.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from finances.models import ClientCredit, ClientCreditSummary
+
+
+@receiver(post_save, sender=ClientCredit)
+def refresh_credit_summary_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    ClientCreditSummary.rebuild(instance.user_id)
+
+
+@receiver(post_delete, sender=ClientCredit)
+def refresh_credit_summary_on_delete(sender, instance, **kwargs):
+    # Sin crear filas: en el borrado en cascada de un usuario el resumen ya no existe
+    ClientCreditSummary.rebuild(instance.user_id, create=False)
@@ -6,21 +6,24 @@ Incluye tasks de:
 - Suscripciones VIP recurrentes
 - Expiración de suscripciones VIP
 - Comisiones del desarrollador
+- Refresco de datos de referencia de Wompi
+- Expiración de créditos de clientes
 """
 import logging
-import uuid
 from datetime import timedelta
 from decimal import Decimal
 
 from celery import shared_task
+from django.conf import settings
 from django.utils import timezone
 
 from core.models import GlobalSettings, AuditLog
 from users.models import CustomUser
 from notifications.services import NotificationService
 from .services import DeveloperCommissionService
-from .payments import PaymentService
-from .models import Payment, WebhookEvent
+from .payments import PaymentService, VipRenewalService
+from .gateway import WompiReferenceData
+from .models import ClientCredit, ClientCreditSummary, Payment, VipRenewalRun, WebhookEvent
 
 logger = logging.getLogger(__name__)
 
@@ -57,15 +60,12 @@ def check_pending_payments():
         status=Payment.PaymentStatus.PENDING,
         created_at__lt=threshold,
     )[:100]
-    reviewed = 0
-    updated = 0
-    for payment in pending_payments:
-        before = payment.status
-        result = PaymentService.poll_pending_payment(payment)
-        if result and payment.status != before:
-            updated += 1
-        reviewed += 1
-    return f"Pagos pendientes revisados: {reviewed}, actualizados: {updated}"
+    summary = PaymentService.reconcile_pending_payments(pending_payments, task="check_pending_payments")
+    updated = summary["updated"] + summary["timeout"]
+    return (
+        f"Pagos pendientes revisados: {summary['checked']}, actualizados: {updated}, "
+        f"omitidos: {summary['skipped']}"
+    )
 
 
 @shared_task
@@ -89,26 +89,34 @@ def reconcile_recent_payments(hours=24, limit=200):
         )
         .order_by("-created_at")[:limit]
     )
-    checked = 0
-    updated = 0
-    for payment in candidates:
-        checked += 1
-        if PaymentService.poll_pending_payment(payment):
-            payment.refresh_from_db()
-            if payment.status in (
-                Payment.PaymentStatus.APPROVED,
-                Payment.PaymentStatus.DECLINED,
-                Payment.PaymentStatus.ERROR,
-                Payment.PaymentStatus.TIMEOUT,
-            ):
-                updated += 1
-    return f"Reconciliación: revisados={checked}, actualizados={updated}"
+    summary = PaymentService.reconcile_pending_payments(candidates, task="reconcile_recent_payments")
+    updated = summary["updated"] + summary["timeout"]
+    return (
+        f"Reconciliación: revisados={summary['checked']}, actualizados={updated}, "
+        f"omitidos={summary['skipped']}, pagos/s={summary['throughput']}"
+    )
+
+
+@shared_task
+def refresh_wompi_reference_data(dataset=None):
+    """
+    Refresca el acceptance token y los bancos PSE antes de que envejezcan.
+
+    Si Wompi no responde se conserva el último valor bueno en caché.
+    """
+    if dataset:
+        return {dataset: WompiReferenceData.refresh(dataset)}
+    return WompiReferenceData.refresh_all()
 
 
 @shared_task
 def process_recurring_subscriptions():
     """
-    Intenta cobrar y extender suscripciones VIP que están por vencer.
+    Planifica el cobro de las suscripciones VIP que están por vencer.
+
+    Crea un ``VipRenewalRun`` y encola ``charge_vip_renewal`` por usuario en
+    lotes de ``VIP_RENEWAL_BATCH_SIZE``, separados ``VIP_RENEWAL_BATCH_INTERVAL``
+    segundos para acotar los cobros simultáneos contra Wompi.
     Migrado desde spa.tasks para centralizar lógica de suscripciones VIP.
     """
     settings_obj = GlobalSettings.load()
@@ -116,97 +124,30 @@ def process_recurring_subscriptions():
     if vip_price is None or vip_price <= 0:
         return "Precio VIP no configurado."
 
+    batch_size = getattr(settings, "VIP_RENEWAL_BATCH_SIZE", 20)
+    batch_interval = getattr(settings, "VIP_RENEWAL_BATCH_INTERVAL", 10)
     today = timezone.now().date()
-    window = today + timedelta(days=3)
-    users = CustomUser.objects.filter(
-        role=CustomUser.Role.VIP,
-        vip_auto_renew=True,
-        vip_expires_at__isnull=False,
-        vip_expires_at__lte=window,
-    )
-
-    processed = 0
-    for user in users:
-        reference = f"VIP-AUTO-{user.id}-{uuid.uuid4().hex[:8]}"
-        transaction_payload = {"reference": reference, "status": "PENDING"}
-        status_result = Payment.PaymentStatus.DECLINED
-
-        if user.vip_payment_token:
-            try:
-                status_result, transaction_payload, reference = PaymentService.charge_recurrence_token(
-                    user=user,
-                    amount=vip_price,
-                    token=user.vip_payment_token,
-                )
-            except Exception as exc:
-                logger.exception(
-                    "Error al ejecutar el cobro recurrente VIP para el usuario %s",
-                    user.id,
-                )
-                transaction_payload = {
-                    "reference": reference,
-                    "status": "ERROR",
-                    "error": str(exc),
-                }
-                status_result = Payment.PaymentStatus.DECLINED
-        else:
-            logger.warning(
-                "Usuario %s no tiene token de pago VIP; el cobro se marcará como fallido.",
-                user.id,
+    run = VipRenewalRun.objects.create(run_date=today)
+
+    planned = 0
+    for index, user_ids in enumerate(VipRenewalService.due_user_ids(batch_size, today)):
+        for user_id in user_ids:
+            charge_vip_renewal.apply_async(
+                args=(str(user_id), str(run.id)),
+                countdown=index * batch_interval,
             )
-            transaction_payload = {
-                "reference": reference,
-                "status": "ERROR",
-                "error": "missing_token",
-            }
-
-        payment = Payment.objects.create(
-            user=user,
-            amount=vip_price,
-            status=Payment.PaymentStatus.PENDING,
-            payment_type=Payment.PaymentType.VIP_SUBSCRIPTION,
-            transaction_id=reference,
-        )
+        planned += len(user_ids)
 
-        final_status = PaymentService.apply_gateway_status(
-            payment, status_result, transaction_payload)
+    VipRenewalRun.objects.filter(pk=run.pk).update(
+        planned=planned, status=VipRenewalRun.Status.RUNNING)
+    VipRenewalRun.complete_if_done(run.pk)
+    return f"Renovaciones programadas: {planned} (corrida {run.id})"
 
-        if final_status == Payment.PaymentStatus.APPROVED:
-            user.vip_failed_payments = 0
-            user.save(update_fields=['vip_failed_payments', 'updated_at'])
-            processed += 1
-            continue
 
-        if final_status == Payment.PaymentStatus.PENDING:
-            logger.info(
-                "Cobro VIP recurrente pendiente para el usuario %s; esperando confirmación de Wompi.",
-                user.id,
-            )
-            # No alteramos los contadores hasta recibir webhook/consulta.
-            continue
-
-        user.vip_failed_payments += 1
-        subscription_status = "PAST_DUE"
-        if user.vip_failed_payments >= 3:
-            user.vip_auto_renew = False
-            subscription_status = "CANCELLED"
-        user.save(update_fields=['vip_failed_payments',
-                  'vip_auto_renew', 'updated_at'])
-        try:
-            user_name = user.get_full_name() or user.first_name or "Cliente"
-            NotificationService.send_notification(
-                user=user,
-                event_code="VIP_RENEWAL_FAILED",
-                context={
-                    "user_name": user_name,
-                    "status": subscription_status,
-                    "failed_attempts": user.vip_failed_payments,
-                },
-            )
-        except Exception:
-            logger.exception(
-                "No se pudo notificar fallo de renovación VIP para el usuario %s", user.id)
-    return f"Renovaciones intentadas: {processed}"
+@shared_task
+def charge_vip_renewal(user_id, run_id=None):
+    """Cobra la renovación VIP de un usuario; es seguro reintentarla."""
+    return VipRenewalService.renew(user_id, run_id=run_id)
 
 
 @shared_task
@@ -253,6 +194,25 @@ def downgrade_expired_vips():
     return f"Usuarios degradados: {count}"
 
 
+@shared_task
+def expire_client_credits():
+    """
+    Marca como EXPIRED los créditos vencidos y recalcula el resumen de
+    créditos de los usuarios afectados.
+    """
+    today = timezone.now().date()
+    expired = ClientCredit.objects.filter(
+        status__in=ClientCredit.ACTIVE_STATUSES,
+        expires_at__lt=today,
+    )
+    user_ids = set(expired.values_list("user_id", flat=True))
+    count = expired.update(status=ClientCredit.CreditStatus.EXPIRED, updated_at=timezone.now())
+    for user_id in user_ids:
+        ClientCreditSummary.rebuild(user_id, create=False)
+    logger.info("Créditos expirados: %d (usuarios: %d)", count, len(user_ids))
+    return {"expired": count, "users": len(user_ids)}
+
+
 @shared_task
 def cleanup_old_webhook_events():
     """
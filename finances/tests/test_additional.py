@@ -180,16 +180,19 @@ class TasksTests(TestCase):
         cache.clear()
         self.factory = APIRequestFactory()
 
-    @mock.patch("finances.tasks.PaymentService.poll_pending_payment")
-    def test_check_pending_payments_counts(self, mock_poll):
+    @mock.patch("finances.payments.reconciliation.WompiGateway.fetch_transaction")
+    def test_check_pending_payments_counts(self, mock_fetch):
         old_payment = baker.make(
             Payment,
             status=Payment.PaymentStatus.PENDING,
+            transaction_id="",
             created_at=timezone.now() - timedelta(minutes=20),
         )
         result = check_pending_payments()
-        self.assertIn("Pagos pendientes revisados", result)
-        mock_poll.assert_called_once_with(old_payment)
+        self.assertIn("Pagos pendientes revisados: 1", result)
+        mock_fetch.assert_not_called()
+        old_payment.refresh_from_db()
+        self.assertEqual(old_payment.status, Payment.PaymentStatus.TIMEOUT)
 
     def test_cleanup_old_webhook_events_deletes(self):
         ninety_one_days_ago = timezone.now() - timedelta(days=91)
@@ -0,0 +1,128 @@
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from model_bakery import baker
+
+from finances.models import ClientCredit, ClientCreditSummary
+from finances.payments import apply_credits_to_payment, preview_credits_application
+from finances.tasks import expire_client_credits
+from users.models import CustomUser
+
+
+def _credit(user, amount, days=30, **kwargs):
+    return ClientCredit.objects.create(
+        user=user,
+        initial_amount=Decimal(amount),
+        remaining_amount=Decimal(amount),
+        expires_at=timezone.now().date() + timedelta(days=days),
+        **kwargs,
+    )
+
+
+class ClientCreditSummaryTests(TestCase):
+    def setUp(self):
+        self.user = baker.make(CustomUser)
+
+    def test_issuing_credits_updates_summary(self):
+        _credit(self.user, "30000", days=10)
+        _credit(self.user, "20000", days=5)
+
+        summary = ClientCreditSummary.objects.get(user=self.user)
+        self.assertEqual(summary.available_amount, Decimal("50000"))
+        self.assertEqual(summary.active_credits, 2)
+        self.assertEqual(summary.next_expires_at, timezone.now().date() + timedelta(days=5))
+
+    def test_preview_is_a_single_row_read(self):
+        _credit(self.user, "30000")
+        _credit(self.user, "20000")
+
+        with self.assertNumQueries(1):
+            preview = preview_credits_application(self.user, Decimal("60000"))
+
+        self.assertEqual(preview["available_credits"], Decimal("50000"))
+        self.assertEqual(preview["amount_remaining"], Decimal("10000"))
+
+    def test_apply_consumes_fifo_and_refreshes_summary(self):
+        first = _credit(self.user, "10000")
+        second = _credit(self.user, "30000")
+        untouched = _credit(self.user, "5000")
+
+        result = apply_credits_to_payment(self.user, Decimal("25000"))
+
+        self.assertEqual(result.credits_applied, Decimal("25000"))
+        self.assertEqual([credit for credit, _ in result.credit_movements], [first, second])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertEqual(first.status, ClientCredit.CreditStatus.USED)
+        self.assertEqual(second.remaining_amount, Decimal("15000"))
+        self.assertEqual(second.status, ClientCredit.CreditStatus.PARTIALLY_USED)
+        self.assertEqual(untouched.remaining_amount, Decimal("5000"))
+        summary = ClientCreditSummary.objects.get(user=self.user)
+        self.assertEqual(summary.available_amount, Decimal("20000"))
+        self.assertEqual(summary.active_credits, 2)
+
+    def test_apply_without_balance_does_not_touch_credits(self):
+        result = apply_credits_to_payment(self.user, Decimal("10000"))
+
+        self.assertEqual(result.amount_remaining, Decimal("10000"))
+        self.assertEqual(result.credit_movements, [])
+
+    def test_stale_summary_is_rebuilt_on_read(self):
+        credit = _credit(self.user, "10000", days=3)
+        ClientCredit.objects.filter(pk=credit.pk).update(
+            expires_at=timezone.now().date() - timedelta(days=1)
+        )
+        ClientCreditSummary.objects.filter(user=self.user).update(
+            next_expires_at=timezone.now().date() - timedelta(days=1)
+        )
+
+        self.assertEqual(ClientCreditSummary.for_user(self.user.id).available_amount, Decimal("0"))
+
+    def test_expire_task_marks_credits_and_rebuilds_summary(self):
+        expired = _credit(self.user, "10000", days=3)
+        _credit(self.user, "5000")
+        ClientCredit.objects.filter(pk=expired.pk).update(
+            expires_at=timezone.now().date() - timedelta(days=1)
+        )
+
+        self.assertEqual(expire_client_credits(), {"expired": 1, "users": 1})
+
+        expired.refresh_from_db()
+        self.assertEqual(expired.status, ClientCredit.CreditStatus.EXPIRED)
+        summary = ClientCreditSummary.objects.get(user=self.user)
+        self.assertEqual(summary.available_amount, Decimal("5000"))
+        self.assertEqual(summary.active_credits, 1)
+
+
+class ClientCreditLockingTests(TransactionTestCase):
+    def test_apply_skips_credits_locked_elsewhere(self):
+        user = baker.make(CustomUser)
+        locked = _credit(user, "10000")
+        free = _credit(user, "10000")
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    ClientCredit.objects.select_for_update().get(pk=locked.pk)
+                    holding.set()
+                    release.wait(5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        try:
+            self.assertTrue(holding.wait(5))
+            result = apply_credits_to_payment(user, Decimal("5000"))
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual([credit for credit, _ in result.credit_movements], [free])
@@ -13,7 +13,7 @@ class WompiDisbursementClientTests(TestCase):
         cache.delete(WompiDisbursementClient._CIRCUIT_CACHE_KEY)
 
     @override_settings(WOMPI_PAYOUT_PRIVATE_KEY="prv_x", WOMPI_PAYOUT_BASE_URL="https://api.example.com")
-    @mock.patch("finances.services.requests.request")
+    @mock.patch("requests.Session.request")
     def test_get_available_balance_returns_decimal(self, mocked_request):
         mocked_request.return_value.status_code = 200
         mocked_request.return_value.json.return_value = {"data": [{"balanceInCents": 12345}]}
@@ -22,7 +22,7 @@ class WompiDisbursementClientTests(TestCase):
         self.assertEqual(balance, Decimal("123.45"))
 
     @override_settings(WOMPI_PAYOUT_PRIVATE_KEY="prv_x", WOMPI_PAYOUT_BASE_URL="https://api.example.com")
-    @mock.patch("finances.services.requests.request", side_effect=requests.Timeout)
+    @mock.patch("requests.Session.request", side_effect=requests.Timeout)
     def test_get_available_balance_timeout_raises(self, mocked_request):
         client = WompiDisbursementClient()
         with self.assertRaises(WompiPayoutError):
@@ -33,7 +33,7 @@ class WompiDisbursementClientTests(TestCase):
         WOMPI_PAYOUT_BASE_URL="https://api.example.com",
         WOMPI_DEVELOPER_DESTINATION="dst_123",
     )
-    @mock.patch("finances.services.requests.request")
+    @mock.patch("requests.Session.request")
     def test_create_payout_returns_transfer_id(self, mocked_request):
         mocked_request.return_value.status_code = 200
         mocked_request.return_value.json.return_value = {"data": {"id": "TRF_123"}}
@@ -46,7 +46,7 @@ class WompiDisbursementClientTests(TestCase):
         WOMPI_PAYOUT_BASE_URL="https://api.example.com",
         WOMPI_DEVELOPER_DESTINATION="dst_123",
     )
-    @mock.patch("finances.services.requests.request")
+    @mock.patch("requests.Session.request")
     def test_create_payout_without_transfer_id_raises(self, mocked_request):
         mocked_request.return_value.status_code = 200
         mocked_request.return_value.json.return_value = {"data": {}}
@@ -13,7 +13,7 @@ class WompiGatewayTests(TestCase):
         self.assertEqual(sig, build_integrity_signature("REF1", 1000, "COP"))
 
     @override_settings(WOMPI_BASE_URL="https://sandbox.wompi.co/v1", WOMPI_PUBLIC_KEY="pub_test_abc")
-    @mock.patch("finances.gateway.requests.get")
+    @mock.patch("requests.Session.request")
     def test_resolve_acceptance_token_fetches_and_caches(self, mocked_get):
         mocked_get.return_value.status_code = 200
         mocked_get.return_value.json.return_value = {
@@ -112,7 +112,7 @@ class WompiGatewayTests(TestCase):
         WOMPI_BASE_URL="https://sandbox.wompi.co/v1",
         WOMPI_PUBLIC_KEY="pub_test_123"
     )
-    @mock.patch("finances.gateway.requests.post")
+    @mock.patch("requests.Session.request")
     def test_tokenize_card(self, mock_post):
         """Test card tokenization"""
         mock_post.return_value.status_code = 201
@@ -142,7 +142,7 @@ class WompiGatewayTests(TestCase):
         WOMPI_BASE_URL="https://sandbox.wompi.co/v1",
         WOMPI_PRIVATE_KEY="prv_test_123"
     )
-    @mock.patch("finances.gateway.requests.post")
+    @mock.patch("requests.Session.request")
     def test_tokenize_nequi(self, mock_post):
         """Test Nequi tokenization"""
         mock_post.return_value.status_code = 201
@@ -163,7 +163,7 @@ class WompiGatewayTests(TestCase):
         mock_post.assert_called_once()
 
     @override_settings(WOMPI_BASE_URL="https://sandbox.wompi.co/v1")
-    @mock.patch("finances.gateway.requests.get")
+    @mock.patch("requests.Session.request")
     def test_get_pse_financial_institutions(self, mock_get):
         """Test PSE banks list retrieval"""
         mock_get.return_value.status_code = 200
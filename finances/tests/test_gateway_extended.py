@@ -9,21 +9,21 @@ class WompiGatewayExtendedTest(TestCase):
         self.gateway = WompiGateway(base_url="https://test.wompi.co")
         cache.clear()
 
-    @mock.patch("requests.request")
+    @mock.patch("requests.Session.request")
     def test_request_with_retry_success(self, mock_request):
         mock_request.return_value.status_code = 200
         response = self.gateway._request_with_retry("GET", "https://test.wompi.co/test")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(mock_request.call_count, 1)
 
-    @mock.patch("requests.request")
+    @mock.patch("requests.Session.request")
     def test_request_with_retry_timeout_then_success(self, mock_request):
         mock_request.side_effect = [requests.Timeout, mock.Mock(status_code=200)]
         response = self.gateway._request_with_retry("GET", "https://test.wompi.co/test", attempts=2)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(mock_request.call_count, 2)
 
-    @mock.patch("requests.request")
+    @mock.patch("requests.Session.request")
     def test_request_with_retry_max_retries(self, mock_request):
         mock_request.side_effect = requests.Timeout
         with self.assertRaises(requests.Timeout):
@@ -46,7 +46,7 @@ class WompiPaymentClientExtendedTest(TestCase):
     def setUp(self):
         self.client = WompiPaymentClient(base_url="https://test.wompi.co", private_key="prv_test")
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.request")
     def test_tokenize_card_success(self, mock_post):
         mock_post.return_value.status_code = 200
         mock_post.return_value.json.return_value = {"data": {"id": "tok_123"}}
@@ -60,7 +60,7 @@ class WompiPaymentClientExtendedTest(TestCase):
         )
         self.assertEqual(result["data"]["id"], "tok_123")
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.request")
     def test_tokenize_card_error(self, mock_post):
         mock_post.side_effect = requests.RequestException("Error")
         with self.assertRaises(requests.RequestException):
@@ -72,7 +72,7 @@ class WompiPaymentClientExtendedTest(TestCase):
                 card_holder="John Doe"
             )
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.request")
     def test_create_payment_source_from_token(self, mock_post):
         mock_post.return_value.status_code = 201
         mock_post.return_value.json.return_value = {"data": {"id": 123}}
@@ -84,7 +84,7 @@ class WompiPaymentClientExtendedTest(TestCase):
         )
         self.assertEqual(result["data"]["id"], 123)
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.request")
     def test_create_payment_source_error(self, mock_post):
         mock_post.side_effect = requests.RequestException("Error")
         with self.assertRaises(requests.RequestException):
@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from finances.gateway import WompiGateway, WompiPaymentClient
+from finances.gateway.http import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_ENDPOINT_TIMEOUTS,
+    endpoint_name,
+    get_wompi_session,
+    reset_wompi_session,
+    resolve_timeout,
+)
+from finances.payouts import WompiPayoutsClient
+
+
+class WompiSharedSessionTests(SimpleTestCase):
+    def tearDown(self):
+        reset_wompi_session()
+
+    def test_all_clients_share_the_process_session(self):
+        session = get_wompi_session()
+        self.assertIs(WompiGateway().session, session)
+
+        with mock.patch("requests.Session.request") as mock_request:
+            mock_request.return_value.status_code = 200
+            mock_request.return_value.json.return_value = {"data": []}
+            WompiPaymentClient(base_url="https://sandbox.wompi.co/v1").get_pse_financial_institutions()
+
+        self.assertEqual(mock_request.call_count, 1)
+
+    @override_settings(
+        WOMPI_PAYOUT_PRIVATE_KEY="prv_x",
+        WOMPI_PAYOUT_USER_ID="user_x",
+        WOMPI_PAYOUT_BASE_URL="https://api.payouts.example/v1",
+    )
+    def test_payouts_client_uses_shared_session_and_its_read_timeout(self):
+        with mock.patch("requests.Session.request") as mock_request:
+            mock_request.return_value.status_code = 200
+            mock_request.return_value.json.return_value = {"data": []}
+            WompiPayoutsClient()._request_with_retry("GET", "/accounts")
+
+        self.assertEqual(
+            mock_request.call_args.kwargs["timeout"],
+            (DEFAULT_ENDPOINT_TIMEOUTS["accounts"][0], WompiPayoutsClient.REQUEST_TIMEOUT),
+        )
+
+    def test_reset_discards_session(self):
+        session = get_wompi_session()
+        reset_wompi_session()
+        self.assertIsNot(get_wompi_session(), session)
+
+
+class WompiTimeoutTests(SimpleTestCase):
+    def test_endpoint_name_skips_version_segment(self):
+        self.assertEqual(endpoint_name("https://sandbox.wompi.co/v1/transactions/123"), "transactions")
+        self.assertEqual(endpoint_name("https://sandbox.wompi.co/v1/pse/financial_institutions"), "pse")
+        self.assertEqual(endpoint_name("https://sandbox.wompi.co"), "")
+
+    def test_resolve_timeout_uses_endpoint_defaults(self):
+        self.assertEqual(
+            resolve_timeout("https://sandbox.wompi.co/v1/merchants/pub"),
+            DEFAULT_ENDPOINT_TIMEOUTS["merchants"],
+        )
+
+    def test_numeric_timeout_sets_read_and_keeps_endpoint_connect(self):
+        self.assertEqual(
+            resolve_timeout("https://sandbox.wompi.co/v1/transactions/1", WompiGateway.REQUEST_TIMEOUT),
+            (DEFAULT_CONNECT_TIMEOUT, WompiGateway.REQUEST_TIMEOUT),
+        )
+        self.assertEqual(
+            resolve_timeout("https://sandbox.wompi.co/v1/merchants/pub", 15),
+            (DEFAULT_ENDPOINT_TIMEOUTS["merchants"][0], 15),
+        )
+
+    def test_resolve_timeout_falls_back_to_read_timeout(self):
+        connect, read = resolve_timeout("https://sandbox.wompi.co/v1/unknown", 7)
+        self.assertEqual(read, 7)
+        self.assertLess(connect, read)
+
+    def test_explicit_tuple_and_settings_override(self):
+        self.assertEqual(resolve_timeout("https://x/v1/transactions", (1, 2)), (1, 2))
+        with override_settings(WOMPI_HTTP_TIMEOUTS={"transactions": (1, 4)}):
+            self.assertEqual(resolve_timeout("https://x/v1/transactions/9"), (1, 4))
+            self.assertEqual(resolve_timeout("https://x/v1/transactions/9", 10), (1, 10))
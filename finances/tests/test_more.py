@@ -142,7 +142,7 @@ class DisbursementClientTests(TestCase):
         self.client.private_key = "test_key"
 
     def test_get_available_balance_invalid_json_raises(self):
-        with mock.patch("requests.request") as mock_req:
+        with mock.patch("requests.Session.request") as mock_req:
             mock_req.return_value.status_code = 200
             mock_req.return_value.json.side_effect = ValueError
             with self.assertRaises(Exception): # WompiPayoutError
@@ -154,7 +154,7 @@ class DisbursementClientTests(TestCase):
             self.client.create_payout(1000)
 
     def test_request_with_retry_retries_timeout(self):
-        with mock.patch("requests.request") as mock_req:
+        with mock.patch("requests.Session.request") as mock_req:
             mock_req.side_effect = [requests.Timeout, mock.Mock(status_code=200)]
             self.client._request_with_retry("POST", "http://test.com")
             self.assertEqual(mock_req.call_count, 2)
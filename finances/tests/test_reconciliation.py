@@ -0,0 +1,145 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import TestCase
+from model_bakery import baker
+
+from finances.models import Payment
+from finances.payments.reconciliation import MIN_FETCH_SECONDS, PaymentReconciler
+
+
+class PaymentReconcilerTests(TestCase):
+    def setUp(self):
+        self.payments = [
+            baker.make(Payment, status=Payment.PaymentStatus.PENDING, transaction_id=f"TRX-{i}")
+            for i in range(16)
+        ]
+
+    def _gateway(self, delay=0.0, status="DECLINED"):
+        gateway = mock.Mock()
+        threads = set()
+
+        def fetch(reference, **kwargs):
+            threads.add(threading.get_ident())
+            time.sleep(delay)
+            return {"data": {"id": reference, "status": status}}
+
+        gateway.fetch_transaction.side_effect = fetch
+        gateway.threads = threads
+        return gateway
+
+    @mock.patch("finances.payments.reconciliation.WompiGateway._circuit_allows", return_value=True)
+    def test_fetches_concurrently_and_applies_transitions(self, _allows):
+        gateway = self._gateway(delay=0.1)
+        reconciler = PaymentReconciler(task="test", max_workers=8, gateway=gateway)
+
+        started = time.monotonic()
+        summary = reconciler.reconcile(Payment.objects.all())
+        elapsed = time.monotonic() - started
+
+        # En serie serían >= 1.6s
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(summary["checked"], 16)
+        self.assertEqual(summary["updated"], 16)
+        self.assertGreater(summary["throughput"], 0)
+        self.assertNotIn(threading.get_ident(), gateway.threads)
+        self.assertEqual(
+            Payment.objects.filter(status=Payment.PaymentStatus.DECLINED).count(), 16
+        )
+
+    @mock.patch("finances.payments.reconciliation.WompiGateway._circuit_allows", return_value=False)
+    def test_open_circuit_skips_without_touching_payments(self, _allows):
+        gateway = self._gateway()
+        summary = PaymentReconciler(task="test", gateway=gateway).reconcile(Payment.objects.all())
+
+        self.assertEqual(summary["skipped"], 16)
+        self.assertEqual(summary["checked"], 0)
+        gateway.fetch_transaction.assert_not_called()
+        self.assertEqual(
+            Payment.objects.filter(status=Payment.PaymentStatus.PENDING).count(), 16
+        )
+
+    @mock.patch("finances.payments.reconciliation.WompiGateway._circuit_allows")
+    def test_circuit_opening_mid_run_stops_remaining_fetches(self, allows):
+        calls = {"n": 0}
+
+        def circuit_allows():
+            calls["n"] += 1
+            return calls["n"] <= 4
+
+        allows.side_effect = circuit_allows
+        gateway = self._gateway()
+        summary = PaymentReconciler(task="test", max_workers=1, gateway=gateway).reconcile(
+            Payment.objects.all()
+        )
+
+        self.assertEqual(summary["updated"], 4)
+        self.assertEqual(summary["skipped"], 12)
+        self.assertEqual(gateway.fetch_transaction.call_count, 4)
+
+    @mock.patch("finances.payments.reconciliation.WompiGateway._circuit_allows", return_value=True)
+    def test_failed_fetch_skips_payment(self, _allows):
+        gateway = mock.Mock()
+        gateway.fetch_transaction.return_value = None
+        payment = self.payments[0]
+
+        summary = PaymentReconciler(task="test", gateway=gateway).reconcile([payment])
+
+        self.assertEqual(summary["skipped"], 1)
+        self.assertEqual(summary["timeout"], 0)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, Payment.PaymentStatus.PENDING)
+
+    @mock.patch("finances.payments.reconciliation.WompiGateway._circuit_allows", return_value=True)
+    def test_response_without_status_marks_timeout(self, _allows):
+        gateway = mock.Mock()
+        gateway.fetch_transaction.return_value = {"data": {"id": "TRX-0"}}
+        payment = self.payments[0]
+
+        summary = PaymentReconciler(task="test", gateway=gateway).reconcile([payment])
+
+        self.assertEqual(summary["timeout"], 1)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, Payment.PaymentStatus.TIMEOUT)
+
+    @mock.patch("finances.payments.reconciliation.WompiGateway._circuit_allows", return_value=True)
+    def test_fetch_timeout_and_attempts_fit_remaining_budget(self, _allows):
+        gateway = self._gateway()
+        payment = self.payments[0]
+
+        PaymentReconciler(task="test", time_budget=10, gateway=gateway).reconcile([payment])
+
+        kwargs = gateway.fetch_transaction.call_args.kwargs
+        connect, read = kwargs["timeout"]
+        self.assertEqual(kwargs["attempts"], 1)
+        self.assertLessEqual(connect + read, 10)
+
+    def test_fetch_budget_keeps_retries_when_budget_allows(self):
+        timeout, attempts = PaymentReconciler._fetch_budget(80)
+        self.assertEqual(attempts, 3)
+        self.assertLessEqual(attempts * sum(timeout) + 1.5, 80)
+
+        timeout, attempts = PaymentReconciler._fetch_budget(40)
+        self.assertEqual(attempts, 2)
+        self.assertLessEqual(attempts * sum(timeout) + 0.5, 40)
+
+    @mock.patch("finances.payments.reconciliation.WompiGateway._circuit_allows", return_value=True)
+    def test_exhausted_budget_skips_without_fetching(self, _allows):
+        gateway = self._gateway()
+
+        summary = PaymentReconciler(
+            task="test", time_budget=MIN_FETCH_SECONDS / 2, gateway=gateway
+        ).reconcile(Payment.objects.all())
+
+        self.assertEqual(summary["skipped"], 16)
+        gateway.fetch_transaction.assert_not_called()
+
+    def test_non_pending_payments_are_not_fetched(self):
+        Payment.objects.update(status=Payment.PaymentStatus.DECLINED)
+        gateway = self._gateway()
+
+        summary = PaymentReconciler(task="test", gateway=gateway).reconcile(Payment.objects.all())
+
+        self.assertEqual(summary["checked"], 0)
+        gateway.fetch_transaction.assert_not_called()
@@ -0,0 +1,120 @@
+import time
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from finances.gateway import WompiPaymentClient, WompiReferenceData
+from finances.gateway.reference_data import ACCEPTANCE_TOKEN, DATASETS, PSE_INSTITUTIONS
+from finances.tasks import refresh_wompi_reference_data
+
+
+def _merchant_response(token):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {"data": {"presigned_acceptance": {"acceptance_token": token}}}
+    return response
+
+
+@override_settings(
+    WOMPI_BASE_URL="https://sandbox.wompi.co/v1",
+    WOMPI_PUBLIC_KEY="pub_test_abc",
+    WOMPI_ACCEPTANCE_TOKEN="",
+)
+class WompiReferenceDataTests(SimpleTestCase):
+    def _age(self, dataset, seconds):
+        key = DATASETS[dataset]["cache_key"]
+        envelope = cache.get(key)
+        envelope["fetched_at"] = time.time() - seconds
+        cache.set(key, envelope)
+
+    @mock.patch("requests.Session.request")
+    def test_cold_miss_fetches_once_then_serves_from_cache(self, mock_request):
+        mock_request.return_value = _merchant_response("tok_1")
+
+        for _ in range(5):
+            self.assertEqual(WompiPaymentClient.resolve_acceptance_token(), "tok_1")
+
+        self.assertEqual(mock_request.call_count, 1)
+
+    @mock.patch("finances.tasks.refresh_wompi_reference_data.delay")
+    @mock.patch("requests.Session.request")
+    def test_stale_value_is_served_and_refresh_enqueued_once(self, mock_request, mock_delay):
+        mock_request.return_value = _merchant_response("tok_1")
+        WompiPaymentClient.resolve_acceptance_token()
+        self._age(ACCEPTANCE_TOKEN, DATASETS[ACCEPTANCE_TOKEN]["refresh_after"] + 1)
+
+        self.assertEqual(WompiPaymentClient.resolve_acceptance_token(), "tok_1")
+        self.assertEqual(WompiPaymentClient.resolve_acceptance_token(), "tok_1")
+
+        self.assertEqual(mock_request.call_count, 1)
+        mock_delay.assert_called_once_with(ACCEPTANCE_TOKEN)
+
+    @mock.patch("requests.Session.request")
+    def test_refresh_failure_keeps_last_good_value(self, mock_request):
+        mock_request.return_value = _merchant_response("tok_1")
+        WompiPaymentClient.resolve_acceptance_token()
+
+        mock_request.side_effect = requests.ConnectionError("Wompi caído")
+        result = refresh_wompi_reference_data()
+
+        self.assertFalse(result[ACCEPTANCE_TOKEN])
+        self.assertEqual(WompiPaymentClient.resolve_acceptance_token(), "tok_1")
+
+    @mock.patch("requests.Session.request")
+    def test_value_past_max_stale_is_refetched_inline(self, mock_request):
+        mock_request.return_value = _merchant_response("tok_1")
+        WompiPaymentClient.resolve_acceptance_token()
+        self._age(ACCEPTANCE_TOKEN, DATASETS[ACCEPTANCE_TOKEN]["max_stale"] + 1)
+
+        mock_request.return_value = _merchant_response("tok_2")
+        self.assertEqual(WompiPaymentClient.resolve_acceptance_token(), "tok_2")
+        self.assertEqual(mock_request.call_count, 2)
+
+    @mock.patch("requests.Session.request")
+    def test_expired_token_is_not_served_when_wompi_fails(self, mock_request):
+        mock_request.return_value = _merchant_response("tok_1")
+        WompiPaymentClient.resolve_acceptance_token()
+        self._age(ACCEPTANCE_TOKEN, DATASETS[ACCEPTANCE_TOKEN]["max_stale"] + 1)
+
+        mock_request.side_effect = requests.ConnectionError("Wompi caído")
+        self.assertIsNone(WompiPaymentClient.resolve_acceptance_token())
+
+    @mock.patch("requests.Session.request")
+    def test_refresh_replaces_value(self, mock_request):
+        mock_request.return_value = _merchant_response("tok_1")
+        WompiPaymentClient.resolve_acceptance_token()
+
+        mock_request.return_value = _merchant_response("tok_2")
+        self.assertTrue(refresh_wompi_reference_data(ACCEPTANCE_TOKEN)[ACCEPTANCE_TOKEN])
+
+        self.assertEqual(WompiPaymentClient.resolve_acceptance_token(), "tok_2")
+
+    @mock.patch("requests.Session.request", side_effect=requests.ConnectionError("Wompi caído"))
+    def test_cold_miss_failure_returns_none_for_token(self, _request):
+        self.assertIsNone(WompiPaymentClient.resolve_acceptance_token())
+
+    def test_legacy_string_value_is_treated_as_miss(self):
+        cache.set(DATASETS[ACCEPTANCE_TOKEN]["cache_key"], "tok_legacy")
+        with mock.patch("requests.Session.request", return_value=_merchant_response("tok_new")):
+            self.assertEqual(WompiPaymentClient.resolve_acceptance_token(), "tok_new")
+
+    @mock.patch("requests.Session.request")
+    def test_pse_institutions_are_cached(self, mock_request):
+        banks = [{"financial_institution_code": "1", "financial_institution_name": "Banco"}]
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"data": banks}
+
+        self.assertEqual(WompiReferenceData.pse_institutions(), banks)
+        self.assertEqual(WompiReferenceData.pse_institutions(), banks)
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(cache.get(DATASETS[PSE_INSTITUTIONS]["cache_key"])["value"], banks)
+
+    @mock.patch("finances.gateway.WompiPaymentClient.get_pse_financial_institutions")
+    def test_error_responses_are_not_cached(self, mock_get):
+        mock_get.return_value = ({"error": "service_unavailable"}, 503)
+
+        WompiReferenceData.pse_institutions()
+
+        self.assertIsNone(cache.get(DATASETS[PSE_INSTITUTIONS]["cache_key"]))
@@ -26,7 +26,7 @@ class WompiDisbursementClientTest(TestCase):
         self.client.payout_endpoint = "https://test.wompi.co/transfers"
         cache.clear()
 
-    @mock.patch("requests.request")
+    @mock.patch("requests.Session.request")
     def test_get_available_balance_success(self, mock_request):
         mock_request.return_value.status_code = 200
         mock_request.return_value.json.return_value = {
@@ -35,13 +35,13 @@ class WompiDisbursementClientTest(TestCase):
         balance = self.client.get_available_balance()
         self.assertEqual(balance, Decimal("1000.00"))
 
-    @mock.patch("requests.request")
+    @mock.patch("requests.Session.request")
     def test_get_available_balance_error(self, mock_request):
         mock_request.side_effect = requests.RequestException("Error")
         with self.assertRaises(WompiPayoutError):
             self.client.get_available_balance()
 
-    @mock.patch("requests.request")
+    @mock.patch("requests.Session.request")
     def test_create_payout_success(self, mock_request):
         mock_request.return_value.status_code = 200
         mock_request.return_value.json.return_value = {
@@ -50,7 +50,7 @@ class WompiDisbursementClientTest(TestCase):
         transfer_id = self.client.create_payout(Decimal("100.00"))
         self.assertEqual(transfer_id, "trf_123")
 
-    @mock.patch("requests.request")
+    @mock.patch("requests.Session.request")
     def test_create_payout_error(self, mock_request):
         mock_request.side_effect = requests.RequestException("Error")
         with self.assertRaises(WompiPayoutError):
@@ -8,63 +8,73 @@ from finances.tasks import (
     check_pending_payments,
     reconcile_recent_payments,
     process_recurring_subscriptions,
+    charge_vip_renewal,
     downgrade_expired_vips,
     cleanup_old_webhook_events,
 )
-from finances.models import Payment, WebhookEvent
+from finances.models import Payment, VipRenewalRun, WebhookEvent
 from users.models import CustomUser
 from core.models import GlobalSettings
 
+
+def _charge_inline(args=None, kwargs=None, **options):
+    """Ejecuta en línea las subtareas que encola el planificador VIP."""
+    return charge_vip_renewal.apply(args=args, kwargs=kwargs)
+
+
 class FinancesTasksTest(TestCase):
     def setUp(self):
         self.user = baker.make(CustomUser, email="test@example.com")
 
-    @mock.patch("finances.tasks.PaymentService.poll_pending_payment")
-    def test_check_pending_payments(self, mock_poll):
+    @mock.patch("finances.payments.reconciliation.apply_gateway_status")
+    @mock.patch("finances.payments.reconciliation.WompiGateway.fetch_transaction")
+    def test_check_pending_payments(self, mock_fetch, mock_apply):
         # Old pending payment
         old_payment = baker.make(
             Payment, 
             status=Payment.PaymentStatus.PENDING, 
+            transaction_id="TRX-OLD",
             created_at=timezone.now() - timedelta(minutes=15)
         )
         # Recent pending payment (should be ignored)
         baker.make(
             Payment, 
             status=Payment.PaymentStatus.PENDING, 
+            transaction_id="TRX-NEW",
             created_at=timezone.now() - timedelta(minutes=5)
         )
         
-        mock_poll.return_value = True
+        mock_fetch.return_value = {"data": {"status": "APPROVED"}}
+        mock_apply.return_value = Payment.PaymentStatus.APPROVED
         
         result = check_pending_payments()
         
         self.assertIn("Pagos pendientes revisados: 1", result)
-        mock_poll.assert_called_once_with(old_payment)
+        self.assertIn("actualizados: 1", result)
+        mock_fetch.assert_called_once()
+        self.assertEqual(mock_fetch.call_args.args, ("TRX-OLD",))
+        self.assertEqual(mock_apply.call_args.args[0], old_payment)
 
-    @mock.patch("finances.tasks.PaymentService.poll_pending_payment")
-    def test_reconcile_recent_payments(self, mock_poll):
+    @mock.patch("finances.payments.reconciliation.WompiGateway.fetch_transaction")
+    def test_reconcile_recent_payments(self, mock_fetch):
         payment = baker.make(
             Payment,
             status=Payment.PaymentStatus.PENDING,
             transaction_id="TRX123",
             created_at=timezone.now() - timedelta(hours=1)
         )
-        mock_poll.return_value = True
-        
-        # Simulate status change side effect
-        def side_effect(p):
-            p.status = Payment.PaymentStatus.APPROVED
-            p.save()
-            return True
-        mock_poll.side_effect = side_effect
+        mock_fetch.return_value = {"data": {"id": "TRX123", "status": "DECLINED"}}
         
         result = reconcile_recent_payments()
         
         self.assertIn("actualizados=1", result)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, Payment.PaymentStatus.DECLINED)
 
+    @mock.patch("finances.tasks.charge_vip_renewal.apply_async", side_effect=_charge_inline)
     @mock.patch("finances.tasks.PaymentService.charge_recurrence_token")
     @mock.patch("finances.tasks.PaymentService.apply_gateway_status")
-    def test_process_recurring_subscriptions_success(self, mock_apply, mock_charge):
+    def test_process_recurring_subscriptions_success(self, mock_apply, mock_charge, _apply_async):
         settings = GlobalSettings.load()
         settings.vip_monthly_price = Decimal("100.00")
         settings.save()
@@ -82,13 +92,17 @@ class FinancesTasksTest(TestCase):
         
         result = process_recurring_subscriptions()
         
-        self.assertIn("Renovaciones intentadas: 1", result)
+        self.assertIn("Renovaciones programadas: 1", result)
+        run = VipRenewalRun.objects.get()
+        self.assertEqual(run.approved, 1)
+        self.assertEqual(run.status, VipRenewalRun.Status.COMPLETED)
         user.refresh_from_db()
         self.assertEqual(user.vip_failed_payments, 0)
 
+    @mock.patch("finances.tasks.charge_vip_renewal.apply_async", side_effect=_charge_inline)
     @mock.patch("finances.tasks.PaymentService.charge_recurrence_token")
     @mock.patch("finances.tasks.PaymentService.apply_gateway_status")
-    def test_process_recurring_subscriptions_failure(self, mock_apply, mock_charge):
+    def test_process_recurring_subscriptions_failure(self, mock_apply, mock_charge, _apply_async):
         settings = GlobalSettings.load()
         settings.vip_monthly_price = Decimal("100.00")
         settings.save()
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+from core.models import GlobalSettings
+from finances.models import Payment, VipRenewalRun
+from finances.payments import VipRenewalService
+from finances.tasks import process_recurring_subscriptions
+from users.models import CustomUser
+
+
+def _vip(**kwargs):
+    defaults = {
+        "role": CustomUser.Role.VIP,
+        "vip_auto_renew": True,
+        "vip_expires_at": timezone.now().date() + timedelta(days=1),
+        "vip_payment_token": "123",
+    }
+    defaults.update(kwargs)
+    return baker.make(CustomUser, **defaults)
+
+
+class VipRenewalPlannerTests(TestCase):
+    def setUp(self):
+        settings_obj = GlobalSettings.load()
+        settings_obj.vip_monthly_price = Decimal("100.00")
+        settings_obj.save()
+
+    @override_settings(VIP_RENEWAL_BATCH_SIZE=2, VIP_RENEWAL_BATCH_INTERVAL=10)
+    @mock.patch("finances.tasks.charge_vip_renewal.apply_async")
+    def test_planner_enqueues_staggered_batches(self, mock_apply):
+        users = sorted((_vip() for _ in range(5)), key=lambda user: user.id)
+        _vip(vip_expires_at=timezone.now().date() + timedelta(days=30))
+        _vip(vip_auto_renew=False)
+
+        process_recurring_subscriptions()
+
+        run = VipRenewalRun.objects.get()
+        self.assertEqual(run.planned, 5)
+        self.assertEqual(run.status, VipRenewalRun.Status.RUNNING)
+        calls = [call.kwargs for call in mock_apply.call_args_list]
+        self.assertEqual([c["args"][0] for c in calls], [str(user.id) for user in users])
+        self.assertEqual([c["countdown"] for c in calls], [0, 0, 10, 10, 20])
+        self.assertTrue(all(c["args"][1] == str(run.id) for c in calls))
+
+    @mock.patch("finances.tasks.charge_vip_renewal.apply_async")
+    def test_run_without_due_users_completes_immediately(self, mock_apply):
+        process_recurring_subscriptions()
+
+        run = VipRenewalRun.objects.get()
+        self.assertEqual(run.status, VipRenewalRun.Status.COMPLETED)
+        mock_apply.assert_not_called()
+
+
+class VipRenewalChargeTests(TestCase):
+    def setUp(self):
+        settings_obj = GlobalSettings.load()
+        settings_obj.vip_monthly_price = Decimal("100.00")
+        settings_obj.save()
+        self.user = _vip()
+
+    @mock.patch("finances.payments.PaymentService.charge_recurrence_token")
+    def test_repeated_charge_uses_same_reference_and_charges_once(self, mock_charge):
+        mock_charge.return_value = (Payment.PaymentStatus.PENDING, {"status": "PENDING"}, "REF")
+
+        self.assertEqual(VipRenewalService.renew(self.user.id), "pending")
+        self.assertEqual(VipRenewalService.renew(self.user.id), "skipped")
+
+        mock_charge.assert_called_once()
+        reference = mock_charge.call_args.kwargs["reference"]
+        self.assertEqual(reference, VipRenewalService.reference_for(self.user, timezone.now().date()))
+        payment = Payment.objects.get(user=self.user)
+        self.assertEqual(payment.transaction_id, reference)
+
+    @mock.patch("finances.payments.PaymentService.apply_gateway_status")
+    @mock.patch("finances.payments.PaymentService.charge_recurrence_token")
+    def test_outcomes_are_aggregated_and_run_completes(self, mock_charge, mock_apply):
+        declined_user = _vip(vip_failed_payments=1)
+        mock_charge.return_value = (Payment.PaymentStatus.DECLINED, {}, "REF")
+        mock_apply.return_value = Payment.PaymentStatus.DECLINED
+        run = VipRenewalRun.objects.create(
+            run_date=timezone.now().date(), planned=2, status=VipRenewalRun.Status.RUNNING
+        )
+
+        VipRenewalService.renew(declined_user.id, run_id=run.id)
+        run.refresh_from_db()
+        self.assertEqual(run.status, VipRenewalRun.Status.RUNNING)
+
+        mock_apply.return_value = Payment.PaymentStatus.APPROVED
+        VipRenewalService.renew(self.user.id, run_id=run.id)
+
+        run.refresh_from_db()
+        self.assertEqual((run.approved, run.declined), (1, 1))
+        self.assertEqual(run.status, VipRenewalRun.Status.COMPLETED)
+        self.assertIsNotNone(run.finished_at)
+        declined_user.refresh_from_db()
+        self.assertEqual(declined_user.vip_failed_payments, 2)
+
+    @mock.patch("finances.payments.PaymentService.charge_recurrence_token")
+    def test_user_no_longer_due_is_skipped(self, mock_charge):
+        CustomUser.objects.filter(pk=self.user.pk).update(vip_auto_renew=False)
+
+        self.assertEqual(VipRenewalService.renew(self.user.id), "skipped")
+        mock_charge.assert_not_called()
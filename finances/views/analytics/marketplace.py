@@ -20,6 +20,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from dateutil.relativedelta import relativedelta
 
+from core.infra.db_routing import using_replica
+from core.utils import date_range_filter
 from users.permissions import IsStaffOrAdmin
 from finances.models import Payment
 
@@ -46,6 +48,7 @@ class MarketplaceRevenueView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
 
+    @using_replica()
     def get(self, request):
         # Parsear mes
         month_param = request.query_params.get('month')
@@ -68,8 +71,7 @@ class MarketplaceRevenueView(APIView):
         payments_stats = Payment.objects.filter(
             payment_type=Payment.PaymentType.ORDER,
             status__in=[Payment.PaymentStatus.APPROVED, Payment.PaymentStatus.PAID_WITH_CREDIT],
-            created_at__date__gte=month_start,
-            created_at__date__lte=month_end
+            **date_range_filter("created_at", month_start, month_end)
         ).aggregate(
             total=Coalesce(Sum('amount'), Decimal('0')),
             count=Count('order_id', distinct=True)
@@ -119,6 +121,7 @@ class MarketplaceProductsRevenueView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
 
+    @using_replica()
     def get(self, request):
         from marketplace.models import OrderItem, Order
 
@@ -153,8 +156,7 @@ class MarketplaceProductsRevenueView(APIView):
                 Order.OrderStatus.SHIPPED,
                 Order.OrderStatus.DELIVERED
             ],
-            order__created_at__date__gte=month_start,
-            order__created_at__date__lte=month_end
+            **date_range_filter("order__created_at", month_start, month_end)
         ).values(
             'product_variant__product_id',
             'product_variant__product__name',
@@ -211,6 +213,7 @@ class MarketplaceOrdersStatsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
 
+    @using_replica()
     def get(self, request):
         from marketplace.models import Order
 
@@ -233,8 +236,7 @@ class MarketplaceOrdersStatsView(APIView):
 
         # Base queryset
         base_qs = Order.objects.filter(
-            created_at__date__gte=month_start,
-            created_at__date__lte=month_end
+            **date_range_filter("created_at", month_start, month_end)
         )
 
         # Órdenes por estado
@@ -253,8 +255,7 @@ class MarketplaceOrdersStatsView(APIView):
         credits_used = Payment.objects.filter(
             payment_type=Payment.PaymentType.ORDER,
             status=Payment.PaymentStatus.PAID_WITH_CREDIT,
-            created_at__date__gte=month_start,
-            created_at__date__lte=month_end
+            **date_range_filter("created_at", month_start, month_end)
         ).aggregate(
             total=Coalesce(Sum('amount'), Decimal('0'))
         )
@@ -288,6 +289,7 @@ class MarketplaceDailyRevenueView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
 
+    @using_replica()
     def get(self, request):
         # Parsear mes
         month_param = request.query_params.get('month')
@@ -310,8 +312,7 @@ class MarketplaceDailyRevenueView(APIView):
         daily_stats = Payment.objects.filter(
             payment_type=Payment.PaymentType.ORDER,
             status__in=[Payment.PaymentStatus.APPROVED, Payment.PaymentStatus.PAID_WITH_CREDIT],
-            created_at__date__gte=month_start,
-            created_at__date__lte=month_end
+            **date_range_filter("created_at", month_start, month_end)
         ).values('created_at__date').annotate(
             revenue=Coalesce(Sum('amount'), Decimal('0')),
             orders=Count('order_id', distinct=True)
@@ -7,7 +7,7 @@ Endpoints para estadísticas de servicios/citas:
 - Distribución de estados para gráficas
 """
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 from django.db.models import Sum, Count, Q
@@ -19,6 +19,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from dateutil.relativedelta import relativedelta
 
+from core.infra.db_routing import using_replica
+from core.utils import date_range_filter, day_start
 from users.permissions import IsStaffOrAdmin
 from spa.models import Appointment
 from finances.models import Payment
@@ -48,6 +50,7 @@ class ServicesRevenueView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
 
+    @using_replica()
     def get(self, request):
         # Parsear mes
         month_param = request.query_params.get('month')
@@ -70,8 +73,7 @@ class ServicesRevenueView(APIView):
         payments_qs = Payment.objects.filter(
             payment_type__in=[Payment.PaymentType.ADVANCE, Payment.PaymentType.FINAL],
             status__in=[Payment.PaymentStatus.APPROVED, Payment.PaymentStatus.PAID_WITH_CREDIT],
-            created_at__date__gte=month_start,
-            created_at__date__lte=month_end
+            **date_range_filter("created_at", month_start, month_end)
         )
 
         # Aggregations
@@ -123,6 +125,7 @@ class ServicesCompletedAppointmentsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
 
+    @using_replica()
     def get(self, request):
         # Parsear mes
         month_param = request.query_params.get('month')
@@ -144,8 +147,7 @@ class ServicesCompletedAppointmentsView(APIView):
         # Contar citas completadas en el mes (basado en updated_at)
         completed = Appointment.objects.filter(
             status=Appointment.AppointmentStatus.COMPLETED,
-            updated_at__date__gte=month_start,
-            updated_at__date__lte=month_end
+            **date_range_filter("updated_at", month_start, month_end)
         ).aggregate(
             count=Count('id'),
             revenue=Coalesce(Sum('price_at_purchase'), Decimal('0'))
@@ -202,6 +204,7 @@ class ServicesStatusDistributionView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
 
+    @using_replica()
     def get(self, request):
         # Parsear mes
         month_param = request.query_params.get('month')
@@ -223,8 +226,7 @@ class ServicesStatusDistributionView(APIView):
 
         # Base queryset: citas del mes
         base_qs = Appointment.objects.filter(
-            start_time__date__gte=month_start,
-            start_time__date__lte=month_end
+            **date_range_filter("start_time", month_start, month_end)
         )
 
         # 1. Servicios completados y pagados
@@ -241,7 +243,7 @@ class ServicesStatusDistributionView(APIView):
                 Appointment.AppointmentStatus.CONFIRMED,
                 Appointment.AppointmentStatus.FULLY_PAID
             ],
-            start_time__date__gt=today
+            start_time__gte=day_start(today + timedelta(days=1))
         ).aggregate(
             count=Count('id'),
             revenue=Coalesce(Sum('price_at_purchase'), Decimal('0'))
@@ -254,7 +256,7 @@ class ServicesStatusDistributionView(APIView):
                 Appointment.AppointmentStatus.RESCHEDULED,
                 Appointment.AppointmentStatus.FULLY_PAID
             ],
-            start_time__date__lt=today
+            start_time__lt=day_start(today)
         ).aggregate(
             count=Count('id'),
             revenue=Coalesce(Sum('price_at_purchase'), Decimal('0'))
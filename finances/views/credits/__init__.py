@@ -21,7 +21,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from users.permissions import IsAdminUser, IsVerified
 from core.models import AuditLog
-from finances.models import ClientCredit, Payment
+from finances.models import ClientCredit, ClientCreditSummary, Payment
 from finances.serializers import ClientCreditAdminSerializer, ClientCreditSerializer, PaymentSerializer
 
 
@@ -132,15 +132,7 @@ class ClientCreditBalanceView(APIView):
     permission_classes = [IsAuthenticated, IsVerified]
 
     def get(self, request):
-        active_credits = ClientCredit.objects.filter(
-            user=request.user,
-            status__in=[
-                ClientCredit.CreditStatus.AVAILABLE,
-                ClientCredit.CreditStatus.PARTIALLY_USED
-            ],
-            expires_at__gte=timezone.now().date()
-        )
-        total_balance = sum(c.remaining_amount for c in active_credits)
+        total_balance = ClientCreditSummary.for_user(request.user.id).available_amount
 
         return Response({
             'balance': total_balance,
@@ -191,16 +183,7 @@ class CreditPaymentPreviewView(APIView):
             )
 
         # Calcular saldo disponible del usuario
-        active_credits = ClientCredit.objects.filter(
-            user=request.user,
-            status__in=[
-                ClientCredit.CreditStatus.AVAILABLE,
-                ClientCredit.CreditStatus.PARTIALLY_USED
-            ],
-            expires_at__gte=timezone.now().date()
-        ).order_by('created_at')
-
-        total_available = sum(c.remaining_amount for c in active_credits)
+        total_available = ClientCreditSummary.for_user(request.user.id).available_amount
 
         # Calcular cuánto se usaría
         credits_to_use = min(amount_decimal, total_available)
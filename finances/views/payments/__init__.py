@@ -24,7 +24,7 @@ from core.models import GlobalSettings
 from spa.models import Appointment
 from spa.serializers import PackagePurchaseCreateSerializer
 from finances.models import Payment
-from finances.gateway import WompiPaymentClient, build_integrity_signature
+from finances.gateway import WompiReferenceData, build_integrity_signature
 from finances.payments import PaymentService
 
 
@@ -51,9 +51,9 @@ class PSEFinancialInstitutionsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        client = WompiPaymentClient()
         try:
-            result = client.get_pse_financial_institutions()
+            # Servido desde caché; solo consulta Wompi si aún no hay lista guardada
+            result = WompiReferenceData.pse_institutions()
 
             # La función de gateway devuelve actualmente solo la lista; soporta tuplas por si cambia.
             if isinstance(result, tuple) and len(result) == 2:
@@ -3,6 +3,7 @@ Módulo de servicios de marketplace.
 
 Exporta todos los servicios para mantener compatibilidad con imports existentes.
 """
+from .cart_cache_service import CartCacheService
 from .inventory_service import InventoryService
 from .notification_service import MarketplaceNotificationService
 from .order_creation_service import OrderCreationService
@@ -10,6 +11,7 @@ from .order_service import OrderService
 from .return_service import ReturnService
 
 __all__ = [
+    'CartCacheService',
     'MarketplaceNotificationService',
     'InventoryService',
     'OrderCreationService',
@@ -0,0 +1,115 @@
+"""
+Caché write-through del carrito serializado por usuario.
+
+``my_cart`` lee el documento sin tocar la base de datos; las escrituras
+(add/update/remove) lo reemplazan o editan en sitio. La clave incluye una
+versión de catálogo que se incrementa al cambiar productos o variantes
+(precio, stock, imágenes), y el estado VIP del usuario, que define el precio.
+"""
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class CartCacheService:
+    KEY_PREFIX = "marketplace:cart:v1"
+    CATALOG_VERSION_KEY = "marketplace:catalog:version"
+    TIMEOUT = getattr(settings, "CART_CACHE_TIMEOUT", 60 * 60)
+    # Las extensiones del TTL del carrito se escriben como máximo una vez por intervalo
+    EXPIRY_REFRESH_INTERVAL = timedelta(hours=1)
+
+    @classmethod
+    def _catalog_version(cls):
+        version = cache.get(cls.CATALOG_VERSION_KEY)
+        if version is None:
+            cache.add(cls.CATALOG_VERSION_KEY, 1, timeout=None)
+            version = cache.get(cls.CATALOG_VERSION_KEY) or 1
+        return version
+
+    @classmethod
+    def _key(cls, user):
+        return f"{cls.KEY_PREFIX}:{user.pk}:{int(bool(getattr(user, 'is_vip', False)))}:{cls._catalog_version()}"
+
+    @classmethod
+    def get(cls, user):
+        """Devuelve la representación cacheada del carrito activo, o None."""
+        try:
+            document = cache.get(cls._key(user))
+        except Exception:
+            return None
+        if not document:
+            return None
+        expires_at = parse_datetime(document["expires_at"]) if document.get("expires_at") else None
+        if expires_at and expires_at < timezone.now():
+            return None
+        return document["cart"]
+
+    @classmethod
+    def store(cls, user, cart, data):
+        """Guarda (write-through) la representación serializada del carrito."""
+        document = {
+            "cart_id": str(cart.pk),
+            "expires_at": cart.expires_at.isoformat() if cart.expires_at else None,
+            "cart": data,
+        }
+        try:
+            cache.set(cls._key(user), document, timeout=cls.TIMEOUT)
+        except Exception as exc:
+            logger.warning("No se pudo cachear el carrito de %s: %s", user.pk, exc)
+
+    @classmethod
+    def remove_item(cls, user, cart_item_id):
+        """Quita un ítem del documento cacheado y recalcula el total en sitio."""
+        key = cls._key(user)
+        try:
+            document = cache.get(key)
+            if not document:
+                return
+            cart_data = document["cart"]
+            cart_data["items"] = [
+                item for item in cart_data["items"] if str(item["id"]) != str(cart_item_id)
+            ]
+            cart_data["total"] = sum((Decimal(str(item["subtotal"])) for item in cart_data["items"]), Decimal("0"))
+            cache.set(key, document, timeout=cls.TIMEOUT)
+        except Exception as exc:
+            logger.warning("No se pudo actualizar el carrito cacheado de %s: %s", user.pk, exc)
+            cls.invalidate(user)
+
+    @classmethod
+    def item_count(cls, user):
+        data = cls.get(user)
+        return None if data is None else len(data["items"])
+
+    @classmethod
+    def invalidate(cls, user):
+        try:
+            cache.delete_many([
+                f"{cls.KEY_PREFIX}:{user.pk}:{vip_flag}:{cls._catalog_version()}" for vip_flag in (0, 1)
+            ])
+        except Exception:
+            pass
+
+    @classmethod
+    def bump_catalog_version(cls):
+        """Invalida todos los carritos cacheados (cambio de precio, stock o imágenes)."""
+        try:
+            cache.incr(cls.CATALOG_VERSION_KEY)
+        except ValueError:
+            cache.add(cls.CATALOG_VERSION_KEY, 2, timeout=None)
+        except Exception:
+            pass
+
+    @classmethod
+    def needs_expiry_refresh(cls, cart, ttl):
+        """True si el nuevo vencimiento supera al actual por más del intervalo de coalescencia."""
+        new_expiry = timezone.now() + ttl
+        if not cart.expires_at:
+            return True
+        return cart.expires_at < new_expiry - cls.EXPIRY_REFRESH_INTERVAL
@@ -1,13 +1,88 @@
 """
 Servicio de gestión de inventario para Marketplace.
 """
+import logging
+
 from .notification_service import MarketplaceNotificationService
 
+logger = logging.getLogger(__name__)
+
 
 class InventoryService:
+    """
+    Alertas de stock bajo agregadas.
+
+    El checkout solo registra la variante en un set de Redis (una llamada
+    O(1)); la tarea periódica ``send_low_stock_digest`` envía un único
+    resumen por ventana. Una variante ya alertada no se repite hasta que
+    vuelve a estar por encima de su umbral (reabastecida).
+    """
+
+    PENDING_KEY = "marketplace:low_stock:pending"
+    ALERTED_KEY = "marketplace:low_stock:alerted"
+
     @staticmethod
-    def check_low_stock(variant):
-        if variant.stock <= variant.low_stock_threshold:
-            # En un sistema real, usaríamos cache para no spammear alertas
-            # Por ahora, enviamos alerta directa
-            MarketplaceNotificationService.send_low_stock_alert([variant])
+    def _redis():
+        from django_redis import get_redis_connection
+        return get_redis_connection("default")
+
+    @classmethod
+    def check_low_stock(cls, variant):
+        try:
+            if variant.stock <= variant.low_stock_threshold:
+                cls._redis().sadd(cls.PENDING_KEY, str(variant.pk))
+            else:
+                cls._redis().srem(cls.ALERTED_KEY, str(variant.pk))
+        except Exception as exc:
+            logger.warning("No se pudo registrar stock bajo para %s: %s", variant.pk, exc)
+
+    @classmethod
+    def flush_low_stock_alerts(cls):
+        """
+        Envía el resumen de variantes con stock bajo acumuladas desde el último envío.
+
+        Las variantes leídas solo se retiran del set pendiente (y se marcan
+        como alertadas) cuando el resumen se entregó; si el envío falla o no
+        hay administrador configurado se reintentan en la siguiente ejecución.
+        Devuelve la cantidad de variantes incluidas en el resumen enviado.
+        """
+        from ..models import ProductVariant
+
+        redis_conn = cls._redis()
+        pipe = redis_conn.pipeline()
+        pipe.smembers(cls.PENDING_KEY)
+        pipe.smembers(cls.ALERTED_KEY)
+        pending_raw, alerted_raw = pipe.execute()
+        pending = {member.decode() for member in pending_raw}
+        alerted = {member.decode() for member in alerted_raw}
+
+        # Reabastecidas por caminos que no pasan por check_low_stock (admin, devoluciones)
+        if alerted:
+            restocked = [
+                str(pk) for pk, stock, threshold in ProductVariant.objects.filter(pk__in=alerted)
+                .values_list('pk', 'stock', 'low_stock_threshold')
+                if stock > threshold
+            ]
+            if restocked:
+                redis_conn.srem(cls.ALERTED_KEY, *restocked)
+                alerted.difference_update(restocked)
+
+        candidates = pending - alerted
+        variants = [
+            variant for variant in ProductVariant.objects.select_related('product')
+            .filter(pk__in=candidates)
+            .order_by('product__name', 'name')
+            if variant.stock <= variant.low_stock_threshold
+        ] if candidates else []
+
+        if variants and not MarketplaceNotificationService.send_low_stock_alert(variants):
+            return 0
+
+        # SREM solo de lo leído: lo que check_low_stock agregó mientras tanto sigue pendiente
+        pipe = redis_conn.pipeline()
+        if pending:
+            pipe.srem(cls.PENDING_KEY, *pending)
+        if variants:
+            pipe.sadd(cls.ALERTED_KEY, *[str(variant.pk) for variant in variants])
+        pipe.execute()
+        return len(variants)
@@ -56,6 +56,8 @@ class MarketplaceNotificationService:
         """
         Envía alerta de stock bajo a los administradores.
         Usa el sistema centralizado de notificaciones con templates aprobados.
+
+        Devuelve True si la notificación quedó encolada.
         """
         from bot.models import BotConfiguration
         from users.models import CustomUser
@@ -65,7 +67,7 @@ class MarketplaceNotificationService:
 
         if not admin_phone:
             logger.warning("No hay número de admin configurado para alertas de stock")
-            return
+            return False
 
         # Buscar usuario admin con ese teléfono
         admin_user = CustomUser.objects.filter(
@@ -79,7 +81,7 @@ class MarketplaceNotificationService:
 
         if not admin_user:
             logger.warning("No se encontró usuario admin para enviar alerta de stock")
-            return
+            return False
 
         # Formatear lista de productos
         items_list = "\n".join([
@@ -88,7 +90,7 @@ class MarketplaceNotificationService:
         ])
 
         try:
-            NotificationService.send_notification(
+            log = NotificationService.send_notification(
                 user=admin_user,
                 event_code="STOCK_LOW_ALERT",
                 context={
@@ -96,9 +98,14 @@ class MarketplaceNotificationService:
                 },
                 priority="high"
             )
-            logger.info("Alerta de stock bajo enviada: %d productos", len(variants))
         except Exception as e:
             logger.error("Error enviando alerta de stock bajo: %s", e)
+            return False
+        if log is None:
+            logger.warning("La alerta de stock bajo no se pudo encolar")
+            return False
+        logger.info("Alerta de stock bajo enviada: %d productos", len(variants))
+        return True
 
     @classmethod
     def send_credit_issued(cls, order, amount, reason):
@@ -2,22 +2,32 @@
 Servicio para creación de órdenes a partir de carritos de compra.
 """
 import logging
+import time
 import uuid
+from collections import defaultdict
 from datetime import timedelta
 
 from django.db import transaction
-from django.db.models import F
+from django.db.models import Case, F, PositiveIntegerField, Value, When
 from django.utils import timezone
 
 from decimal import Decimal
 
 from django.conf import settings
 
+from core.infra.metrics import get_histogram
 from core.utils.exceptions import BusinessLogicError
 from ..models import InventoryMovement, Order, OrderItem, ProductVariant
+from .cart_cache_service import CartCacheService
 
 logger = logging.getLogger(__name__)
 
+stock_reservation_lock_seconds = get_histogram(
+    "marketplace_stock_reservation_lock_seconds",
+    "Tiempo que create_order mantiene bloqueadas las variantes (lock -> commit)",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
 # Costo de envío a domicilio (configurable via settings)
 SHIPPING_COST = Decimal(getattr(settings, 'SHIPPING_COST', '6500'))
 
@@ -37,60 +47,35 @@ class OrderCreationService:
         Crea una orden de forma atómica. Esto asegura que si algo falla,
         toda la operación se revierte.
         """
-        # 1. Validar que el carrito no esté vacío
-        if not self.cart.items.exists():
+        # 1. Validar que el carrito no esté vacío (una sola lectura de ítems)
+        cart_items = list(self.cart.items.select_related('variant__product'))
+        if not cart_items:
             raise BusinessLogicError(detail="No se puede crear una orden con un carrito vacío.")
 
-        # 2. Crear la orden inicial
+        # 2. Crear la orden inicial con la fecha estimada de entrega
+        max_prep_days = max(
+            (item.variant.product.preparation_days for item in cart_items),
+            default=1
+        )
+        if self.data.get('delivery_option') == Order.DeliveryOptions.DELIVERY:
+            max_prep_days += 3 # Días promedio de envío
+
         order = Order.objects.create(
             user=self.user,
             delivery_option=self.data.get('delivery_option'),
             delivery_address=self.data.get('delivery_address'),
             associated_appointment=self.data.get('associated_appointment'),
+            estimated_delivery_date=timezone.now().date() + timedelta(days=max_prep_days),
             total_amount=0 # Se calculará a continuación
         )
 
-        # Calcular fecha estimada de entrega
-        max_prep_days = 0
-        if self.cart.items.exists():
-            max_prep_days = max(
-                (item.variant.product.preparation_days for item in self.cart.items.all()),
-                default=1
-            )
-
-        if self.data.get('delivery_option') == Order.DeliveryOptions.DELIVERY:
-            max_prep_days += 3 # Días promedio de envío
-
-        order.estimated_delivery_date = timezone.now().date() + timedelta(days=max_prep_days)
-        order.save(update_fields=['estimated_delivery_date'])
+        # 3. Reservar stock de todas las variantes en lote
+        variants = self._reserve_stock(order, cart_items)
 
         total_amount = 0
         items_to_create = []
-
-        # 3. Iterar sobre los ítems del carrito para crear los ítems de la orden
-        for cart_item in self.cart.items.select_related('variant__product'):
-            # Bloquear variante y reservar stock de forma atómica
-            variant = (
-                ProductVariant.objects.select_for_update()
-                .select_related('product')
-                .get(pk=cart_item.variant_id)
-            )
-
-            if not variant.product.is_active:
-                raise BusinessLogicError(detail=f"El producto '{variant.product.name}' está inactivo.")
-
-            updated = ProductVariant.objects.filter(
-                pk=variant.pk,
-                reserved_stock__lte=F('stock') - cart_item.quantity,
-            ).update(reserved_stock=F('reserved_stock') + cart_item.quantity)
-
-            if updated == 0:
-                raise BusinessLogicError(
-                    detail=f"Stock insuficiente para la variante '{variant}'.",
-                    internal_code="MKT-STOCK",
-                )
-            # Refrescar para movimientos/auditoría
-            variant.refresh_from_db(fields=['reserved_stock', 'stock'])
+        for cart_item in cart_items:
+            variant = variants[cart_item.variant_id]
 
             # Decidir qué precio usar (VIP o regular)
             price_at_purchase = variant.price
@@ -108,19 +93,6 @@ class OrderCreationService:
                 )
             )
 
-            created_by = self.user if getattr(self.user, "is_authenticated", False) else None
-            # Idempotencia: si ya existe movimiento de reserva para esta orden+variante, no duplicar
-            InventoryMovement.objects.get_or_create(
-                variant=variant,
-                reference_order=order,
-                movement_type=InventoryMovement.MovementType.RESERVATION,
-                defaults={
-                    "quantity": cart_item.quantity,
-                    "description": "Reserva temporal de stock",
-                    "created_by": created_by,
-                },
-            )
-
         # 4. Crear todos los OrderItem en una sola consulta y actualizar el total
         OrderItem.objects.bulk_create(items_to_create)
         
@@ -142,6 +114,9 @@ class OrderCreationService:
         # 6. Vaciar el carrito inmediatamente después de crear la orden
         # Esto previene que el carrito se acumule si el usuario crea múltiples órdenes
         deleted_count = self.cart.items.all().delete()[0]
+        # Tras el commit: una lectura concurrente de my_cart volvería a cachear el carrito previo
+        user = self.user
+        transaction.on_commit(lambda: CartCacheService.invalidate(user))
         logger.info(
             "Carrito vaciado después de crear orden: user=%s, order=%s, items_deleted=%d",
             self.user.id, order.id, deleted_count
@@ -152,3 +127,67 @@ class OrderCreationService:
             order.id, self.user.id, order.total_amount, len(items_to_create)
         )
         return order
+
+    def _reserve_stock(self, order, cart_items):
+        """
+        Bloquea y reserva el stock de todas las variantes del carrito.
+
+        Un único ``SELECT ... FOR UPDATE`` ordenado por PK (orden de lock
+        estable entre checkouts concurrentes, sin deadlocks), un único UPDATE
+        con CASE para las reservas y un ``bulk_create`` de movimientos.
+        Devuelve las variantes bloqueadas indexadas por PK.
+        """
+        quantities = defaultdict(int)
+        for cart_item in cart_items:
+            quantities[cart_item.variant_id] += cart_item.quantity
+
+        lock_started = time.monotonic()
+        variants = {
+            variant.pk: variant
+            for variant in ProductVariant.objects.select_for_update(of=('self',))
+            .select_related('product')
+            .filter(pk__in=quantities.keys())
+            .order_by('pk')
+        }
+        transaction.on_commit(
+            lambda: stock_reservation_lock_seconds.observe(time.monotonic() - lock_started)
+        )
+
+        for variant_id, quantity in quantities.items():
+            variant = variants[variant_id]
+            if not variant.product.is_active:
+                raise BusinessLogicError(detail=f"El producto '{variant.product.name}' está inactivo.")
+            if variant.reserved_stock + quantity > variant.stock:
+                raise BusinessLogicError(
+                    detail=f"Stock insuficiente para la variante '{variant}'.",
+                    internal_code="MKT-STOCK",
+                )
+
+        # Las filas ya están bloqueadas: el incremento no puede competir con otra reserva
+        ProductVariant.objects.filter(pk__in=quantities.keys()).update(
+            reserved_stock=F('reserved_stock') + Case(
+                *[When(pk=variant_id, then=Value(quantity)) for variant_id, quantity in quantities.items()],
+                default=Value(0),
+                output_field=PositiveIntegerField(),
+            )
+        )
+
+        created_by = self.user if getattr(self.user, "is_authenticated", False) else None
+        movements = []
+        for variant_id, quantity in quantities.items():
+            variant = variants[variant_id]
+            variant.reserved_stock += quantity
+            movements.append(
+                InventoryMovement(
+                    variant=variant,
+                    reference_order=order,
+                    movement_type=InventoryMovement.MovementType.RESERVATION,
+                    quantity=quantity,
+                    description="Reserva temporal de stock",
+                    created_by=created_by,
+                )
+            )
+        # Idempotencia: si ya existe movimiento de reserva para esta orden+variante, no duplicar
+        InventoryMovement.objects.bulk_create(movements, ignore_conflicts=True)
+        return variants
+
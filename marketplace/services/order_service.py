@@ -8,8 +8,9 @@ from django.db import transaction
 from django.utils import timezone
 
 from core.utils.exceptions import BusinessLogicError
-from ..models import InventoryMovement, Order
+from ..models import InventoryMovement, Order, OrderItem, ProductVariant
 from ..tasks import notify_order_status_change
+from .cart_cache_service import CartCacheService
 from .inventory_service import InventoryService
 from .notification_service import MarketplaceNotificationService
 
@@ -145,6 +146,73 @@ class OrderService:
         order.save(update_fields=['reservation_expires_at', 'updated_at'])
         return order
 
+    @classmethod
+    def release_reservations_bulk(
+        cls,
+        order_ids,
+        movement_type=InventoryMovement.MovementType.RESERVATION_RELEASE,
+        reason="Reserva liberada",
+        changed_by=None,
+    ):
+        """
+        Versión set-based de ``release_reservation`` para un lote de órdenes.
+
+        Debe ejecutarse dentro de una transacción: bloquea las variantes
+        afectadas en orden de PK (evita deadlocks con el checkout), aplica
+        todas las liberaciones con un solo UPDATE y crea los movimientos con
+        ``bulk_create``. Al confirmar la transacción invalida las métricas de
+        marketplace en analytics. Devuelve la cantidad de movimientos generados.
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return 0
+
+        items = list(
+            OrderItem.objects.filter(order_id__in=order_ids)
+            .order_by('variant_id', 'order_id')
+            .values_list('order_id', 'variant_id', 'quantity')
+        )
+        variants = {
+            variant.pk: variant
+            for variant in ProductVariant.objects.select_for_update()
+            .filter(pk__in={variant_id for _, variant_id, _ in items})
+            .order_by('pk')
+            .only('pk', 'reserved_stock')
+        }
+
+        touched = {}
+        movements = []
+        for order_id, variant_id, quantity in items:
+            variant = variants[variant_id]
+            release_qty = min(quantity, variant.reserved_stock)
+            if release_qty <= 0:
+                continue
+            variant.reserved_stock -= release_qty
+            touched[variant_id] = variant
+            movements.append(
+                InventoryMovement(
+                    variant_id=variant_id,
+                    reference_order_id=order_id,
+                    movement_type=movement_type,
+                    quantity=release_qty,
+                    description=reason,
+                    created_by=changed_by,
+                )
+            )
+
+        if touched:
+            ProductVariant.objects.bulk_update(touched.values(), ['reserved_stock'])
+        # ignore_conflicts respeta unique_movement_per_order_variant_type igual que get_or_create
+        InventoryMovement.objects.bulk_create(movements, ignore_conflicts=True)
+        Order.objects.filter(pk__in=order_ids).update(
+            reservation_expires_at=None,
+            updated_at=timezone.now(),
+        )
+        # Los UPDATE masivos no disparan post_save: una invalidación por lote, tras el commit
+        from analytics.signals import invalidate_marketplace_analytics
+        transaction.on_commit(invalidate_marketplace_analytics)
+        return len(movements)
+
     @classmethod
     @transaction.atomic
     def confirm_payment(cls, order, paid_amount=None):
@@ -208,6 +276,8 @@ class OrderService:
             cart = Cart.objects.filter(user=order.user, is_active=True).first()
             if cart:
                 deleted_count = cart.items.all().delete()[0]
+                user = order.user
+                transaction.on_commit(lambda: CartCacheService.invalidate(user))
                 logger.info(
                     "Carrito vaciado después de pago exitoso: user=%s, order=%s, items_deleted=%d",
                     order.user.id, order.id, deleted_count
@@ -2,13 +2,15 @@
 Signals para calcular automáticamente precios VIP en productos.
 
 Este módulo aplica automáticamente un descuento del 15% al precio VIP
-cada vez que se crea o actualiza una variante de producto.
+cada vez que se crea o actualiza una variante de producto, e invalida los
+carritos cacheados cuando cambia el catálogo.
 """
 from decimal import Decimal
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from marketplace.models import ProductVariant
+from marketplace.models import Product, ProductVariant, ProductVariantImage
 
 # Descuento VIP global (15%)
 VIP_DISCOUNT_PERCENTAGE = Decimal('0.15')
@@ -55,3 +57,21 @@ def calculate_vip_price_for_product_variant(sender, instance, **kwargs):
             except ProductVariant.DoesNotExist:
                 # Nueva variante, solo aplicar si vip_price es None
                 pass
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_delete, sender=ProductVariant)
+@receiver(post_save, sender=ProductVariantImage)
+@receiver(post_delete, sender=ProductVariantImage)
+def invalidate_cached_carts(sender, **kwargs):
+    """
+    Los carritos cacheados embeben precio, stock e imágenes de las variantes.
+
+    La versión se incrementa al confirmar la transacción; antes, un carrito
+    armado con los datos previos quedaría guardado bajo la versión nueva.
+    """
+    from marketplace.services.cart_cache_service import CartCacheService
+
+    transaction.on_commit(CartCacheService.bump_catalog_version)
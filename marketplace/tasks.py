@@ -1,12 +1,29 @@
 import logging
+import time
+
 from celery import shared_task
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
+from core.infra.metrics import get_counter, get_histogram
 from notifications.services import NotificationService
 
 logger = logging.getLogger(__name__)
 
+EXPIRATION_BATCH_SIZE = 500
+
+expiration_rows_processed = get_counter(
+    "marketplace_expiration_rows_processed_total",
+    "Filas procesadas por las tareas de expiración de carritos y reservas",
+    ["task"],
+)
+expiration_batch_duration = get_histogram(
+    "marketplace_expiration_batch_duration_seconds",
+    "Duración de cada lote (transacción) de las tareas de expiración",
+    ["task"],
+)
+
 
 @shared_task
 def notify_order_status_change(order_id, new_status):
@@ -51,45 +68,116 @@ def notify_order_status_change(order_id, new_status):
     return "ok"
 
 
+def _expiration_batch_size():
+    return int(getattr(settings, "MARKETPLACE_EXPIRATION_BATCH_SIZE", EXPIRATION_BATCH_SIZE))
+
+
 @shared_task
 def release_expired_order_reservations():
-    from .models import Order
+    """
+    Cancela órdenes PENDING_PAYMENT con reserva vencida, en lotes cortos.
+
+    Cada lote toma sus filas con ``SKIP LOCKED`` (no espera a un checkout o
+    webhook que tenga la orden bloqueada), las cancela con un UPDATE y libera
+    el stock reservado de forma set-based. Cashback y notificaciones se
+    disparan después del commit, fuera de los locks.
+    """
+    from .models import InventoryMovement, Order
     from .services import OrderService
 
+    batch_size = _expiration_batch_size()
     now = timezone.now()
-    with transaction.atomic():
-        expired_orders = (
-            Order.objects.select_for_update()
-            .filter(
-                status=Order.OrderStatus.PENDING_PAYMENT,
-                reservation_expires_at__isnull=False,
-                reservation_expires_at__lt=now,
+    total = 0
+    while True:
+        started = time.monotonic()
+        with transaction.atomic():
+            order_ids = list(
+                Order.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=Order.OrderStatus.PENDING_PAYMENT,
+                    reservation_expires_at__isnull=False,
+                    reservation_expires_at__lt=now,
+                )
+                .order_by('reservation_expires_at', 'pk')
+                .values_list('pk', flat=True)[:batch_size]
             )
-        )
-        count = 0
-        for order in expired_orders:
-            OrderService.transition_to(order, Order.OrderStatus.CANCELLED)
-            count += 1
-    return f"Reservas liberadas: {count}"
+            if not order_ids:
+                break
+            Order.objects.filter(pk__in=order_ids).update(
+                status=Order.OrderStatus.CANCELLED,
+                updated_at=timezone.now(),
+            )
+            # También registra la invalidación de analytics del lote (el UPDATE no dispara post_save)
+            OrderService.release_reservations_bulk(
+                order_ids,
+                movement_type=InventoryMovement.MovementType.RESERVATION_RELEASE,
+                reason="Reserva liberada por cancelación.",
+            )
+
+        total += len(order_ids)
+        _record_expiration_batch("release_expired_order_reservations", len(order_ids), started)
+        logger.info("Reservas expiradas liberadas: lote=%d total=%d", len(order_ids), total)
+
+        for order in Order.objects.select_related('user').filter(pk__in=order_ids):
+            try:
+                from finances.services.cashback import CashbackService
+                CashbackService.revert_cashback(order)
+            except Exception as e:
+                logger.error("Error reverting cashback for order %s: %s", order.id, e)
+            OrderService._dispatch_notifications(order, Order.OrderStatus.CANCELLED)
+
+        if len(order_ids) < batch_size:
+            break
+    return f"Reservas liberadas: {total}"
 
 
 @shared_task
 def cleanup_expired_carts():
     """
     Desactiva y limpia carritos vencidos para liberar el constraint de carrito activo.
+
+    Trabaja en lotes con ``SKIP LOCKED``: un DELETE de ítems y un UPDATE de
+    carritos por lote, cada uno en su propia transacción corta.
     """
-    from .models import Cart
+    from .models import Cart, CartItem
 
+    batch_size = _expiration_batch_size()
     now = timezone.now()
-    count = 0
-    with transaction.atomic():
-        expired = (
-            Cart.objects.select_for_update()
-            .filter(is_active=True, expires_at__isnull=False, expires_at__lt=now)
-        )
-        for cart in expired:
-            cart.items.all().delete()
-            cart.is_active = False
-            cart.save(update_fields=['is_active', 'updated_at'])
-            count += 1
-    return f"Carritos expirados limpiados: {count}"
+    total = 0
+    while True:
+        started = time.monotonic()
+        with transaction.atomic():
+            cart_ids = list(
+                Cart.objects.select_for_update(skip_locked=True)
+                .filter(is_active=True, expires_at__isnull=False, expires_at__lt=now)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not cart_ids:
+                break
+            CartItem.objects.filter(cart_id__in=cart_ids).delete()
+            Cart.objects.filter(pk__in=cart_ids).update(is_active=False, updated_at=timezone.now())
+
+        total += len(cart_ids)
+        _record_expiration_batch("cleanup_expired_carts", len(cart_ids), started)
+        logger.info("Carritos expirados limpiados: lote=%d total=%d", len(cart_ids), total)
+        if len(cart_ids) < batch_size:
+            break
+    return f"Carritos expirados limpiados: {total}"
+
+
+def _record_expiration_batch(task_name, rows, started):
+    expiration_rows_processed.labels(task=task_name).inc(rows)
+    expiration_batch_duration.labels(task=task_name).observe(time.monotonic() - started)
+
+
+@shared_task
+def send_low_stock_digest():
+    """
+    Envía un único resumen con las variantes que cruzaron su umbral de stock
+    desde la ejecución anterior (ver InventoryService.check_low_stock).
+    """
+    from .services import InventoryService
+
+    count = InventoryService.flush_low_stock_alerts()
+    return f"Variantes en resumen de stock bajo: {count}"
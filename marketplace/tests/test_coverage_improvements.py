@@ -270,3 +270,397 @@ class TestViewCoverage:
         assert response.status_code == 200
         order.refresh_from_db()
         assert order.status == Order.OrderStatus.REFUNDED
+
+
+@pytest.mark.django_db
+class TestExpirationTasks:
+    def test_cleanup_expired_carts_processes_in_batches(self, variant, settings):
+        from marketplace.tasks import cleanup_expired_carts
+
+        settings.MARKETPLACE_EXPIRATION_BATCH_SIZE = 2
+        expired_at = timezone.now() - timezone.timedelta(hours=2)
+        carts = []
+        for index in range(5):
+            owner = CustomUser.objects.create_user(
+                phone_number=f"+57300555000{index}", password="pw", first_name="Cart"
+            )
+            expired_cart = Cart.objects.create(user=owner, is_active=True, expires_at=expired_at)
+            CartItem.objects.create(cart=expired_cart, variant=variant, quantity=1)
+            carts.append(expired_cart)
+        fresh_owner = CustomUser.objects.create_user(phone_number="+573005550099", password="pw")
+        fresh_cart = Cart.objects.create(user=fresh_owner, is_active=True)
+        CartItem.objects.create(cart=fresh_cart, variant=variant, quantity=1)
+
+        result = cleanup_expired_carts()
+
+        assert result == "Carritos expirados limpiados: 5"
+        assert not Cart.objects.filter(pk__in=[c.pk for c in carts], is_active=True).exists()
+        assert not CartItem.objects.filter(cart__in=carts).exists()
+        fresh_cart.refresh_from_db()
+        assert fresh_cart.is_active
+        assert fresh_cart.items.count() == 1
+
+    def test_release_expired_order_reservations_in_batches(self, user, variant, settings, mocker):
+        from marketplace.tasks import release_expired_order_reservations
+
+        mock_notify = mocker.patch("marketplace.tasks.notify_order_status_change.delay")
+        mock_whatsapp = mocker.patch(
+            "marketplace.services.order_service.MarketplaceNotificationService.send_order_status_update"
+        )
+        settings.MARKETPLACE_EXPIRATION_BATCH_SIZE = 2
+        expired_at = timezone.now() - timezone.timedelta(minutes=5)
+        orders = []
+        for _ in range(3):
+            order = Order.objects.create(
+                user=user,
+                total_amount=Decimal("200.00"),
+                status=Order.OrderStatus.PENDING_PAYMENT,
+                reservation_expires_at=expired_at,
+            )
+            OrderItem.objects.create(order=order, variant=variant, quantity=2, price_at_purchase=Decimal("100.00"))
+            orders.append(order)
+        # Solo 5 de las 6 unidades siguen reservadas: la última liberación se recorta
+        variant.reserved_stock = 5
+        variant.save()
+
+        result = release_expired_order_reservations()
+
+        assert result == "Reservas liberadas: 3"
+        variant.refresh_from_db()
+        assert variant.reserved_stock == 0
+        for order in orders:
+            order.refresh_from_db()
+            assert order.status == Order.OrderStatus.CANCELLED
+            assert order.reservation_expires_at is None
+        movements = InventoryMovement.objects.filter(
+            movement_type=InventoryMovement.MovementType.RESERVATION_RELEASE,
+            reference_order__in=orders,
+        )
+        assert movements.count() == 3
+        assert sum(m.quantity for m in movements) == 5
+        assert mock_notify.call_count == 3
+        assert mock_whatsapp.call_count == 3
+
+    def test_release_expired_order_reservations_invalidates_analytics_once_per_batch(
+        self, user, variant, settings, mocker, django_capture_on_commit_callbacks
+    ):
+        from core.utils.caching import payload_cache
+        from marketplace.tasks import release_expired_order_reservations
+
+        mocker.patch("marketplace.tasks.notify_order_status_change.delay")
+        mocker.patch("marketplace.services.order_service.MarketplaceNotificationService.send_order_status_update")
+        settings.MARKETPLACE_EXPIRATION_BATCH_SIZE = 2
+        expired_at = timezone.now() - timezone.timedelta(minutes=5)
+        for _ in range(3):
+            order = Order.objects.create(
+                user=user,
+                total_amount=Decimal("100.00"),
+                status=Order.OrderStatus.PENDING_PAYMENT,
+                reservation_expires_at=expired_at,
+            )
+            OrderItem.objects.create(order=order, variant=variant, quantity=1, price_at_purchase=Decimal("100.00"))
+        payload_cache.set("analytics:kpis:test", {"orders": 3})
+        payload_cache.set("analytics:bi:inventory:test", {"reserved": 3})
+        invalidate = mocker.spy(payload_cache, "delete_pattern")
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            release_expired_order_reservations()
+
+        assert len(callbacks) == 2
+        assert invalidate.call_count == 4
+        assert payload_cache.get("analytics:kpis:test") is None
+        assert payload_cache.get("analytics:bi:inventory:test") is None
+
+
+@pytest.mark.django_db
+class TestOrderCreationBatching:
+    def _cart_with_items(self, user, product, count, quantity=2, stock=10):
+        from marketplace.models import Cart
+        cart, _ = Cart.objects.get_or_create(user=user, is_active=True)
+        cart.items.all().delete()
+        for index in range(count):
+            batch_variant = ProductVariant.objects.create(
+                product=product,
+                name=f"Batch {count}-{index}",
+                sku=f"BATCH-{count}-{index}",
+                price=Decimal("10.00"),
+                stock=stock,
+            )
+            CartItem.objects.create(cart=cart, variant=batch_variant, quantity=quantity)
+        return cart
+
+    def _create_order(self, user, cart):
+        from marketplace.services import OrderCreationService
+        return OrderCreationService(
+            user=user, cart=cart, data={"delivery_option": Order.DeliveryOptions.PICKUP}
+        ).create_order()
+
+    def test_reserves_all_variants_and_bulk_creates_movements(self, user, product):
+        cart = self._cart_with_items(user, product, count=4)
+
+        order = self._create_order(user, cart)
+
+        assert order.total_amount == Decimal("80.00")
+        assert order.items.count() == 4
+        reserved = ProductVariant.objects.filter(order_items__order=order).values_list("reserved_stock", flat=True)
+        assert list(reserved) == [2, 2, 2, 2]
+        assert InventoryMovement.objects.filter(
+            reference_order=order, movement_type=InventoryMovement.MovementType.RESERVATION
+        ).count() == 4
+        assert cart.items.count() == 0
+
+    def test_query_count_does_not_grow_with_cart_size(self, user, product):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        small_cart = self._cart_with_items(user, product, count=1)
+        with CaptureQueriesContext(connection) as small:
+            self._create_order(user, small_cart)
+
+        large_cart = self._cart_with_items(user, product, count=10)
+        with CaptureQueriesContext(connection) as large:
+            self._create_order(user, large_cart)
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+        lock_queries = [q["sql"] for q in large.captured_queries if "FOR UPDATE" in q["sql"]]
+        assert len(lock_queries) == 1
+        assert "ORDER BY" in lock_queries[0]
+
+    def test_insufficient_stock_rolls_back_every_reservation(self, user, product):
+        from core.utils.exceptions import BusinessLogicError
+
+        cart = self._cart_with_items(user, product, count=3, quantity=2, stock=10)
+        short_item = cart.items.order_by("created_at").last()
+        short_item.variant.stock = 1
+        short_item.variant.save()
+
+        with pytest.raises(BusinessLogicError):
+            self._create_order(user, cart)
+
+        assert not ProductVariant.objects.filter(sku__startswith="BATCH-3-", reserved_stock__gt=0).exists()
+        assert not Order.objects.filter(user=user).exists()
+        assert cart.items.count() == 3
+
+
+@pytest.mark.django_db
+class TestLowStockDigest:
+    @pytest.fixture(autouse=True)
+    def clean_redis(self):
+        from marketplace.services import InventoryService
+        redis_conn = InventoryService._redis()
+        redis_conn.delete(InventoryService.PENDING_KEY, InventoryService.ALERTED_KEY)
+        yield
+        redis_conn.delete(InventoryService.PENDING_KEY, InventoryService.ALERTED_KEY)
+
+    def test_check_low_stock_does_not_notify_synchronously(self, variant, mocker):
+        from marketplace.services import InventoryService
+        mock_send = mocker.patch(
+            "marketplace.services.inventory_service.MarketplaceNotificationService.send_low_stock_alert"
+        )
+        variant.stock = 2
+        variant.low_stock_threshold = 5
+
+        InventoryService.check_low_stock(variant)
+
+        mock_send.assert_not_called()
+        assert InventoryService._redis().sismember(InventoryService.PENDING_KEY, str(variant.pk))
+
+    def test_digest_is_sent_once_until_restocked(self, product, variant, mocker):
+        from marketplace.services import InventoryService
+        from marketplace.tasks import send_low_stock_digest
+        mock_send = mocker.patch(
+            "marketplace.services.inventory_service.MarketplaceNotificationService.send_low_stock_alert"
+        )
+        other = ProductVariant.objects.create(
+            product=product, name="Var 2", sku="SKU2", price=Decimal("50.00"), stock=1, low_stock_threshold=3
+        )
+        variant.stock = 2
+        variant.low_stock_threshold = 5
+        variant.save()
+
+        for _ in range(3):
+            InventoryService.check_low_stock(variant)
+        InventoryService.check_low_stock(other)
+
+        assert send_low_stock_digest() == "Variantes en resumen de stock bajo: 2"
+        assert mock_send.call_count == 1
+        assert {v.pk for v in mock_send.call_args.args[0]} == {variant.pk, other.pk}
+
+        # Sigue bajo: no se repite
+        InventoryService.check_low_stock(variant)
+        assert InventoryService.flush_low_stock_alerts() == 0
+        assert mock_send.call_count == 1
+
+        # Reabastecido (por fuera del checkout) y vuelve a caer: se alerta de nuevo
+        ProductVariant.objects.filter(pk=variant.pk).update(stock=20)
+        assert InventoryService.flush_low_stock_alerts() == 0
+        ProductVariant.objects.filter(pk=variant.pk).update(stock=1)
+        variant.refresh_from_db()
+        InventoryService.check_low_stock(variant)
+        assert InventoryService.flush_low_stock_alerts() == 1
+        assert mock_send.call_count == 2
+
+    def test_digest_is_kept_when_sender_raises(self, variant, mocker):
+        from marketplace.services import InventoryService
+        mock_send = mocker.patch(
+            "marketplace.services.inventory_service.MarketplaceNotificationService.send_low_stock_alert",
+            side_effect=RuntimeError("sin conexión"),
+        )
+        variant.stock = 2
+        variant.low_stock_threshold = 5
+        variant.save()
+        InventoryService.check_low_stock(variant)
+
+        with pytest.raises(RuntimeError):
+            InventoryService.flush_low_stock_alerts()
+
+        redis_conn = InventoryService._redis()
+        assert redis_conn.sismember(InventoryService.PENDING_KEY, str(variant.pk))
+        assert not redis_conn.sismember(InventoryService.ALERTED_KEY, str(variant.pk))
+
+        mock_send.side_effect = None
+        mock_send.return_value = True
+        assert InventoryService.flush_low_stock_alerts() == 1
+        assert not redis_conn.exists(InventoryService.PENDING_KEY)
+
+    def test_digest_waits_until_an_admin_is_configured(self, variant, mocker):
+        from bot.models import BotConfiguration
+        from marketplace.services import InventoryService
+        mock_notify = mocker.patch(
+            "marketplace.services.notification_service.NotificationService.send_notification",
+            return_value=object(),
+        )
+        CustomUser.objects.filter(is_staff=True).update(is_staff=False)
+        BotConfiguration.objects.all().delete()
+        BotConfiguration.objects.create(admin_phone="+573000000999", is_active=True)
+        variant.stock = 2
+        variant.low_stock_threshold = 5
+        variant.save()
+        InventoryService.check_low_stock(variant)
+
+        assert InventoryService.flush_low_stock_alerts() == 0
+        mock_notify.assert_not_called()
+        redis_conn = InventoryService._redis()
+        assert redis_conn.sismember(InventoryService.PENDING_KEY, str(variant.pk))
+        assert not redis_conn.sismember(InventoryService.ALERTED_KEY, str(variant.pk))
+
+        admin = CustomUser.objects.create_user(
+            phone_number="+573000000999", password="pass", is_staff=True
+        )
+
+        assert InventoryService.flush_low_stock_alerts() == 1
+        assert mock_notify.call_args.kwargs["user"] == admin
+        assert redis_conn.sismember(InventoryService.ALERTED_KEY, str(variant.pk))
+
+
+@pytest.mark.django_db
+class TestCartCache:
+    url_my_cart = '/api/v1/marketplace/cart/my-cart/'
+    url_add = '/api/v1/marketplace/cart/add-item/'
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_my_cart_is_served_from_cache_without_queries(self, api_client, user, variant, django_capture_on_commit_callbacks):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        api_client.force_authenticate(user=user)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(self.url_add, {'variant_id': str(variant.id), 'quantity': 2}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+        with CaptureQueriesContext(connection) as ctx:
+            cached = api_client.get(self.url_my_cart)
+
+        assert cached.status_code == status.HTTP_200_OK
+        assert len(cached.data['items']) == 1
+        assert cached.data['items'][0]['quantity'] == 2
+        assert not [q for q in ctx.captured_queries if 'marketplace_cart' in q['sql']]
+
+    def test_remove_item_updates_cached_document_in_place(self, api_client, user, variant, product):
+        other = ProductVariant.objects.create(product=product, name="Var 2", sku="SKU2", price=Decimal("50.00"), stock=5)
+        api_client.force_authenticate(user=user)
+        api_client.post(self.url_add, {'variant_id': str(variant.id), 'quantity': 1}, format='json')
+        response = api_client.post(self.url_add, {'variant_id': str(other.id), 'quantity': 1}, format='json')
+        item_id = next(item['id'] for item in response.data['items'] if item['variant']['id'] == str(variant.id))
+
+        api_client.delete(f'/api/v1/marketplace/cart/{item_id}/remove-item/')
+        cached = api_client.get(self.url_my_cart)
+
+        assert [item['variant']['id'] for item in cached.data['items']] == [str(other.id)]
+        assert cached.data['total'] == Decimal("50.00")
+
+    def test_rejected_add_item_leaves_no_row_and_keeps_cache_in_sync(
+        self, api_client, user, variant, mocker, django_capture_on_commit_callbacks
+    ):
+        from marketplace.models import CartItem
+        from marketplace.serializers import CartItemCreateUpdateSerializer
+        from marketplace.services import CartCacheService
+
+        validate = CartItemCreateUpdateSerializer.validate
+
+        def validate_then_sell_out(serializer, data):
+            # Otra compra agota el stock entre la validación y el lock de la variante
+            validated = validate(serializer, data)
+            ProductVariant.objects.filter(pk=variant.pk).update(stock=1)
+            return validated
+
+        api_client.force_authenticate(user=user)
+        mocker.patch.object(CartItemCreateUpdateSerializer, "validate", validate_then_sell_out)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(self.url_add, {'variant_id': str(variant.id), 'quantity': 2}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['code'] == 'MKT-STOCK-CART'
+        assert not CartItem.objects.filter(cart__user=user).exists()
+        assert CartCacheService.item_count(user) in (None, 0)
+        assert api_client.get(self.url_my_cart).data['items'] == []
+
+    def test_catalog_change_invalidates_cached_cart(self, api_client, user, variant, django_capture_on_commit_callbacks):
+        api_client.force_authenticate(user=user)
+        api_client.post(self.url_add, {'variant_id': str(variant.id), 'quantity': 1}, format='json')
+
+        variant.price = Decimal("80.00")
+        with django_capture_on_commit_callbacks(execute=True):
+            variant.save()
+        response = api_client.get(self.url_my_cart)
+
+        assert response.data['total'] == Decimal("80.00")
+
+    def test_checkout_drops_cart_cached_before_commit(self, api_client, user, variant, django_capture_on_commit_callbacks):
+        from django.db import transaction
+        from marketplace.models import Cart
+        from marketplace.services import CartCacheService, OrderCreationService
+
+        api_client.force_authenticate(user=user)
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(self.url_add, {'variant_id': str(variant.id), 'quantity': 1}, format='json')
+        cart = Cart.objects.get(user=user, is_active=True)
+        stale = CartCacheService.get(user)
+        assert stale is not None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                OrderCreationService(
+                    user=user, cart=cart, data={"delivery_option": Order.DeliveryOptions.PICKUP}
+                ).create_order()
+                # Un my_cart concurrente aún ve el carrito previo al checkout
+                CartCacheService.store(user, cart, stale)
+
+        assert api_client.get(self.url_my_cart).data['items'] == []
+
+    def test_cart_expiration_writes_are_coalesced(self, api_client, user, variant, product):
+        from marketplace.models import Cart
+        other = ProductVariant.objects.create(product=product, name="Var 2", sku="SKU2", price=Decimal("50.00"), stock=5)
+        api_client.force_authenticate(user=user)
+        api_client.post(self.url_add, {'variant_id': str(variant.id), 'quantity': 1}, format='json')
+        first_expiry = Cart.objects.get(user=user, is_active=True).expires_at
+
+        api_client.post(self.url_add, {'variant_id': str(other.id), 'quantity': 1}, format='json')
+
+        assert Cart.objects.get(user=user, is_active=True).expires_at == first_expiry
@@ -21,7 +21,7 @@ from ..serializers import (
     CheckoutSerializer,
     OrderSerializer,
 )
-from ..services import OrderCreationService
+from ..services import CartCacheService, OrderCreationService
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +51,7 @@ class CartViewSet(viewsets.GenericViewSet):
             cart.items.all().delete()
             cart.is_active = False
             cart.save(update_fields=['is_active', 'updated_at'])
+            CartCacheService.invalidate(self.request.user)
             cart = None
 
         if not cart:
@@ -62,26 +63,40 @@ class CartViewSet(viewsets.GenericViewSet):
         return cart
 
     def _touch_cart_expiration(self, cart: Cart):
-        """Extiende el TTL del carrito en cada interacción."""
-        now = timezone.now()
-        new_expiry = now + timedelta(days=self.CART_TTL_DAYS)
-        if not cart.expires_at or cart.expires_at < new_expiry:
-            cart.expires_at = new_expiry
+        """
+        Extiende el TTL del carrito en cada interacción.
+
+        Las extensiones se coalescen: ``expires_at`` se escribe como máximo una
+        vez por ``CartCacheService.EXPIRY_REFRESH_INTERVAL``.
+        """
+        ttl = timedelta(days=self.CART_TTL_DAYS)
+        if CartCacheService.needs_expiry_refresh(cart, ttl):
+            cart.expires_at = timezone.now() + ttl
             cart.save(update_fields=['expires_at', 'updated_at'])
         return cart
 
+    def _render_cart(self, cart):
+        """
+        Serializa el carrito y actualiza el documento cacheado (write-through).
+
+        El documento se guarda al confirmar la transacción en curso: si se
+        revierte, la caché no debe quedar con un carrito que no existe.
+        """
+        data = CartSerializer(cart, context={'request': self.request, 'view': self}).data
+        user = self.request.user
+        transaction.on_commit(lambda: CartCacheService.store(user, cart, data))
+        return data
+
     @action(detail=False, methods=['get'], url_path='my-cart')
     def my_cart(self, request):
         """
         Obtiene el contenido del carrito de compras del usuario actual.
         GET /api/v1/marketplace/cart/my-cart/
         """
-        cart = self.get_cart()
-        serializer = CartSerializer(
-            cart,
-            context={'request': request, 'view': self}
-        )
-        return Response(serializer.data)
+        cached = CartCacheService.get(request.user)
+        if cached is not None:
+            return Response(cached)
+        return Response(self._render_cart(self.get_cart()))
 
 
     @action(detail=False, methods=['post'], url_path='add-item')
@@ -99,7 +114,10 @@ class CartViewSet(viewsets.GenericViewSet):
         cart = self.get_cart()
         self._touch_cart_expiration(cart)
         
-        if cart.items.count() >= MAX_CART_ITEMS:
+        item_count = CartCacheService.item_count(request.user)
+        if item_count is None:
+            item_count = cart.items.count()
+        if item_count >= MAX_CART_ITEMS:
             return Response(
                 {
                     "error": f"Has alcanzado el límite de {MAX_CART_ITEMS} productos diferentes en el carrito.",
@@ -128,18 +146,12 @@ class CartViewSet(viewsets.GenericViewSet):
         from ..models import ProductVariant
         variant = ProductVariant.objects.select_for_update().get(pk=variant_input.pk)
 
-        # Buscamos si el ítem ya existe en el carrito para actualizarlo
-        cart_item, created = CartItem.objects.get_or_create(
-            cart=cart,
-            variant=variant,
-            defaults={'quantity': quantity}
-        )
+        # Buscamos si el ítem ya existe en el carrito para actualizarlo. No se crea
+        # hasta validar cantidad y stock: un 400 no debe dejar filas nuevas.
+        # El lock de la variante serializa los add-item concurrentes del mismo producto.
+        cart_item = CartItem.objects.filter(cart=cart, variant=variant).first()
+        new_quantity = quantity if cart_item is None else cart_item.quantity + quantity
 
-        if not created:
-            new_quantity = cart_item.quantity + quantity
-        else:
-            new_quantity = quantity
-            
         if new_quantity > MAX_ITEM_QUANTITY:
              return Response(
                 {
@@ -160,12 +172,13 @@ class CartViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if not created:
+        if cart_item is None:
+            CartItem.objects.create(cart=cart, variant=variant, quantity=new_quantity)
+        else:
             cart_item.quantity = new_quantity
             cart_item.save()
         # Devolvemos el contenido completo del carrito actualizado
-        cart_serializer = CartSerializer(cart, context={'request': request, 'view': self})
-        return Response(cart_serializer.data, status=status.HTTP_201_CREATED)
+        return Response(self._render_cart(cart), status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['put'], url_path='update-item')
     def update_cart_item(self, request, pk=None):
@@ -184,9 +197,8 @@ class CartViewSet(viewsets.GenericViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         
-        cart_serializer = CartSerializer(self.get_cart(), context={'request': request, 'view': self})
         self._touch_cart_expiration(cart_item.cart)
-        return Response(cart_serializer.data)
+        return Response(self._render_cart(self.get_cart()))
 
     @action(detail=True, methods=['delete'], url_path='remove-item')
     def remove_cart_item(self, request, pk=None):
@@ -197,8 +209,10 @@ class CartViewSet(viewsets.GenericViewSet):
         try:
             cart_item = CartItem.objects.get(pk=pk, cart__user=request.user)
             cart = cart_item.cart
+            cart_item_id = cart_item.pk
             cart_item.delete()
             self._touch_cart_expiration(cart)
+            CartCacheService.remove_item(request.user, cart_item_id)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except CartItem.DoesNotExist:
             return Response({"error": "Ítem de carrito no encontrado."}, status=status.HTTP_404_NOT_FOUND)
@@ -7,4 +7,9 @@ class NotificationsConfig(AppConfig):
 
     def ready(self):
         # Ensures that tasks and signal handlers are registered
+        import notifications.signals  # noqa: F401
         import notifications.tasks  # noqa: F401
+        from notifications.delivery import register_queue_depth_collector
+
+        # La profundidad de las colas se lee del broker en cada scrape
+        register_queue_depth_collector()
@@ -0,0 +1,261 @@
+"""
+Planificador de entrega de notificaciones.
+
+- Carriles de prioridad: cada ``NotificationLog.priority`` se envía a su
+  propia cola de Celery, de modo que una ráfaga de recordatorios masivos no
+  retrasa OTPs ni confirmaciones de pago.
+- Limitador por canal: un token bucket distribuido (GCRA en Redis, atómico
+  vía Lua) fija la tasa de envío de cada canal. Cuando no hay cupo, la tarea
+  se reprograma con ETA al instante reservado en lugar de fallar y reintentar.
+  Los mensajes ``critical`` consumen cupo pero nunca esperan.
+
+Métricas Prometheus por carril: profundidad de cola (``QueueDepthCollector``,
+leída del broker en cada scrape del proceso web), retraso de entrega
+(histograma) y envíos diferidos por canal; estas dos se registran en el worker
+y se publican por su endpoint multiproceso (ver ``studiozens.celery``).
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.infra.metrics import get_counter, get_histogram
+
+logger = logging.getLogger(__name__)
+
+LANE_CRITICAL = "critical"
+LANE_DEFAULT = "default"
+LANE_BULK = "bulk"
+
+LANE_QUEUES = {
+    LANE_CRITICAL: "notifications_critical",
+    LANE_DEFAULT: "notifications",
+    LANE_BULK: "notifications_bulk",
+}
+
+# (mensajes por segundo, ráfaga permitida)
+DEFAULT_CHANNEL_RATES = {
+    "WHATSAPP": (10, 20),
+    "SMS": (5, 10),
+    "EMAIL": (20, 40),
+    "PUSH": (50, 100),
+}
+
+delivery_lag = get_histogram(
+    "notifications_delivery_lag_seconds",
+    "Tiempo entre el momento previsto de envío y el inicio de la entrega",
+    ["lane"],
+    buckets=(0.5, 1, 5, 15, 30, 60, 120, 300, 900, 1800),
+)
+deferred_total = get_counter(
+    "notifications_rate_deferred_total",
+    "Envíos reprogramados por el limitador de tasa",
+    ["channel", "lane"],
+)
+
+# GCRA: KEYS[1] = clave del canal; ARGV = intervalo (µs), tolerancia (µs), no_wait.
+# Reserva siempre el siguiente turno y devuelve cuántos µs hay que esperar.
+_RESERVE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000000 + tonumber(now_parts[2])
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local wait = tat - now - tolerance
+if wait < 0 or ARGV[3] == '1' then
+    wait = 0
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil((new_tat - now) / 1000) + 1000)
+return wait
+"""
+
+
+class DeliveryScheduler:
+    RATE_KEY_PREFIX = "notifications:rate"
+
+    _reserve_script = None
+
+    @staticmethod
+    def lane_for(priority, bulk=False):
+        if priority == "critical":
+            return LANE_CRITICAL
+        if bulk or priority == "low":
+            return LANE_BULK
+        return LANE_DEFAULT
+
+    @classmethod
+    def queue_for(cls, priority, bulk=False):
+        return LANE_QUEUES[cls.lane_for(priority, bulk)]
+
+    @staticmethod
+    def _channel_rate(channel):
+        # Un dict vacío desactiva el limitador
+        rates = getattr(settings, "NOTIFICATIONS_CHANNEL_RATES", DEFAULT_CHANNEL_RATES)
+        return rates.get(channel)
+
+    @classmethod
+    def _script(cls):
+        if cls._reserve_script is None:
+            from django_redis import get_redis_connection
+
+            cls._reserve_script = get_redis_connection("default").register_script(_RESERVE_SCRIPT)
+        return cls._reserve_script
+
+    @classmethod
+    def reserve(cls, channel, priority="high"):
+        """
+        Reserva un turno de envío en el canal y devuelve los segundos de espera.
+
+        Si Redis no está disponible se envía sin limitar (fail-open): el
+        backoff de ``send_notification_task`` sigue protegiendo al proveedor.
+        """
+        rate = cls._channel_rate(channel)
+        if not rate:
+            return 0.0
+        per_second, burst = rate
+        interval = int(1_000_000 / per_second)
+        tolerance = interval * max(int(burst) - 1, 0)
+        try:
+            wait_us = cls._script()(
+                keys=[f"{cls.RATE_KEY_PREFIX}:{channel}"],
+                args=[interval, tolerance, "1" if priority == "critical" else "0"],
+            )
+        except Exception as exc:
+            logger.warning("Limitador de notificaciones no disponible: %s", exc)
+            return 0.0
+        return int(wait_us) / 1_000_000
+
+    @classmethod
+    def enqueue(cls, log, *, eta=None, bulk=False):
+        from .tasks import send_notification_task
+
+        options = {"queue": cls.queue_for(log.priority, bulk)}
+        if eta:
+            options["eta"] = eta
+        return send_notification_task.apply_async(args=[str(log.id)], **options)
+
+    @classmethod
+    def signature(cls, log, *, eta=None, bulk=False):
+        from .tasks import send_notification_task
+
+        options = {"queue": cls.queue_for(log.priority, bulk)}
+        if eta:
+            options["eta"] = eta
+        return send_notification_task.signature(args=[str(log.id)], **options)
+
+    @classmethod
+    def defer_if_throttled(cls, log, queue=None):
+        """
+        Reserva turno para ``log``; si hay que esperar, reprograma la tarea con
+        ETA en el mismo carril y devuelve los segundos diferidos (0 si se envía ya).
+        """
+        wait = cls.reserve(log.channel, log.priority)
+        if wait <= 0:
+            return 0.0
+        from .tasks import send_notification_task
+
+        lane = cls.lane_for(log.priority)
+        deferred_total.labels(channel=log.channel, lane=lane).inc()
+        send_notification_task.apply_async(
+            args=[str(log.id)],
+            kwargs={"slot_reserved": True},
+            eta=timezone.now() + timedelta(seconds=wait),
+            queue=queue or LANE_QUEUES[lane],
+        )
+        return wait
+
+    @classmethod
+    def observe_lag(cls, log, due_at=None, queue=None):
+        """Registra el retraso entre el envío previsto (ETA o creación) y ahora."""
+        if isinstance(due_at, str):
+            due_at = parse_datetime(due_at)
+        due_at = due_at or log.created_at
+        if not due_at:
+            return
+        lane = cls._lane_for_queue(queue) or cls.lane_for(log.priority)
+        delivery_lag.labels(lane=lane).observe(max((timezone.now() - due_at).total_seconds(), 0))
+
+    @staticmethod
+    def _lane_for_queue(queue):
+        for lane, name in LANE_QUEUES.items():
+            if name == queue:
+                return lane
+        return None
+
+    @staticmethod
+    def queue_depths(connect_timeout=2):
+        """Devuelve ``{carril: mensajes pendientes}`` consultando el broker."""
+        from studiozens.celery import app
+
+        depths = {}
+        with app.connection_for_read(connect_timeout=connect_timeout) as connection:
+            channel = connection.default_channel
+            for lane, queue in LANE_QUEUES.items():
+                try:
+                    depths[lane] = channel.queue_declare(queue=queue, passive=True).message_count
+                except Exception as exc:
+                    # Cola aún no declarada: no tiene mensajes
+                    logger.debug("No se pudo leer la cola %s: %s", queue, exc)
+                    depths[lane] = 0
+        return depths
+
+
+class QueueDepthCollector:
+    """
+    Collector de Prometheus para ``notifications_queue_depth``.
+
+    Lee la longitud de cada carril en el momento del scrape, en el proceso
+    que Prometheus consulta; si el broker no responde no publica muestras.
+    """
+
+    def describe(self):
+        # Sin describe, el registro llamaría a collect() (y al broker) al registrarlo
+        return []
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily
+
+        family = GaugeMetricFamily(
+            "notifications_queue_depth",
+            "Mensajes pendientes en la cola de cada carril",
+            labels=["lane"],
+        )
+        try:
+            depths = DeliveryScheduler.queue_depths()
+        except Exception as exc:
+            logger.warning("No se pudo leer la profundidad de las colas: %s", exc)
+            depths = {}
+        for lane, depth in depths.items():
+            family.add_metric([lane], depth)
+        yield family
+
+
+_queue_depth_collector = None
+
+
+def register_queue_depth_collector(registry=None):
+    """Registra ``QueueDepthCollector`` una sola vez por proceso."""
+    global _queue_depth_collector
+    if _queue_depth_collector is not None:
+        return _queue_depth_collector
+    try:
+        from prometheus_client import REGISTRY
+    except Exception:  # pragma: no cover
+        return None
+    _queue_depth_collector = QueueDepthCollector()
+    (registry or REGISTRY).register(_queue_depth_collector)
+    return _queue_depth_collector
+
+
+__all__ = [
+    "LANE_QUEUES",
+    "DeliveryScheduler",
+    "QueueDepthCollector",
+    "register_queue_depth_collector",
+]
@@ -2,6 +2,7 @@ from datetime import datetime, time, timedelta, timezone as py_timezone
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 from django.core.exceptions import ValidationError
@@ -9,6 +10,8 @@ from simple_history.models import HistoricalRecords
 
 from core.models import BaseModel
 
+PREFERENCE_CACHE_TIMEOUT = 60 * 30
+
 
 class NotificationPreference(BaseModel):
     user = models.OneToOneField(
@@ -80,6 +83,31 @@ class NotificationPreference(BaseModel):
         preference, _ = cls.objects.get_or_create(user=user)
         return preference
 
+    @classmethod
+    def cache_key(cls, user_id):
+        return f"notifications:preference:v2:{user_id}"
+
+    @classmethod
+    def cached_for_user(cls, user):
+        """
+        Variante de solo lectura de ``for_user`` respaldada por la caché.
+
+        Se cachean solo los valores de los campos (no la instancia, que puede
+        arrastrar el usuario relacionado con su hash de contraseña). Se
+        invalida en los signals de guardado/borrado; no usar la instancia
+        devuelta para modificar preferencias.
+        """
+        key = cls.cache_key(user.pk)
+        data = cache.get(key)
+        if data is None:
+            preference = cls.for_user(user)
+            data = {field.attname: getattr(preference, field.attname) for field in cls._meta.concrete_fields}
+            cache.set(key, data, timeout=PREFERENCE_CACHE_TIMEOUT)
+            return preference
+        preference = cls(**data)
+        preference._state.adding = False
+        return preference
+
     def channel_enabled(self, channel):
         mapping = {
             NotificationTemplate.ChannelChoices.EMAIL: self.email_enabled,
@@ -2,7 +2,8 @@ import logging
 import re
 from datetime import timedelta
 
-from django.template import Context, Template, TemplateSyntaxError, VariableDoesNotExist
+from celery import group
+from django.template import Context, TemplateSyntaxError, VariableDoesNotExist
 from django.utils import timezone
 
 from notifications.models import (
@@ -10,6 +11,8 @@ from notifications.models import (
     NotificationTemplate,
     NotificationLog,
 )
+from notifications.delivery import DeliveryScheduler
+from notifications.template_cache import NotificationTemplateCache
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,9 @@ class NotificationRenderer:
         """
         Renderiza template con contexto.
         Maneja errores de sintaxis y variables faltantes.
+
+        Las plantillas guardadas se compilan una sola vez por versión
+        (ver NotificationTemplateCache).
         """
         ctx = Context(context or {})
         subject = ""
@@ -27,9 +33,10 @@ class NotificationRenderer:
         missing_vars = None
 
         try:
-            if template_obj.subject_template:
-                subject = Template(template_obj.subject_template).render(ctx).strip()
-            body = Template(template_obj.body_template).render(ctx).strip()
+            subject_template, body_template = NotificationTemplateCache.compiled(template_obj)
+            if subject_template is not None:
+                subject = subject_template.render(ctx).strip()
+            body = body_template.render(ctx).strip()
 
         except TemplateSyntaxError as e:
             logger.error(
@@ -68,6 +75,8 @@ class NotificationService:
         # SMS, EMAIL y PUSH deshabilitados por política
     ]
     MAX_DELIVERY_ATTEMPTS = 3
+    BULK_BATCH_SIZE = 500
+    BULK_ENQUEUE_CHUNK_SIZE = 100
 
     @classmethod
     def send_notification(
@@ -106,7 +115,7 @@ class NotificationService:
             return None
 
         if user:
-            preference = NotificationPreference.for_user(user)
+            preference = NotificationPreference.cached_for_user(user)
             available = []
             for channel, template in templates:
                 if not preference.channel_enabled(channel):
@@ -179,6 +188,116 @@ class NotificationService:
             silenced=within_quiet,
         )
 
+    @classmethod
+    def send_bulk(cls, event_code, recipients, priority="high", channel_override=None):
+        """
+        Envía el mismo evento a muchos usuarios en pocas consultas.
+
+        ``recipients`` es un iterable de ``(user, context)``. Las plantillas y
+        preferencias se resuelven una sola vez, los ``NotificationLog`` se crean
+        con ``bulk_create`` y las tareas se encolan en grupos de Celery.
+        Aplica las mismas reglas que ``send_notification`` (canales
+        habilitados, quiet hours); no admite destinatarios anónimos.
+
+        Devuelve la lista de logs encolados o silenciados.
+        """
+        recipients = [
+            (user, cls._sanitize_context(context or {}))
+            for user, context in recipients
+            if user is not None
+        ]
+        if not recipients:
+            return []
+
+        templates = cls._get_templates(event_code, channel_override)
+        if not templates:
+            NotificationLog.objects.bulk_create([
+                NotificationLog(
+                    user=user,
+                    event_code=event_code,
+                    channel=NotificationTemplate.ChannelChoices.WHATSAPP,
+                    status=NotificationLog.Status.FAILED,
+                    error_message="No existe plantilla activa para el evento.",
+                    priority=priority,
+                )
+                for user, _ in recipients
+            ], batch_size=cls.BULK_BATCH_SIZE)
+            return []
+
+        preferences = {
+            preference.user_id: preference
+            for preference in NotificationPreference.objects.filter(
+                user_id__in={user.pk for user, _ in recipients}
+            )
+        }
+
+        logs = []
+        scheduled = []
+        for user, context in recipients:
+            # Sin fila de preferencias equivale a los valores por defecto
+            preference = preferences.get(user.pk) or NotificationPreference(user=user)
+            available = [
+                (channel, template)
+                for channel, template in templates
+                if preference.channel_enabled(channel)
+            ]
+            if not available:
+                logs.append(NotificationLog(
+                    user=user,
+                    event_code=event_code,
+                    channel=templates[0][0],
+                    status=NotificationLog.Status.FAILED,
+                    error_message="El usuario no tiene canales habilitados.",
+                    priority=priority,
+                ))
+                continue
+
+            channel, template = available[0]
+            try:
+                subject, body = NotificationRenderer.render(template, context)
+            except ValueError as exc:
+                logs.append(NotificationLog(
+                    user=user,
+                    event_code=event_code,
+                    channel=channel,
+                    status=NotificationLog.Status.FAILED,
+                    error_message=str(exc),
+                    priority=priority,
+                    metadata={"context": context},
+                ))
+                continue
+
+            within_quiet = preference.is_quiet_now() and priority != "critical"
+            eta = preference.next_quiet_end() if within_quiet else None
+            log = NotificationLog(
+                user=user,
+                event_code=event_code,
+                channel=channel,
+                status=NotificationLog.Status.SILENCED if within_quiet else NotificationLog.Status.QUEUED,
+                priority=priority,
+                payload={"subject": subject, "body": body},
+                metadata=cls._build_metadata(
+                    context, [chan for chan, _ in available[1:]], eta
+                ),
+            )
+            logs.append(log)
+            scheduled.append((log, eta))
+
+        NotificationLog.objects.bulk_create(logs, batch_size=cls.BULK_BATCH_SIZE)
+        cls._enqueue_bulk(scheduled)
+        return [log for log, _ in scheduled]
+
+    @classmethod
+    def _enqueue_bulk(cls, scheduled):
+        # Los envíos masivos van al carril bulk (salvo los críticos)
+        for start in range(0, len(scheduled), cls.BULK_ENQUEUE_CHUNK_SIZE):
+            group([
+                DeliveryScheduler.signature(
+                    log, eta=eta + timedelta(seconds=1) if eta else None, bulk=True
+                )
+                for log, eta in scheduled[start:start + cls.BULK_ENQUEUE_CHUNK_SIZE]
+            ]).apply_async()
+
     @staticmethod
     def _sanitize_context(context: dict) -> dict:
         """
@@ -197,15 +316,12 @@ class NotificationService:
 
     @classmethod
     def _get_templates(cls, event_code, channel_override=None):
-        queryset = NotificationTemplate.objects.filter(
-            event_code=event_code,
-            is_active=True,
-        ).order_by("-created_at")
+        active = NotificationTemplateCache.get_templates(event_code)
         templates = []
         for channel in cls.CHANNEL_PRIORITY:
             if channel_override and channel != channel_override:
                 continue
-            template = queryset.filter(channel=channel).first()
+            template = active.get(channel)
             if template:
                 templates.append((channel, template))
         return templates
@@ -225,6 +341,22 @@ class NotificationService:
         eta=None,
         silenced=False,
     ):
+        metadata_dict = cls._build_metadata(context, fallback_channels, eta)
+
+        log = NotificationLog.objects.create(
+            user=user,
+            event_code=event_code,
+            channel=channel,
+            status=NotificationLog.Status.SILENCED if silenced else NotificationLog.Status.QUEUED,
+            priority=priority,
+            payload={"subject": subject, "body": body},
+            metadata=metadata_dict,
+        )
+        DeliveryScheduler.enqueue(log, eta=eta + timedelta(seconds=1) if eta else None)
+        return log
+
+    @classmethod
+    def _build_metadata(cls, context, fallback_channels, eta=None):
         metadata_dict = {
             "context": context,
             "fallback": fallback_channels,
@@ -236,24 +368,8 @@ class NotificationService:
                 "created_at": timezone.now().isoformat(),
             },
         }
-        
+
         # Lift phone_number to top-level metadata if present
         if context and "phone_number" in context:
             metadata_dict["phone_number"] = context["phone_number"]
-
-        log = NotificationLog.objects.create(
-            user=user,
-            event_code=event_code,
-            channel=channel,
-            status=NotificationLog.Status.SILENCED if silenced else NotificationLog.Status.QUEUED,
-            priority=priority,
-            payload={"subject": subject, "body": body},
-            metadata=metadata_dict,
-        )
-        from .tasks import send_notification_task
-
-        kwargs = {}
-        if eta:
-            kwargs["eta"] = eta + timedelta(seconds=1)
-        send_notification_task.apply_async(args=[str(log.id)], **kwargs)
-        return log
+        return metadata_dict
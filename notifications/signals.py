@@ -0,0 +1,22 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from notifications.models import NotificationPreference, NotificationTemplate
+from notifications.template_cache import NotificationTemplateCache
+
+
+# Invalidar tras el commit: antes, otro proceso podría recargar las filas
+# anteriores y guardarlas en caché como si fueran las nuevas.
+@receiver(post_save, sender=NotificationTemplate)
+@receiver(post_delete, sender=NotificationTemplate)
+def invalidate_template_cache(sender, **kwargs):
+    transaction.on_commit(NotificationTemplateCache.invalidate)
+
+
+@receiver(post_save, sender=NotificationPreference)
+@receiver(post_delete, sender=NotificationPreference)
+def invalidate_preference_cache(sender, instance, **kwargs):
+    key = NotificationPreference.cache_key(instance.user_id)
+    transaction.on_commit(lambda: cache.delete(key))
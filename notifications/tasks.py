@@ -4,6 +4,7 @@ from datetime import timedelta
 from celery import shared_task
 from django.utils import timezone
 
+from notifications.delivery import DeliveryScheduler
 from notifications.models import NotificationLog, NotificationTemplate
 from notifications.services import NotificationService
 from spa.models import Appointment
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True)
-def send_notification_task(self, log_id):
+def send_notification_task(self, log_id, slot_reserved=False):
     from notifications.models import NotificationLog
 
     try:
@@ -23,6 +24,13 @@ def send_notification_task(self, log_id):
     if log.status == NotificationLog.Status.SENT:
         return "Ya enviado"
 
+    queue = (self.request.delivery_info or {}).get("routing_key")
+    if not slot_reserved:
+        wait = DeliveryScheduler.defer_if_throttled(log, queue=queue)
+        if wait:
+            return f"deferred_{wait:.2f}s"
+    DeliveryScheduler.observe_lag(log, due_at=self.request.eta, queue=queue)
+
     if log.status == NotificationLog.Status.SILENCED:
         log.status = NotificationLog.Status.QUEUED
         log.save(update_fields=["status", "updated_at"])
@@ -75,7 +83,11 @@ def send_notification_task(self, log_id):
             )
 
         logger.exception("Error enviando notificación %s. Reintentando en %ss", log.id, backoff_seconds)
-        send_notification_task.apply_async(args=[str(log.id)], countdown=backoff_seconds)
+        send_notification_task.apply_async(
+            args=[str(log.id)],
+            countdown=backoff_seconds,
+            queue=queue or DeliveryScheduler.queue_for(log.priority),
+        )
         return f"retry_scheduled_in_{backoff_seconds}s"
 
 
@@ -190,7 +202,9 @@ def check_upcoming_appointments_2h():
     window_end = window_start + timedelta(minutes=5)
     from spa.models import Appointment
 
-    appointments = Appointment.objects.select_related("user").filter(
+    appointments = Appointment.objects.select_related("user").prefetch_related(
+        "items__service"
+    ).filter(
         start_time__gte=window_start,
         start_time__lte=window_end,
         status__in=[
@@ -198,7 +212,7 @@ def check_upcoming_appointments_2h():
             Appointment.AppointmentStatus.RESCHEDULED,
         ],
     )
-    count = 0
+    recipients = []
     for appointment in appointments:
         user = appointment.user
         if not user:
@@ -208,20 +222,19 @@ def check_upcoming_appointments_2h():
             )
             continue
 
-        context = {
+        recipients.append((user, {
             "user_name": user.get_full_name() or user.first_name or "Cliente",
             "appointment_id": str(appointment.id),
             "start_time": appointment.start_time.isoformat(),
             "services": appointment.get_service_names(),
-        }
-        NotificationService.send_notification(
-            user=appointment.user,
-            event_code="APPOINTMENT_REMINDER_2H",
-            context=context,
-            priority="high",
-        )
-        count += 1
-    return f"{count} recordatorios generados"
+        }))
+
+    NotificationService.send_bulk(
+        "APPOINTMENT_REMINDER_2H",
+        recipients,
+        priority="high",
+    )
+    return f"{len(recipients)} recordatorios generados"
 
 
 @shared_task
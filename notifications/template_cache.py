@@ -0,0 +1,121 @@
+"""
+Caché en proceso de plantillas de notificación.
+
+- Índice de plantillas activas por ``event_code`` (evita una consulta por canal
+  en cada envío).
+- Plantillas compiladas (``django.template.Template``) indexadas por
+  ``(event_code, channel, updated_at)``: una edición genera una clave nueva.
+
+La coherencia entre procesos (gunicorn/celery) se logra con un número de
+versión en la caché compartida que los signals de ``NotificationTemplate``
+incrementan al confirmar la transacción; cada proceso descarta su índice local
+al ver una versión nueva. Cada entrada del índice caduca además a los
+``INDEX_TTL`` segundos, por si un proceso cargó filas anteriores al cambio.
+Si la caché compartida no está disponible se consulta la base de datos.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.template import Template
+
+from notifications.models import NotificationTemplate
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationTemplateCache:
+    VERSION_KEY = "notifications:templates:version"
+    MAX_COMPILED = 512
+    INDEX_TTL = 60
+
+    _lock = threading.Lock()
+    _version = None
+    _index: dict = {}
+    _compiled: OrderedDict = OrderedDict()
+
+    @classmethod
+    def get_templates(cls, event_code):
+        """Devuelve ``{channel: plantilla}`` con la plantilla activa más reciente por canal."""
+        if not cls._sync_version():
+            return cls._load(event_code)
+        now = time.monotonic()
+        entry = cls._index.get(event_code)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        templates = cls._load(event_code)
+        with cls._lock:
+            cls._index[event_code] = (templates, now + cls.INDEX_TTL)
+        return templates
+
+    @classmethod
+    def compiled(cls, template_obj):
+        """Devuelve ``(subject, body)`` compilados; subject es None si la plantilla no tiene asunto."""
+        if template_obj.pk is None or template_obj.updated_at is None:
+            return cls._compile(template_obj)
+
+        key = (template_obj.event_code, template_obj.channel, template_obj.updated_at)
+        with cls._lock:
+            compiled = cls._compiled.get(key)
+            if compiled is not None:
+                cls._compiled.move_to_end(key)
+                return compiled
+
+        compiled = cls._compile(template_obj)
+        with cls._lock:
+            cls._compiled[key] = compiled
+            while len(cls._compiled) > cls.MAX_COMPILED:
+                cls._compiled.popitem(last=False)
+        return compiled
+
+    @classmethod
+    def invalidate(cls):
+        """Descarta el índice local y notifica al resto de procesos."""
+        cls.clear_local()
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            cache.add(cls.VERSION_KEY, 1, timeout=None)
+        except Exception as exc:
+            logger.warning("No se pudo invalidar la versión de plantillas: %s", exc)
+
+    @classmethod
+    def clear_local(cls):
+        with cls._lock:
+            cls._index = {}
+            cls._compiled.clear()
+            cls._version = None
+
+    @staticmethod
+    def _load(event_code):
+        templates = {}
+        for template in NotificationTemplate.objects.filter(
+            event_code=event_code,
+            is_active=True,
+        ).order_by("-created_at"):
+            templates.setdefault(template.channel, template)
+        return templates
+
+    @staticmethod
+    def _compile(template_obj):
+        subject = Template(template_obj.subject_template) if template_obj.subject_template else None
+        return subject, Template(template_obj.body_template)
+
+    @classmethod
+    def _sync_version(cls):
+        try:
+            version = cache.get(cls.VERSION_KEY)
+            if version is None:
+                cache.add(cls.VERSION_KEY, 1, timeout=None)
+                version = cache.get(cls.VERSION_KEY)
+        except Exception:
+            version = None
+        if version is None:
+            return False
+        if version != cls._version:
+            with cls._lock:
+                cls._index = {}
+                cls._version = version
+        return True
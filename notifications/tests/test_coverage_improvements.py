@@ -270,7 +270,7 @@ class TestNotificationTasks:
         assert not NotificationLog.objects.filter(id=old_sent.id).exists()
         assert NotificationLog.objects.filter(id=recent_sent.id).exists()
 
-    @patch("notifications.services.NotificationService.send_notification")
+    @patch("notifications.services.NotificationService.send_bulk")
     def test_check_upcoming_appointments_2h(self, mock_send, user):
         from spa.models import AppointmentItem
         
@@ -303,6 +303,10 @@ class TestNotificationTasks:
         result = check_upcoming_appointments_2h()
         assert "1 recordatorios generados" in result
         mock_send.assert_called_once()
+        event_code, recipients = mock_send.call_args.args
+        assert event_code == "APPOINTMENT_REMINDER_2H"
+        assert recipients[0][0] == user
+        assert recipients[0][1]["services"] == "Massage"
 
 @pytest.mark.django_db
 class TestNotificationViews:
@@ -0,0 +1,155 @@
+import pytest
+from unittest.mock import patch
+
+from django_redis import get_redis_connection
+from prometheus_client import CollectorRegistry
+
+from notifications.delivery import LANE_QUEUES, DeliveryScheduler, QueueDepthCollector
+from notifications.models import NotificationLog, NotificationTemplate
+from notifications.services import NotificationService
+from notifications.tasks import send_notification_task
+from users.models import CustomUser
+
+
+@pytest.fixture
+def user(db):
+    return CustomUser.objects.create_user(
+        phone_number="+573001230000",
+        email="delivery@example.com",
+        password="password",
+        first_name="Delivery",
+    )
+
+
+@pytest.fixture
+def rate_limited(settings):
+    settings.NOTIFICATIONS_CHANNEL_RATES = {"TESTCHANNEL": (1, 2)}
+    get_redis_connection("default").delete(f"{DeliveryScheduler.RATE_KEY_PREFIX}:TESTCHANNEL")
+    yield "TESTCHANNEL"
+    get_redis_connection("default").delete(f"{DeliveryScheduler.RATE_KEY_PREFIX}:TESTCHANNEL")
+
+
+def test_lane_for_priority():
+    assert DeliveryScheduler.queue_for("critical") == LANE_QUEUES["critical"]
+    assert DeliveryScheduler.queue_for("critical", bulk=True) == LANE_QUEUES["critical"]
+    assert DeliveryScheduler.queue_for("high") == LANE_QUEUES["default"]
+    assert DeliveryScheduler.queue_for("high", bulk=True) == LANE_QUEUES["bulk"]
+    assert DeliveryScheduler.queue_for("low") == LANE_QUEUES["bulk"]
+
+
+@pytest.mark.django_db
+def test_token_bucket_allows_burst_then_reserves_future_slots(rate_limited):
+    waits = [DeliveryScheduler.reserve(rate_limited) for _ in range(4)]
+
+    assert waits[0] == 0 and waits[1] == 0
+    # 1 msg/s: cada envío extra queda un segundo más tarde que el anterior
+    assert 0.5 < waits[2] <= 1.0
+    assert 1.5 < waits[3] <= 2.0
+
+
+@pytest.mark.django_db
+def test_critical_consumes_tokens_but_never_waits(rate_limited):
+    for _ in range(5):
+        assert DeliveryScheduler.reserve(rate_limited, priority="critical") == 0
+    assert DeliveryScheduler.reserve(rate_limited) > 0
+
+
+def test_limiter_disabled_without_rates(settings):
+    settings.NOTIFICATIONS_CHANNEL_RATES = {}
+    assert DeliveryScheduler.reserve("WHATSAPP") == 0
+
+
+@pytest.mark.django_db
+class TestThrottledDelivery:
+    def _log(self, user, priority="high"):
+        return NotificationLog.objects.create(
+            user=user,
+            event_code="TEST_EVENT",
+            channel=NotificationTemplate.ChannelChoices.WHATSAPP,
+            status=NotificationLog.Status.QUEUED,
+            priority=priority,
+        )
+
+    @patch("notifications.tasks._dispatch_channel")
+    def test_throttled_send_is_deferred_with_eta(self, mock_dispatch, user):
+        log = self._log(user)
+        with patch.object(DeliveryScheduler, "reserve", return_value=3.0), \
+                patch("notifications.tasks.send_notification_task.apply_async") as mock_apply:
+            result = send_notification_task(str(log.id))
+
+        assert result.startswith("deferred_")
+        mock_dispatch.assert_not_called()
+        kwargs = mock_apply.call_args.kwargs
+        assert kwargs["kwargs"] == {"slot_reserved": True}
+        assert kwargs["queue"] == LANE_QUEUES["default"]
+        assert kwargs["eta"] is not None
+        log.refresh_from_db()
+        assert log.status == NotificationLog.Status.QUEUED
+        assert not log.metadata.get("attempts")
+
+    @patch("notifications.tasks._dispatch_channel")
+    def test_reserved_slot_is_dispatched_without_new_reservation(self, mock_dispatch, user):
+        log = self._log(user)
+        with patch.object(DeliveryScheduler, "reserve") as mock_reserve:
+            assert send_notification_task(str(log.id), slot_reserved=True) == "Enviado"
+        mock_reserve.assert_not_called()
+        mock_dispatch.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_critical_notifications_use_critical_lane(user):
+    NotificationTemplate.objects.create(
+        event_code="OTP_EVENT",
+        channel=NotificationTemplate.ChannelChoices.WHATSAPP,
+        body_template="Codigo {{ code }}",
+        is_active=True,
+    )
+    with patch("notifications.tasks.send_notification_task.apply_async") as mock_apply:
+        NotificationService.send_notification(user, "OTP_EVENT", {"code": "1234"}, priority="critical")
+    assert mock_apply.call_args.kwargs["queue"] == LANE_QUEUES["critical"]
+
+
+@pytest.mark.django_db
+def test_bulk_notifications_use_bulk_lane(user):
+    NotificationTemplate.objects.create(
+        event_code="BULK_EVENT",
+        channel=NotificationTemplate.ChannelChoices.WHATSAPP,
+        body_template="Hola {{ name }}",
+        is_active=True,
+    )
+    with patch("notifications.services.group") as mock_group:
+        NotificationService.send_bulk("BULK_EVENT", [(user, {"name": "A"})])
+    signature, = mock_group.call_args.args[0]
+    assert signature.options["queue"] == LANE_QUEUES["bulk"]
+
+
+def test_queue_depth_is_read_from_broker_at_scrape_time():
+    registry = CollectorRegistry()
+    registry.register(QueueDepthCollector())
+
+    with patch.object(DeliveryScheduler, "queue_depths", return_value={"critical": 0, "default": 3, "bulk": 40}):
+        assert registry.get_sample_value("notifications_queue_depth", {"lane": "bulk"}) == 40
+    with patch.object(DeliveryScheduler, "queue_depths", return_value={"critical": 0, "default": 1, "bulk": 7}):
+        assert registry.get_sample_value("notifications_queue_depth", {"lane": "bulk"}) == 7
+
+
+def test_queue_depth_reports_every_lane_and_skips_when_broker_fails():
+    assert set(DeliveryScheduler.queue_depths()) == set(LANE_QUEUES)
+
+    registry = CollectorRegistry()
+    registry.register(QueueDepthCollector())
+    with patch.object(DeliveryScheduler, "queue_depths", side_effect=ConnectionError("broker caído")):
+        assert registry.get_sample_value("notifications_queue_depth", {"lane": "bulk"}) is None
+
+
+def test_queue_depth_collector_is_registered_once(monkeypatch):
+    from prometheus_client import CollectorRegistry
+    from notifications import delivery
+
+    monkeypatch.setattr(delivery, "_queue_depth_collector", None)
+    registry = CollectorRegistry()
+
+    collector = delivery.register_queue_depth_collector(registry)
+
+    assert collector in registry._collector_to_names
+    assert delivery.register_queue_depth_collector(registry) is collector
@@ -1,5 +1,9 @@
+import time as time_module
 import pytest
 from unittest.mock import patch, MagicMock
+from django.core.cache import cache
+from django.db import transaction
+from django.template import Template
 from django.utils import timezone
 from datetime import time
 from notifications.services import NotificationService
@@ -171,3 +175,171 @@ class TestNotificationService:
         assert NotificationLog.objects.filter(status=NotificationLog.Status.FAILED).exists()
         failed_log = NotificationLog.objects.filter(status=NotificationLog.Status.FAILED).first()
         assert "Template inválido" in failed_log.error_message
+
+
+@pytest.mark.django_db
+class TestNotificationTemplateCache:
+    def test_repeated_renders_resolve_and_compile_template_once(self, whatsapp_template, django_assert_num_queries):
+        from notifications.services import NotificationRenderer
+
+        with patch('notifications.template_cache.Template', wraps=Template) as compile_mock:
+            NotificationService._get_templates("TEST_EVENT")
+            with django_assert_num_queries(0):
+                for i in range(10_000):
+                    (channel, template), = NotificationService._get_templates("TEST_EVENT")
+                    _, body = NotificationRenderer.render(template, {"name": str(i)})
+        assert body == "Hello 9999"
+        assert compile_mock.call_count == 1
+
+    def test_template_save_invalidates_cache(self, whatsapp_template, django_capture_on_commit_callbacks):
+        from notifications.services import NotificationRenderer
+
+        (_, template), = NotificationService._get_templates("TEST_EVENT")
+        assert NotificationRenderer.render(template, {"name": "A"})[1] == "Hello A"
+
+        whatsapp_template.body_template = "Bye {{ name }}"
+        with django_capture_on_commit_callbacks(execute=True):
+            whatsapp_template.save()
+
+        (_, template), = NotificationService._get_templates("TEST_EVENT")
+        assert NotificationRenderer.render(template, {"name": "A"})[1] == "Bye A"
+
+    def test_deactivated_template_is_dropped(self, whatsapp_template, django_capture_on_commit_callbacks):
+        assert NotificationService._get_templates("TEST_EVENT")
+        whatsapp_template.is_active = False
+        with django_capture_on_commit_callbacks(execute=True):
+            whatsapp_template.save()
+        assert NotificationService._get_templates("TEST_EVENT") == []
+
+    def test_template_read_before_commit_is_discarded(self, whatsapp_template, django_capture_on_commit_callbacks):
+        from notifications.template_cache import NotificationTemplateCache
+
+        stale = {whatsapp_template.channel: NotificationTemplate.objects.get(pk=whatsapp_template.pk)}
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                whatsapp_template.body_template = "Bye {{ name }}"
+                whatsapp_template.save()
+                # Otro proceso lee las filas anteriores antes del commit
+                with patch.object(NotificationTemplateCache, "_load", return_value=stale):
+                    (_, template), = NotificationService._get_templates("TEST_EVENT")
+                assert template.body_template == "Hello {{ name }}"
+
+        (_, template), = NotificationService._get_templates("TEST_EVENT")
+        assert template.body_template == "Bye {{ name }}"
+
+    def test_local_index_expires_without_invalidation(self, whatsapp_template):
+        from notifications.template_cache import NotificationTemplateCache
+
+        NotificationService._get_templates("TEST_EVENT")
+        NotificationTemplate.objects.filter(pk=whatsapp_template.pk).update(is_active=False)
+        assert NotificationService._get_templates("TEST_EVENT")
+
+        with patch("notifications.template_cache.time.monotonic",
+                   return_value=time_module.monotonic() + NotificationTemplateCache.INDEX_TTL + 1):
+            assert NotificationService._get_templates("TEST_EVENT") == []
+
+    def test_preference_save_invalidates_cached_preference(self, user, django_capture_on_commit_callbacks):
+        pref = NotificationPreference.cached_for_user(user)
+        assert pref.whatsapp_enabled
+
+        pref = NotificationPreference.for_user(user)
+        pref.whatsapp_enabled = False
+        with django_capture_on_commit_callbacks(execute=True):
+            pref.save()
+
+        assert NotificationPreference.cached_for_user(user).whatsapp_enabled is False
+
+    def test_cached_preference_stores_field_values_only(self, user):
+        NotificationPreference.objects.filter(user=user).delete()
+        created = NotificationPreference.cached_for_user(user)
+        assert created.user == user
+
+        data = cache.get(NotificationPreference.cache_key(user.pk))
+        assert isinstance(data, dict)
+        assert "user" not in data and data["user_id"] == user.pk
+        assert not any("password" in str(value) for value in data.values())
+
+        cached = NotificationPreference.cached_for_user(user)
+        assert cached.pk == created.pk
+        assert cached.whatsapp_enabled is created.whatsapp_enabled
+
+    def test_preference_read_before_commit_is_discarded(self, user, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                pref = NotificationPreference.for_user(user)
+                pref.whatsapp_enabled = False
+                pref.save()
+                # Una lectura concurrente guarda la fila anterior al commit
+                stale = NotificationPreference.objects.filter(pk=pref.pk).values().get()
+                stale["whatsapp_enabled"] = True
+                cache.set(NotificationPreference.cache_key(user.pk), stale)
+                assert NotificationPreference.cached_for_user(user).whatsapp_enabled is True
+
+        assert NotificationPreference.cached_for_user(user).whatsapp_enabled is False
+
+
+def _make_users(count, offset=0):
+    return [
+        CustomUser.objects.create_user(
+            phone_number=f"+5730099{offset + i:05d}",
+            email=f"bulk{offset + i}@example.com",
+            password="password",
+            first_name=f"Bulk {i}",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestSendBulk:
+    def test_creates_logs_and_enqueues_in_groups(self, whatsapp_template):
+        users = _make_users(3)
+        silenced_user = users[2]
+        pref = NotificationPreference.for_user(silenced_user)
+        pref.quiet_hours_start = time(0, 0)
+        pref.quiet_hours_end = time(23, 59)
+        pref.save()
+
+        with patch('notifications.services.group') as mock_group, \
+                patch.object(NotificationService, 'BULK_ENQUEUE_CHUNK_SIZE', 2):
+            logs = NotificationService.send_bulk(
+                "TEST_EVENT",
+                [(user, {"name": user.first_name}) for user in users],
+            )
+
+        assert len(logs) == 3
+        assert NotificationLog.objects.filter(status=NotificationLog.Status.QUEUED).count() == 2
+        silenced = NotificationLog.objects.get(user=silenced_user)
+        assert silenced.status == NotificationLog.Status.SILENCED
+        assert silenced.metadata["scheduled_for"]
+        assert NotificationLog.objects.get(user=users[0]).payload["body"] == "Hello Bulk 0"
+        # 3 tareas en grupos de 2
+        assert mock_group.call_count == 2
+        assert [len(call.args[0]) for call in mock_group.call_args_list] == [2, 1]
+
+    def test_disabled_channel_logs_failure(self, whatsapp_template):
+        user, = _make_users(1)
+        pref = NotificationPreference.for_user(user)
+        pref.whatsapp_enabled = False
+        pref.save()
+
+        with patch('notifications.services.group') as mock_group:
+            logs = NotificationService.send_bulk("TEST_EVENT", [(user, {"name": "x"})])
+
+        assert logs == []
+        log = NotificationLog.objects.get(user=user)
+        assert log.status == NotificationLog.Status.FAILED
+        mock_group.assert_not_called()
+
+    def test_query_count_does_not_grow_with_recipients(self, whatsapp_template, django_assert_max_num_queries):
+        few = _make_users(2)
+        many = _make_users(40, offset=100)
+        NotificationService._get_templates("TEST_EVENT")
+
+        with patch('notifications.services.group'):
+            with django_assert_max_num_queries(3):
+                NotificationService.send_bulk("TEST_EVENT", [(u, {"name": "x"}) for u in few])
+            with django_assert_max_num_queries(3):
+                NotificationService.send_bulk("TEST_EVENT", [(u, {"name": "x"}) for u in many])
+
+        assert NotificationLog.objects.count() == 42
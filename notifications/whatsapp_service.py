@@ -45,9 +45,9 @@ class WhatsAppService:
             }
 
         try:
-            from twilio.rest import Client
+            from core.infra.twilio_client import get_twilio_client
 
-            client = Client(
+            client = get_twilio_client(
                 settings.TWILIO_ACCOUNT_SID,
                 settings.TWILIO_AUTH_TOKEN
             )
@@ -122,9 +122,9 @@ class WhatsAppService:
             }
 
         try:
-            from twilio.rest import Client
+            from core.infra.twilio_client import get_twilio_client
 
-            client = Client(
+            client = get_twilio_client(
                 settings.TWILIO_ACCOUNT_SID,
                 settings.TWILIO_AUTH_TOKEN
             )
@@ -0,0 +1,83 @@
+"""
+Benchmark de los alias de caché para payloads grandes.
+
+Guarda los mismos payloads (respuesta de KPIs/series de analytics y el
+contexto de catálogo del bot) en el alias ``default`` (pickle sin comprimir)
+y en ``payloads`` (pickle + zlib por umbral) y compara los bytes que ocupa
+cada valor en Redis (``MEMORY USAGE`` si el servidor lo soporta, si no
+``STRLEN``) y la latencia de ``get`` (p50/p99).
+
+Uso:
+    docker compose exec web python scripts/benchmark_cache_payloads.py [lecturas]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+
+def _payloads():
+    random.seed(7)
+    series = {
+        "series": [
+            {
+                "date": f"2025-{month:02d}-{day:02d}",
+                "revenue": round(random.random() * 1_000_000, 2),
+                "appointments": random.randint(0, 40),
+                "status": random.choice(["COMPLETED", "CONFIRMED", "CANCELLED"]),
+            }
+            for month in range(1, 13)
+            for day in range(1, 29)
+        ]
+    }
+    catalog = "\n".join(
+        f"- Servicio {index} (60min): $120.000. Masaje relajante con aceites esenciales y piedras calientes."
+        for index in range(150)
+    )
+    return {"analytics_series": series, "bot_catalog": catalog}
+
+
+def main():
+    import django
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "studiozens.settings")
+    django.setup()
+
+    from django.core.cache import caches
+
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    def stored_bytes(alias, key):
+        backend = caches[alias]
+        client = backend.client.get_client(write=False)
+        redis_key = backend.make_key(key)
+        try:
+            return client.memory_usage(redis_key)
+        except Exception:
+            return client.strlen(redis_key)
+
+    print(f"{'payload':<18} {'alias':<9} {'bytes':>8} {'p50':>9} {'p99':>9}")
+    for name, value in _payloads().items():
+        for alias in ("default", "payloads"):
+            cache = caches[alias]
+            key = f"benchmark:{name}"
+            cache.set(key, value, timeout=300)
+            latencies = []
+            for _ in range(reads):
+                start = time.perf_counter()
+                cache.get(key)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(
+                f"{name:<18} {alias:<9} {stored_bytes(alias, key):>8} "
+                f"{statistics.median(latencies) * 1e6:>7.0f}µs {p99 * 1e6:>7.0f}µs"
+            )
+            cache.delete(key)
+
+
+if __name__ == "__main__":
+    main()
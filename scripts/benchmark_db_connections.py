@@ -0,0 +1,105 @@
+"""
+Benchmark de perfiles de conexión a Postgres (DB_CONNECTION_PROFILE).
+
+Cada perfil corre en un subproceso con su propia configuración. Varios hilos
+simulan requests: unas cuantas consultas cortas y ``close_old_connections()``
+al terminar, como hace Django con ``request_finished``. Se mide la latencia
+por request (p50/p99) y cuántas sesiones nuevas abrió Postgres (churn, según
+``pg_stat_database.sessions``).
+
+- persistent: CONN_MAX_AGE=60 (configuración actual).
+- transaction: CONN_MAX_AGE=0, como detrás de un pooler en modo transacción;
+  sin el pooler delante, cada request abre una conexión contra Postgres.
+- pool: pool nativo de Django; requiere ``psycopg[binary,pool]`` instalado.
+
+Uso:
+    docker compose exec web python scripts/benchmark_db_connections.py [requests_por_hilo] [hilos]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROFILES = ("persistent", "transaction", "pool")
+QUERIES_PER_REQUEST = 3
+
+
+def run_profile(requests_per_thread, threads):
+    import django
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studiozens.settings')
+    django.setup()
+
+    from django.db import close_old_connections, connection
+
+    def sessions():
+        # La propia lectura abre una sesión; se descuenta al calcular el churn
+        with connection.cursor() as cursor:
+            time.sleep(1)  # las estadísticas se publican con un pequeño retraso
+            cursor.execute("SELECT pg_stat_clear_snapshot()")
+            cursor.execute(
+                "SELECT sessions FROM pg_stat_database WHERE datname = current_database()"
+            )
+            value = cursor.fetchone()[0]
+        connection.close()
+        return value
+
+    before = sessions()
+
+    def simulate(_):
+        latencies = []
+        for _ in range(requests_per_thread):
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                for _ in range(QUERIES_PER_REQUEST):
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            close_old_connections()
+            latencies.append(time.perf_counter() - start)
+        connection.close()
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(value for chunk in pool.map(simulate, range(threads)) for value in chunk)
+    if hasattr(connection, "close_pool"):
+        connection.close_pool()
+    opened = sessions() - before - 1
+
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{os.environ['DB_CONNECTION_PROFILE']:<12} {len(latencies):>8} "
+        f"{statistics.median(latencies) * 1000:>8.2f}ms {p99 * 1000:>8.2f}ms {opened:>10}"
+    )
+
+
+def main():
+    if os.environ.get("DB_CONNECTION_PROFILE") and "--child" in sys.argv:
+        run_profile(int(sys.argv[2]), int(sys.argv[3]))
+        return
+
+    requests_per_thread = sys.argv[1] if len(sys.argv) > 1 else "500"
+    threads = sys.argv[2] if len(sys.argv) > 2 else "4"
+    print(f"{'perfil':<12} {'requests':>8} {'p50':>10} {'p99':>10} {'conexiones':>10}")
+    for profile in PROFILES:
+        env = {**os.environ, "DB_CONNECTION_PROFILE": profile, "DB_POOL_MAX_SIZE_WEB": threads}
+        if profile == "persistent":
+            env["DB_CONN_MAX_AGE"] = "60"
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", requests_per_thread, threads],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "error"
+            print(f"{profile:<12} omitido: {error}")
+        else:
+            print(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark de serialización JSON: JSONRenderer de DRF vs FastJSONRenderer (orjson).
+
+Genera payloads con la forma de las respuestas grandes de la API (listado de
+citas, catálogo de servicios y dashboard de analytics), verifica que ambos
+renderers producen exactamente los mismos bytes y mide el tiempo de render y
+de parseo de cada uno.
+
+Uso:
+    docker compose exec web python scripts/benchmark_json.py [filas] [repeticiones]
+"""
+
+import io
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studiozens.settings')
+django.setup()
+
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.api.parsers import FastJSONParser
+from core.api.renderers import FastJSONRenderer
+
+NOW = datetime(2025, 3, 1, 14, 0, tzinfo=dt_timezone.utc)
+
+
+def appointments_payload(rows):
+    results = []
+    for index in range(rows):
+        start = NOW + timedelta(minutes=30 * index)
+        results.append({
+            "id": uuid.uuid4(),
+            "user": {"id": uuid.uuid4(), "first_name": "Ana", "last_name": "Pérez", "phone_number": "+573001234567"},
+            "staff_member": {"id": uuid.uuid4(), "first_name": "Laura", "last_name": "Gómez"},
+            "services": [
+                {"id": uuid.uuid4(), "name": "Masaje relajante", "duration": 60, "price": "150000.00"},
+                {"id": uuid.uuid4(), "name": "Exfoliación", "duration": 30, "price": "80000.00"},
+            ],
+            "start_time": start,
+            "end_time": start + timedelta(minutes=90),
+            "status": gettext_lazy("Confirmada"),
+            "price_at_purchase": Decimal("230000.00"),
+            "outstanding_balance": "0.00",
+            "reschedule_count": index % 3,
+            "created_at": NOW - timedelta(days=index % 30),
+        })
+    return {"count": rows, "next": None, "previous": None, "results": results}
+
+
+def catalog_payload(rows):
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Servicio {index}",
+            "description": "Tratamiento facial con productos orgánicos y masaje de cuello.",
+            "duration": 45 + index % 4 * 15,
+            "price": Decimal("120000.00") + index,
+            "vip_price": Decimal("99000.00") + index,
+            "is_active": True,
+            "category": {"id": uuid.uuid4(), "name": "Faciales", "is_low_supervision": index % 2 == 0},
+        }
+        for index in range(rows)
+    ]
+
+
+def analytics_payload(rows):
+    days = [date(2025, 1, 1) + timedelta(days=index) for index in range(rows)]
+    return {
+        "kpis": {
+            "conversion_rate": 0.4375,
+            "no_show_rate": 0.0625,
+            "total_revenue": Decimal("152340000.00"),
+            "average_ticket": Decimal("187500.50"),
+        },
+        "revenue_by_day": [{"date": day, "total": Decimal("1250000.00") + index} for index, day in enumerate(days)],
+        "appointments_by_day": [{"date": day, "count": index % 40} for index, day in enumerate(days)],
+        "top_services": [{"id": uuid.uuid4(), "name": f"Servicio {i}", "count": 100 - i} for i in range(20)],
+    }
+
+
+def measure(func, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    return (time.perf_counter() - start) / repetitions * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    payloads = {
+        "citas": appointments_payload(rows),
+        "catálogo": catalog_payload(rows),
+        "analytics": analytics_payload(rows),
+    }
+    print(f"{'payload':<10} {'bytes':>10} {'render DRF':>12} {'render orjson':>14} {'parse DRF':>11} {'parse orjson':>13}")
+    for label, data in payloads.items():
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+        body = stdlib.render(data)
+        if fast.render(data) != body:
+            raise SystemExit(f"{label}: la salida de FastJSONRenderer difiere de JSONRenderer")
+
+        render_stdlib = measure(lambda: stdlib.render(data), repetitions)
+        render_fast = measure(lambda: fast.render(data), repetitions)
+        parse_stdlib = measure(lambda: JSONParser().parse(io.BytesIO(body)), repetitions)
+        parse_fast = measure(lambda: FastJSONParser().parse(io.BytesIO(body)), repetitions)
+        print(
+            f"{label:<10} {len(body):>10} {render_stdlib:>10.2f}ms {render_fast:>12.2f}ms "
+            f"{parse_stdlib:>9.2f}ms {parse_fast:>11.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark de throttling DRF: historial en caché (DRF) vs ventana deslizante en Redis (Lua).
+
+Usa la caché/Redis configurada (REDIS_URL); sirve un Redis local o fakeredis.
+Cada throttle se evalúa para clientes distintos con un límite alto para que
+todas las llamadas hagan el trabajo completo, y luego se mide cuántos
+requests deja pasar cada implementación con un límite de 50 bajo concurrencia.
+
+Uso:
+    docker compose exec web python scripts/benchmark_throttling.py [requests] [hilos]
+"""
+
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studiozens.settings')
+django.setup()
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from core.api.throttling import RedisAnonRateThrottle
+
+factory = APIRequestFactory()
+
+
+def make_request(ip):
+    request = Request(factory.get("/", REMOTE_ADDR=ip))
+    request.user = SimpleNamespace(is_authenticated=False)
+    return request
+
+
+def make_throttle(cls, rate):
+    throttle = cls()
+    throttle.rate = rate
+    throttle.num_requests, throttle.duration = throttle.parse_rate(rate)
+    return throttle
+
+
+def throughput(label, cls, total, threads):
+    requests = [make_request(f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}") for i in range(total)]
+
+    def hit(request):
+        return make_throttle(cls, "100000/hour").allow_request(request, None)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(hit, requests))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {total / elapsed:9.1f} req/s  ({elapsed:.2f}s)")
+
+
+def admitted(label, cls, total, threads):
+    request = make_request(f"192.0.2.{uuid.uuid4().int % 250}")
+
+    def hit(_):
+        return make_throttle(cls, "50/hour").allow_request(request, None)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        allowed = sum(pool.map(hit, range(total)))
+    print(f"{label:<14} límite 50, {total} requests concurrentes: {allowed} admitidos")
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    throughput("DRF (caché)", AnonRateThrottle, total, threads)
+    throughput("Ventana (Lua)", RedisAnonRateThrottle, total, threads)
+    admitted("DRF (caché)", AnonRateThrottle, 500, threads)
+    admitted("Ventana (Lua)", RedisAnonRateThrottle, 500, threads)
+
+
+if __name__ == "__main__":
+    main()
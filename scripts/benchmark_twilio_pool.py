@@ -0,0 +1,102 @@
+"""
+Benchmark de envío de mensajes Twilio: cliente por mensaje vs cliente compartido.
+
+Levanta un servidor HTTP local que imita la API de Messages de Twilio y
+redirige allí las peticiones del SDK, así que no se envía nada real.
+
+Uso:
+    docker compose exec web python scripts/benchmark_twilio_pool.py [mensajes] [hilos]
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studiozens.settings')
+django.setup()
+
+from prometheus_client import REGISTRY
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+from core.infra.twilio_client import get_twilio_client
+
+TWILIO_API = "https://api.twilio.com"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        body = b'{"sid": "SMbenchmark", "status": "queued"}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def redirect_to_stub(http_client, stub_url):
+    original = http_client.request
+
+    def request(method, url, *args, **kwargs):
+        return original(method, url.replace(TWILIO_API, stub_url), *args, **kwargs)
+
+    http_client.request = request
+    return http_client
+
+
+def send(client):
+    client.messages.create(from_="whatsapp:+10000000000", to="whatsapp:+573000000000", body="benchmark")
+
+
+def run(label, client_factory, messages, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: send(client_factory()), range(messages)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {messages / elapsed:8.1f} msg/s  ({elapsed:.2f}s)")
+
+
+def main():
+    for name in ("twilio", "urllib3"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def fresh_client():
+        # Comportamiento anterior: cliente y conexión nuevos por mensaje
+        http_client = redirect_to_stub(TwilioHttpClient(pool_connections=False), stub_url)
+        return Client("ACbenchmark", "token", http_client=http_client)
+
+    shared = get_twilio_client("ACbenchmark", "token")
+    redirect_to_stub(shared.http_client, stub_url)
+
+    run("cliente por mensaje", fresh_client, messages, threads)
+    run("cliente compartido", lambda: shared, messages, threads)
+
+    opened = REGISTRY.get_sample_value("http_client_connections_opened_total", {"upstream": "twilio"})
+    requests_sent = REGISTRY.get_sample_value("http_client_requests_total", {"upstream": "twilio"})
+    print(f"conexiones abiertas por el pool: {opened:.0f} para {requests_sent:.0f} peticiones")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
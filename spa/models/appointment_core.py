@@ -77,7 +77,12 @@ class Appointment(BaseModel):
         return self.service_duration_minutes
 
     def get_service_names(self):
-        return ", ".join(item.service.name for item in self.items.select_related("service"))
+        # Respeta prefetch_related("items__service") para tareas que procesan lotes
+        if "items" in getattr(self, "_prefetched_objects_cache", {}):
+            items = self.items.all()
+        else:
+            items = self.items.select_related("service")
+        return ", ".join(item.service.name for item in items)
 
     # ACTION PERMISSIONS
     def can_reschedule(self, user) -> tuple[bool, str]:
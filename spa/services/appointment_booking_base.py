@@ -192,13 +192,10 @@ class AppointmentServiceBase:
             elif self.is_low_supervision_bundle:
                 self._enforce_low_supervision_capacity()
         finally:
-            if lock_key:
-                try:
-                    from django.core.cache import cache
+            if lock_key and acquired:
+                from core.utils.caching import release_lock
 
-                    cache.delete(lock_key)
-                except Exception:
-                    pass
+                release_lock(lock_key)
 
         total_price = Decimal("0")
         appointment_items = []
@@ -16,6 +16,18 @@ from notifications.services import NotificationService
 logger = logging.getLogger(__name__)
 
 
+def _reminder_context(appointment):
+    user = appointment.user
+    start_time_local = appointment.start_time.astimezone(timezone.get_current_timezone())
+    return {
+        "user_name": user.get_full_name() or user.first_name or "Cliente",
+        "start_date": start_time_local.strftime("%d de %B %Y"),
+        "start_time": start_time_local.strftime("%I:%M %p"),
+        "services": appointment.get_service_names(),
+        "total": f"{appointment.total:,.0f}" if hasattr(appointment, 'total') and appointment.total else "0",
+    }
+
+
 @shared_task
 def _send_reminder_for_appointment(appointment_id):
     """
@@ -30,24 +42,11 @@ def _send_reminder_for_appointment(appointment_id):
             logger.warning("Cita %s no tiene usuario asignado", appointment_id)
             return
 
-        # Preparar información de la cita
-        start_time_local = appointment.start_time.astimezone(timezone.get_current_timezone())
-        services = appointment.get_service_names()
-
-        # Preparar contexto para NotificationService
-        context = {
-            "user_name": user.get_full_name() or user.first_name or "Cliente",
-            "start_date": start_time_local.strftime("%d de %B %Y"),
-            "start_time": start_time_local.strftime("%I:%M %p"),
-            "services": services,
-            "total": f"{appointment.total:,.0f}" if hasattr(appointment, 'total') and appointment.total else "0",
-        }
-
         # Enviar notificación usando el sistema centralizado
         NotificationService.send_notification(
             user=user,
             event_code="APPOINTMENT_REMINDER_24H",
-            context=context,
+            context=_reminder_context(appointment),
             priority="high"
         )
 
@@ -62,7 +61,10 @@ def _send_reminder_for_appointment(appointment_id):
 @shared_task
 def send_appointment_reminder():
     """
-    Tarea periódica que programa recordatorios para las citas en las próximas 24 horas.
+    Tarea periódica que envía recordatorios para las citas en las próximas 24 horas.
+
+    Usa NotificationService.send_bulk: el número de consultas no depende
+    de la cantidad de citas.
     """
     now = timezone.now()
     reminder_start_time = now + timedelta(hours=24)
@@ -75,14 +77,20 @@ def send_appointment_reminder():
             Appointment.AppointmentStatus.RESCHEDULED,
             Appointment.AppointmentStatus.FULLY_PAID,
         ],
+        user__isnull=False,
+    ).select_related("user").prefetch_related("items__service")
+
+    recipients = [
+        (appointment.user, _reminder_context(appointment))
+        for appointment in appointments
+    ]
+    logs = NotificationService.send_bulk(
+        "APPOINTMENT_REMINDER_24H",
+        recipients,
+        priority="high",
     )
-    for appointment in appointments:
-        _send_reminder_for_appointment.delay(str(appointment.id))
-    logger.info("Se programaron %s recordatorios de citas.",
-                appointments.count())
-
-
-
+    logger.info("Se enviaron %s recordatorios de citas (%s citas).", len(logs), len(recipients))
+    return len(logs)
 
 
 @shared_task
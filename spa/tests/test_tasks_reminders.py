@@ -0,0 +1,58 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
+
+from notifications.models import NotificationLog, NotificationTemplate
+from notifications.services import NotificationService
+from spa.models import Appointment, AppointmentItem, Service
+from spa.tasks import send_appointment_reminder
+
+
+def _make_appointments(count):
+    start = timezone.now() + timedelta(hours=24, minutes=30)
+    service = baker.make(Service, name="Masaje")
+    appointments = []
+    for _ in range(count):
+        appointment = baker.make(
+            Appointment,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            status=Appointment.AppointmentStatus.CONFIRMED,
+        )
+        baker.make(AppointmentItem, appointment=appointment, service=service)
+        appointments.append(appointment)
+    return appointments
+
+
+def _run_reminders():
+    with CaptureQueriesContext(connection) as ctx, patch("notifications.services.group"):
+        sent = send_appointment_reminder()
+    return sent, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_send_appointment_reminder_uses_constant_queries():
+    NotificationTemplate.objects.create(
+        event_code="APPOINTMENT_REMINDER_24H",
+        channel=NotificationTemplate.ChannelChoices.WHATSAPP,
+        body_template="Hola {{ user_name }}: {{ services }} el {{ start_date }}",
+        is_active=True,
+    )
+    NotificationService._get_templates("APPOINTMENT_REMINDER_24H")
+    _make_appointments(2)
+    sent_few, queries_few = _run_reminders()
+
+    _make_appointments(30)
+    sent_many, queries_many = _run_reminders()
+
+    assert sent_few == 2
+    assert sent_many == 32
+    assert queries_many == queries_few
+    bodies = NotificationLog.objects.values_list("payload__body", flat=True)
+    assert len(bodies) == 34
+    assert all("Masaje" in body for body in bodies)
@@ -1,10 +1,16 @@
 # studiozens_project/studiozens/celery.py
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 
 # Establece el módulo de configuración de Django para el programa 'celery'.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studiozens.settings')
 
+# Modo multiproceso de prometheus_client (solo el worker lo define): el
+# directorio debe existir antes de que se cree cualquier métrica.
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
 app = Celery('studiozens')
 
 # Usa una cadena aquí para que el worker no tenga que serializar
@@ -15,3 +21,28 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Carga automáticamente los módulos de tasks.py de todas las apps registradas en Django.
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def _reset_http_pools(**kwargs):
+    """Cada proceso hijo abre sus propias conexiones HTTP (Twilio, Wompi)."""
+    from core.infra.http_pool import ProcessLocalRegistry
+
+    ProcessLocalRegistry.forget_all()
+
+
+@worker_init.connect
+def _start_metrics_exporter(**kwargs):
+    """Expone las métricas de las tareas (procesos hijos) en WORKER_METRICS_PORT."""
+    from django.conf import settings
+
+    from core.infra.metrics import start_multiprocess_exporter
+
+    start_multiprocess_exporter(getattr(settings, 'WORKER_METRICS_PORT', None))
+
+
+@worker_process_shutdown.connect
+def _forget_process_metrics(pid=None, **kwargs):
+    from core.infra.metrics import mark_process_dead
+
+    mark_process_dead(pid or os.getpid())
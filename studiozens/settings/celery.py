@@ -37,6 +37,10 @@ CELERY_TASK_SOFT_TIME_LIMIT = int(os.getenv("CELERY_TASK_SOFT_TIME_LIMIT", "100"
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_WORKER_MAX_TASKS_PER_CHILD = int(os.getenv("CELERY_WORKER_MAX_TASKS_PER_CHILD", "500"))
 
+# Endpoint de métricas del worker (solo si PROMETHEUS_MULTIPROC_DIR está definido):
+# publica lo que registran las tareas en los procesos hijos.
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "9540"))
+
 # Rutas de tareas a colas dedicadas
 CELERY_TASK_ROUTES = {
     "finances.tasks.run_developer_payout": {"queue": "payments"},
@@ -72,6 +76,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "finances.tasks.check_pending_payments",
         "schedule": crontab(minute="*/15"),
     },
+    "refresh-wompi-reference-data-every-15-minutes": {
+        "task": "finances.tasks.refresh_wompi_reference_data",
+        "schedule": crontab(minute="*/15"),
+    },
     "process-recurring-vip-subscriptions-daily": {
         "task": "finances.tasks.process_recurring_subscriptions",
         "schedule": crontab(minute=0, hour=2),
@@ -80,6 +88,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "finances.tasks.downgrade_expired_vips",
         "schedule": crontab(minute=30, hour=2),
     },
+    "expire-client-credits-daily": {
+        "task": "finances.tasks.expire_client_credits",
+        "schedule": crontab(minute=5, hour=0),
+    },
     # Tareas del bot
     "bot-daily-token-report": {
         "task": "bot.tasks.report_daily_token_usage",
@@ -123,6 +135,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "marketplace.tasks.cleanup_expired_carts",
         "schedule": crontab(minute=0, hour="*"),
     },
+    "low-stock-digest-every-15-minutes": {
+        "task": "marketplace.tasks.send_low_stock_digest",
+        "schedule": crontab(minute="*/15"),
+    },
     "cleanup-webhook-events": {
         "task": "finances.tasks.cleanup_old_webhook_events",
         "schedule": crontab(hour=3, minute=15, day_of_week=0),  # Domingos a las 3:15 AM
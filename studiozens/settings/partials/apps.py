@@ -39,6 +39,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django_prometheus.middleware.PrometheusBeforeMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Perfil SQL/caché por muestreo (REQUEST_PROFILER_SAMPLE_RATE, 0 = apagado)
+    "core.infra.middleware.RequestProfilerMiddleware",
     # CORS antes de CommonMiddleware
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -5,29 +5,69 @@ from .core import DEBUG
 # --------------------------------------------------------------------------------------
 # Caché (Redis)
 # --------------------------------------------------------------------------------------
-# STUDIOZENS-OPS-REDIS-TLS: Validar Redis TLS en producción
+# Tres alias según la carga de trabajo:
+# default   claves pequeñas y calientes: throttles, configuración, sesiones, OTP, versiones.
+# payloads  resultados grandes ya calculados (analytics, contexto del bot). Comprime con
+#           zlib a partir de CACHE_COMPRESS_MIN_BYTES.
+# locks     candados efímeros (SETNX con TTL corto).
+# Por defecto comparten servidor (separados por KEY_PREFIX); REDIS_PAYLOAD_URL y
+# REDIS_LOCKS_URL permiten darles instancias con su propia política de expiración
+# (p. ej. allkeys-lru para payloads y noeviction para locks).
 REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/1")
+REDIS_PAYLOAD_URL = os.getenv("REDIS_PAYLOAD_URL", REDIS_URL)
+REDIS_LOCKS_URL = os.getenv("REDIS_LOCKS_URL", REDIS_URL)
+
+# STUDIOZENS-OPS-REDIS-TLS: Validar Redis TLS en producción
 if not DEBUG:
-    if not REDIS_URL.startswith("rediss://"):
-        raise RuntimeError(
-            "REDIS_URL debe usar rediss:// (TLS) en producción. "
-            f"URL actual: {REDIS_URL.split('@')[-1] if '@' in REDIS_URL else REDIS_URL}"
-        )
+    for _url in {REDIS_URL, REDIS_PAYLOAD_URL, REDIS_LOCKS_URL}:
+        if not _url.startswith("rediss://"):
+            raise RuntimeError(
+                "REDIS_URL debe usar rediss:// (TLS) en producción. "
+                f"URL actual: {_url.split('@')[-1] if '@' in _url else _url}"
+            )
+
+_REDIS_OPTIONS = {
+    "CLIENT_CLASS": "core.infra.cache_backends.InstrumentedRedisClient",
+    # CRÍTICO: Ignorar excepciones para evitar que requests se cuelguen
+    # si Redis está lento o temporalmente no disponible
+    "IGNORE_EXCEPTIONS": True,
+    "SOCKET_CONNECT_TIMEOUT": 5,  # segundos
+    "SOCKET_TIMEOUT": 5,
+}
 
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": REDIS_URL,
+        "OPTIONS": {**_REDIS_OPTIONS, "METRICS_ALIAS": "default"},
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
+    },
+    "payloads": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_PAYLOAD_URL,
+        "KEY_PREFIX": "payload",
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            # CRÍTICO: Ignorar excepciones para evitar que requests se cuelguen
-            # si Redis está lento o temporalmente no disponible
-            "IGNORE_EXCEPTIONS": True,
-            "SOCKET_CONNECT_TIMEOUT": 5,  # segundos
-            "SOCKET_TIMEOUT": 5,
+            **_REDIS_OPTIONS,
+            "METRICS_ALIAS": "payloads",
+            "COMPRESSOR": "core.infra.cache_backends.ThresholdZlibCompressor",
+            "COMPRESS_MIN_LENGTH": int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024")),
+            "COMPRESS_LEVEL": int(os.getenv("CACHE_COMPRESS_LEVEL", "1")),
         },
-        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
-    }
+        "TIMEOUT": int(os.getenv("CACHE_PAYLOAD_TIMEOUT", "1800")),
+    },
+    "locks": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_LOCKS_URL,
+        "KEY_PREFIX": "locks",
+        "OPTIONS": {
+            **_REDIS_OPTIONS,
+            "METRICS_ALIAS": "locks",
+            # Un candado que no responde rápido se considera no adquirido
+            "SOCKET_CONNECT_TIMEOUT": 2,
+            "SOCKET_TIMEOUT": 2,
+        },
+        "TIMEOUT": 60,
+    },
 }
 # Usar cached_db para mayor resiliencia: guarda en DB, cachea en Redis
 SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
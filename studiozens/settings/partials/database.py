@@ -1,4 +1,5 @@
 import os
+import sys
 from urllib.parse import quote_plus
 
 import dj_database_url
@@ -63,3 +64,73 @@ else:
             "client_encoding": "UTF8",
         },
     }
+
+# --------------------------------------------------------------------------------------
+# Perfil de gestión de conexiones (DB_CONNECTION_PROFILE)
+# --------------------------------------------------------------------------------------
+# persistent  (defecto) una conexión persistente por hilo con CONN_MAX_AGE y health checks.
+# pool        pool nativo de Django sobre psycopg 3 (requiere ``psycopg[binary,pool]``):
+#             conexiones reutilizadas entre requests, tamaño acotado por tipo de proceso
+#             y verificación de cada conexión al entregarla.
+# transaction pooler externo en modo transacción (PgBouncer/Supavisor): sin conexiones
+#             persistentes ni cursores del lado del servidor; ``core.utils.iter_queryset``
+#             pagina por pk en lugar de usar ``.iterator()``.
+DB_CONNECTION_PROFILE = os.getenv("DB_CONNECTION_PROFILE", "persistent")
+DB_PROCESS_TYPE = os.getenv("DB_PROCESS_TYPE") or (
+    "worker" if os.path.basename(sys.argv[0] if sys.argv else "") == "celery" else "web"
+)
+
+if DB_CONNECTION_PROFILE == "pool":
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "DB_CONNECTION_PROFILE=pool requiere psycopg 3 con pool: pip install 'psycopg[binary,pool]'"
+        ) from exc
+
+    # Cada worker de gunicorn y cada hijo prefork de Celery tiene su propio pool:
+    # el máximo por proceso multiplicado por los procesos debe caber en max_connections.
+    _pool_max_size = int(os.getenv(
+        f"DB_POOL_MAX_SIZE_{DB_PROCESS_TYPE.upper()}",
+        "2" if DB_PROCESS_TYPE == "worker" else "4",
+    ))
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # Django no admite pool + conexiones persistentes
+    # Con pool, Django traduce CONN_HEALTH_CHECKS en ConnectionPool.check_connection
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": min(int(os.getenv("DB_POOL_MIN_SIZE", "1")), _pool_max_size),
+        "max_size": _pool_max_size,
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),  # espera máxima por una conexión
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    }
+elif DB_CONNECTION_PROFILE == "transaction":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+elif DB_CONNECTION_PROFILE != "persistent":
+    raise RuntimeError(
+        f"DB_CONNECTION_PROFILE inválido: {DB_CONNECTION_PROFILE!r} "
+        "(usa persistent, pool o transaction)"
+    )
+
+# --------------------------------------------------------------------------------------
+# Réplica de lectura (opcional)
+# --------------------------------------------------------------------------------------
+# Con DATABASE_REPLICA_URL se añade el alias ``replica``: mismas opciones que ``default``
+# (perfil de conexión incluido) contra el host de la réplica. Solo lo que corre dentro de
+# ``core.infra.db_routing.using_replica()`` lee de ella (analytics y exportaciones).
+DATABASE_ROUTERS = ["core.infra.db_routing.ReplicaRouter"]
+
+if os.getenv("DATABASE_REPLICA_URL"):
+    _replica = dj_database_url.parse(os.environ["DATABASE_REPLICA_URL"])
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        **{key: _replica[key] for key in ("NAME", "USER", "PASSWORD", "HOST", "PORT") if _replica.get(key)},
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        # En tests apunta a la base de test de ``default`` en lugar de crear otra
+        "TEST": {"MIRROR": "default"},
+    }
+
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "30"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "10"))
+REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", "5"))
@@ -3,17 +3,27 @@ from .rest_framework import REST_FRAMEWORK
 
 # --------------------------------------------------------------------------------------
 # DRF Browsable API solo en debug
+# JSON con orjson; mismos bytes que rest_framework.renderers.JSONRenderer
 # --------------------------------------------------------------------------------------
 if DEBUG:
     REST_FRAMEWORK.setdefault(
         "DEFAULT_RENDERER_CLASSES",
         (
-            "rest_framework.renderers.JSONRenderer",
+            "core.api.renderers.FastJSONRenderer",
             "rest_framework.renderers.BrowsableAPIRenderer",
         ),
     )
 else:
     REST_FRAMEWORK.setdefault(
         "DEFAULT_RENDERER_CLASSES",
-        ("rest_framework.renderers.JSONRenderer",),
+        ("core.api.renderers.FastJSONRenderer",),
     )
+
+REST_FRAMEWORK.setdefault(
+    "DEFAULT_PARSER_CLASSES",
+    (
+        "core.api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+)
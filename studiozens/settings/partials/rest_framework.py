@@ -5,12 +5,13 @@ import os
 # --------------------------------------------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # Igual que PageNumberPagination; ?cursor= activa la paginación keyset
+    "DEFAULT_PAGINATION_CLASS": "core.api.pagination.KeysetCursorPagination",
     "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "20")),
     # STUDIOZENS-API-VERSIONING: Versionado de API
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.NamespaceVersioning",
@@ -18,10 +19,11 @@ REST_FRAMEWORK = {
     "ALLOWED_VERSIONS": ["v1"],
     "VERSION_PARAM": "version",
     # Throttling básico de sentido común. Ajusta según tus endpoints críticos.
+    # Mismos límites que las clases de DRF, evaluados con una ventana deslizante atómica en Redis
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.ScopedRateThrottle",
+        "core.api.throttling.RedisUserRateThrottle",
+        "core.api.throttling.RedisAnonRateThrottle",
+        "core.api.throttling.RedisScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "user": os.getenv("THROTTLE_USER", "1000/min"),
@@ -6,6 +6,15 @@ from .core import BASE_DIR
 # Performance Monitoring
 # --------------------------------------------------------------------------------------
 SLOW_REQUEST_THRESHOLD = float(os.getenv("SLOW_REQUEST_THRESHOLD", "1.0"))  # segundos
+# Fracción de requests con perfil SQL/caché (core.infra.middleware.RequestProfilerMiddleware)
+REQUEST_PROFILER_SAMPLE_RATE = float(os.getenv("REQUEST_PROFILER_SAMPLE_RATE", "0"))
+REQUEST_PROFILER_DUPLICATE_THRESHOLD = int(os.getenv("REQUEST_PROFILER_DUPLICATE_THRESHOLD", "10"))
+
+# Auditoría de endpoints admin/analytics por lotes (core.infra.audit_sink)
+AUDIT_ASYNC_ENABLED = os.getenv("AUDIT_ASYNC_ENABLED", "1") in ("1", "true", "True")
+AUDIT_BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "2.0"))  # segundos
 
 ROOT_URLCONF = "studiozens.urls"
 
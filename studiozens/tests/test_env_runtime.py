@@ -203,7 +203,8 @@ def test_rest_framework_renderers_toggle_by_debug(monkeypatch):
     prod_module = _run_settings(monkeypatch, _prod_env())
 
     assert "rest_framework.renderers.BrowsableAPIRenderer" in debug_module["REST_FRAMEWORK"]["DEFAULT_RENDERER_CLASSES"]
-    assert prod_module["REST_FRAMEWORK"]["DEFAULT_RENDERER_CLASSES"] == ("rest_framework.renderers.JSONRenderer",)
+    assert prod_module["REST_FRAMEWORK"]["DEFAULT_RENDERER_CLASSES"] == ("core.api.renderers.FastJSONRenderer",)
+    assert prod_module["REST_FRAMEWORK"]["DEFAULT_PARSER_CLASSES"][0] == "core.api.parsers.FastJSONParser"
 
 
 def test_cors_allow_credentials_defaults_false_on_prod(monkeypatch):
@@ -75,9 +75,9 @@ class RateLimitingTests(TestCase):
         """Clases de throttling deben estar configuradas"""
         throttle_classes = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_CLASSES', [])
         self.assertGreater(len(throttle_classes), 0)
-        self.assertIn('rest_framework.throttling.UserRateThrottle', throttle_classes)
-        self.assertIn('rest_framework.throttling.AnonRateThrottle', throttle_classes)
-        self.assertIn('rest_framework.throttling.ScopedRateThrottle', throttle_classes)
+        self.assertIn('core.api.throttling.RedisUserRateThrottle', throttle_classes)
+        self.assertIn('core.api.throttling.RedisAnonRateThrottle', throttle_classes)
+        self.assertIn('core.api.throttling.RedisScopedRateThrottle', throttle_classes)
     
     def test_user_rate_limit_is_restrictive(self):
         """Rate limit de usuarios debe ser restrictivo"""
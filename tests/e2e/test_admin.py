@@ -182,7 +182,7 @@ def test_export_users_csv(api_client, admin_user, client_user):
         pytest.skip("Endpoint de export no disponible")
     assert resp.status_code == status.HTTP_200_OK
     assert "text/csv" in resp["Content-Type"]
-    assert client_user.phone_number in resp.content.decode()
+    assert client_user.phone_number in b"".join(resp.streaming_content).decode()
 
 
 def test_commission_status_endpoint(api_client, admin_user, monkeypatch):
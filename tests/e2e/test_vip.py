@@ -12,6 +12,7 @@ from core.models import AuditLog, GlobalSettings
 from finances.models import Payment, SubscriptionLog
 from finances.payments import PaymentService
 from finances.tasks import (
+    charge_vip_renewal,
     downgrade_expired_vips,
     process_recurring_subscriptions,
 )
@@ -23,6 +24,16 @@ from users.models import CustomUser
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def inline_vip_charges(monkeypatch):
+    """Los cobros que encola el planificador VIP se ejecutan en línea."""
+    monkeypatch.setattr(
+        charge_vip_renewal,
+        "apply_async",
+        lambda args=None, kwargs=None, **options: charge_vip_renewal.apply(args=args, kwargs=kwargs),
+    )
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -118,11 +129,11 @@ def test_recurring_subscription_success(api_client, client_user, monkeypatch):
     monkeypatch.setattr(
         PaymentService,
         "charge_recurrence_token",
-        staticmethod(lambda user, amount, token: (Payment.PaymentStatus.APPROVED, {"id": "TRX", "status": "APPROVED"}, "REF-OK")),
+        staticmethod(lambda user, amount, token, reference=None: (Payment.PaymentStatus.APPROVED, {"id": "TRX", "status": "APPROVED"}, "REF-OK")),
     )
 
     result = process_recurring_subscriptions()
-    assert "Renovaciones intentadas" in str(result)
+    assert "Renovaciones programadas: 1" in str(result)
 
     client_user.refresh_from_db()
     assert client_user.vip_failed_payments == 0
@@ -144,7 +155,7 @@ def test_recurring_subscription_failure_increments_counter(monkeypatch, client_u
     monkeypatch.setattr(
         PaymentService,
         "charge_recurrence_token",
-        staticmethod(lambda user, amount, token: (Payment.PaymentStatus.DECLINED, {"status": "DECLINED"}, "REF-FAIL")),
+        staticmethod(lambda user, amount, token, reference=None: (Payment.PaymentStatus.DECLINED, {"status": "DECLINED"}, "REF-FAIL")),
     )
 
     notified = {}
@@ -178,7 +189,7 @@ def test_recurring_subscription_cancel_after_three_failures(monkeypatch, client_
     monkeypatch.setattr(
         PaymentService,
         "charge_recurrence_token",
-        staticmethod(lambda user, amount, token: (Payment.PaymentStatus.DECLINED, {"status": "DECLINED"}, "REF-FAIL")),
+        staticmethod(lambda user, amount, token, reference=None: (Payment.PaymentStatus.DECLINED, {"status": "DECLINED"}, "REF-FAIL")),
     )
 
     process_recurring_subscriptions()
@@ -0,0 +1,132 @@
+"""
+Autenticación JWT con caché del usuario.
+
+``JWTAuthentication.get_user`` de simplejwt consulta ``CustomUser`` en cada
+request autenticada. ``CachedJWTAuthentication`` guarda el usuario en la
+caché ``default`` durante ``AUTH_USER_CACHE_TIMEOUT`` segundos, indexado por
+el claim del token (``phone_number``).
+
+Cada entrada lleva la versión del usuario con la que se construyó; la versión
+vive en otra clave y se lee en el mismo ``MGET``. Invalidar es incrementar la
+versión (``AuthUserCache.invalidate``), de modo que una request que cargó el
+usuario antes del cambio no puede dejar una entrada vieja válida. Las señales
+de ``users.signals`` invalidan en cada guardado o borrado de ``CustomUser``
+(rol, VIP, contraseña, bloqueo, soft-delete) y otra vez al confirmar la
+transacción.
+
+El hash de la contraseña no se guarda: el usuario se carga con
+``defer("password")`` y se lee de la base solo si alguna vista lo necesita.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.infra.metrics import get_counter
+
+logger = logging.getLogger(__name__)
+
+auth_user_cache_lookups = get_counter(
+    "auth_user_cache_lookups_total",
+    "Resolución del usuario del JWT por resultado de la caché",
+    ["result"],
+)
+
+
+class AuthUserCache:
+    """Entradas versionadas del usuario autenticado."""
+
+    KEY_PREFIX = "auth:user:v1"
+    # La versión debe sobrevivir a cualquier entrada construida con ella
+    VERSION_TIMEOUT = 60 * 60 * 24
+
+    @classmethod
+    def timeout(cls):
+        return getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60)
+
+    @classmethod
+    def _keys(cls, user_id):
+        return f"{cls.KEY_PREFIX}:{user_id}", f"{cls.KEY_PREFIX}:{user_id}:version"
+
+    @classmethod
+    def get(cls, user_id):
+        """Devuelve ``(usuario | None, versión actual)`` en una sola ida a Redis."""
+        entry_key, version_key = cls._keys(user_id)
+        try:
+            values = cache.get_many([entry_key, version_key])
+        except Exception:
+            return None, None
+        version = values.get(version_key, 0)
+        entry = values.get(entry_key)
+        if entry and entry.get("version") == version:
+            return entry["user"], version
+        return None, version
+
+    @classmethod
+    def store(cls, user_id, user, version):
+        if version is None:
+            return
+        try:
+            cache.set(cls._keys(user_id)[0], {"version": version, "user": user}, timeout=cls.timeout())
+        except Exception as exc:
+            logger.warning("No se pudo cachear el usuario autenticado %s: %s", user_id, exc)
+
+    @classmethod
+    def invalidate(cls, *user_ids):
+        for user_id in {user_id for user_id in user_ids if user_id}:
+            entry_key, version_key = cls._keys(user_id)
+            try:
+                try:
+                    cache.incr(version_key)
+                except ValueError:
+                    cache.set(version_key, 1, timeout=cls.VERSION_TIMEOUT)
+                cache.delete(entry_key)
+            except Exception as exc:
+                logger.warning("No se pudo invalidar el usuario cacheado %s: %s", user_id, exc)
+
+    @classmethod
+    def invalidate_user(cls, user, *previous_ids):
+        """Invalida ahora y de nuevo al confirmar la transacción en curso."""
+        user_ids = (getattr(user, api_settings.USER_ID_FIELD, None), *previous_ids)
+        cls.invalidate(*user_ids)
+        transaction.on_commit(lambda: cls.invalidate(*user_ids))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` que resuelve el usuario desde ``AuthUserCache``."""
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # La verificación necesita el hash de la contraseña: sin caché
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user, version = AuthUserCache.get(user_id)
+        if user is not None:
+            auth_user_cache_lookups.labels(result="hit").inc()
+        else:
+            auth_user_cache_lookups.labels(result="miss").inc()
+            try:
+                user = self.user_model.objects.defer("password").get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            AuthUserCache.store(user_id, user, version)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+
+__all__ = ["AuthUserCache", "CachedJWTAuthentication"]
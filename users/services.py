@@ -6,8 +6,8 @@ from typing import Optional
 import requests
 from django.conf import settings
 from twilio.base.exceptions import TwilioRestException
-from twilio.rest import Client
 
+from core.infra.twilio_client import get_twilio_client
 from core.utils.exceptions import BusinessLogicError
 
 logger = logging.getLogger(__name__)
@@ -87,7 +87,7 @@ class TwilioService:
         if not all([self.account_sid, self.auth_token]):
             raise ValueError(
                 "El SID de la cuenta y el Token de autenticación de Twilio deben estar configurados.")
-        self.client = Client(self.account_sid, self.auth_token)
+        self.client = get_twilio_client(self.account_sid, self.auth_token)
 
     def _call_with_breaker(self, func):
         try:
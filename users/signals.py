@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver, Signal
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -8,6 +8,7 @@ import logging
 from core.models import AuditLog
 from core.utils import safe_audit_log
 
+from .authentication import AuthUserCache
 from .models import UserSession
 
 CustomUser = get_user_model()
@@ -133,5 +134,17 @@ def stash_old_role(sender, instance, **kwargs):
     try:
         previous = sender.objects.get(pk=instance.pk)
         instance._old_role = previous.role
+        instance._old_phone_number = previous.phone_number
     except sender.DoesNotExist:
         instance._old_role = None
+        instance._old_phone_number = None
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_auth_user_cache(sender, instance, **kwargs):
+    """
+    Invalida el usuario cacheado por ``CachedJWTAuthentication`` en cualquier
+    cambio (rol, VIP, contraseña, bloqueo, soft-delete), también bajo el
+    teléfono anterior si cambió.
+    """
+    AuthUserCache.invalidate_user(instance, getattr(instance, "_old_phone_number", None))
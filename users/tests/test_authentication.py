@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import AuthUserCache, CachedJWTAuthentication
+from users.models import CustomUser
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return CustomUser.objects.create_user(
+        phone_number="+573001234567", password="pass1234", role=CustomUser.Role.CLIENT
+    )
+
+
+def _authenticate(user):
+    auth = CachedJWTAuthentication()
+    return auth.get_user(auth.get_validated_token(str(AccessToken.for_user(user))))
+
+
+def _user_queries(captured):
+    return [q for q in captured.captured_queries if "users_customuser" in q["sql"]]
+
+
+def test_second_request_resolves_user_without_query(user):
+    with CaptureQueriesContext(connection) as first:
+        assert _authenticate(user).pk == user.pk
+    with CaptureQueriesContext(connection) as second:
+        cached = _authenticate(user)
+
+    assert len(_user_queries(first)) == 1
+    assert _user_queries(second) == []
+    assert cached.pk == user.pk
+    assert "password" in cached.get_deferred_fields()
+
+
+def test_role_change_invalidates_cached_user(user):
+    _authenticate(user)
+    user.role = CustomUser.Role.VIP
+    user.save()
+
+    assert _authenticate(user).role == CustomUser.Role.VIP
+
+
+def test_blocked_user_is_rejected_after_change(user):
+    _authenticate(user)
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+
+    with pytest.raises(AuthenticationFailed):
+        _authenticate(user)
+
+
+def test_phone_change_invalidates_previous_identifier(user):
+    old_token = str(AccessToken.for_user(user))
+    auth = CachedJWTAuthentication()
+    auth.get_user(auth.get_validated_token(old_token))
+
+    user.phone_number = "+573009998877"
+    user.save()
+
+    with pytest.raises(AuthenticationFailed):
+        auth.get_user(auth.get_validated_token(old_token))
+
+
+def test_entry_built_before_invalidation_is_not_served(user):
+    cached, version = AuthUserCache.get(user.phone_number)
+    assert cached is None
+
+    AuthUserCache.invalidate(user.phone_number)
+    # Una request lenta guarda lo que leyó antes del cambio
+    AuthUserCache.store(user.phone_number, user, version)
+
+    assert AuthUserCache.get(user.phone_number)[0] is None
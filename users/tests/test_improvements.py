@@ -8,6 +8,7 @@ from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from users.models import CustomUser, BlockedDevice
+from users.serializers import UserExportSerializer
 from users.services import TOTPService, GeoIPService
 from users.views import (
     TOTPSetupView, TOTPVerifyView, UserExportView,
@@ -16,6 +17,7 @@ from users.views import (
 import time
 import csv
 import io
+import json
 from unittest.mock import patch
 
 class TOTPServiceTests(TestCase):
@@ -115,49 +117,53 @@ class UserExportViewTests(TestCase):
         self.user1 = CustomUser.objects.create_user(phone_number="+573001111111", password="pw")
         self.user2 = CustomUser.objects.create_user(phone_number="+573002222222", password="pw")
 
-    @pytest.mark.skip(reason="URL routing issue - 404 during testing despite correct configuration. Needs investigation.")
     def test_export_csv(self):
-        try:
-            url = reverse('user-export')
-            print(f"Resolved URL: {url}")
-        except Exception as e:
-            print(f"URL Resolution Error: {e}")
-            url = '/api/v1/auth/admin/export/'
-
+        url = reverse('user-export')
         self.client.force_authenticate(user=self.admin)
-        response = self.client.get(f"{url}?format=csv")
-        
-        if response.status_code != 200:
-            print(f"Response Status: {response.status_code}")
-            print(f"Response Content: {getattr(response, 'data', response.content)}")
-        
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response['Content-Type'], 'text/csv')
-        
-        content = response.content.decode('utf-8')
-        reader = csv.reader(io.StringIO(content))
-        rows = list(reader)
-        
-        self.assertEqual(rows[0], ['ID', 'Phone', 'Email', 'First Name', 'Last Name', 'Role', 'Status', 'Created At'])
-        self.assertGreaterEqual(len(rows), 3)  # Header + 3 users
-        
+        response = self.client.get(url, {'format': 'csv'})
+
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response['Content-Type'], 'text/csv')
-        
-        content = response.content.decode('utf-8')
-        reader = csv.reader(io.StringIO(content))
-        rows = list(reader)
-        
+        self.assertTrue(response.streaming)
+
+        content = b"".join(response.streaming_content).decode('utf-8')
+        rows = list(csv.reader(io.StringIO(content)))
+
         self.assertEqual(rows[0], ['ID', 'Phone', 'Email', 'First Name', 'Last Name', 'Role', 'Status', 'Created At'])
-        self.assertTrue(any(row[1] == "+573001111111" for row in rows))
+        self.assertEqual(len(rows), 4)  # Header + 3 users
+        self.assertTrue(any(row[1] == "+573001111111" and row[6] == "Active" for row in rows))
+
+    def test_export_csv_marks_persona_non_grata(self):
+        self.user1.is_persona_non_grata = True
+        self.user1.save(update_fields=['is_persona_non_grata'])
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('user-export'), {'format': 'csv'})
+
+        content = b"".join(response.streaming_content).decode('utf-8')
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertTrue(any(row[1] == "+573001111111" and row[6] == "CNG" for row in rows))
 
-    @pytest.mark.skip(reason="Same URL routing issue as test_export_csv")
     def test_export_json_default(self):
         self.client.force_authenticate(user=self.admin)
-        response = self.client.get('/api/v1/auth/admin/export/')
+        response = self.client.get(reverse('user-export'))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(len(response.data) >= 3)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(list(response.data[0].keys()), UserExportSerializer.Meta.fields)
+
+    def test_export_ndjson_streams_serializer_fields(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('user-export'), {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b"".join(response.streaming_content).decode('utf-8').splitlines()
+        records = [json.loads(line) for line in lines]
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(list(records[0].keys()), UserExportSerializer.Meta.fields)
+        self.assertTrue(all(record['status'] == "Activo" for record in records))
 
     def test_export_throttling(self):
         # Skip throttling test for now as it requires complex cache setup
@@ -325,7 +325,7 @@ class VerifySMSAdditionalTests(TestCase):
 @override_settings(TWILIO_ACCOUNT_SID="AC123", TWILIO_AUTH_TOKEN="token", TWILIO_VERIFY_SERVICE_SID="VSID")
 class TwilioCircuitBreakerTests(TestCase):
     def setUp(self):
-        client_patcher = patch("users.services.Client")
+        client_patcher = patch("users.services.get_twilio_client")
         self.mock_client_cls = client_patcher.start()
         self.addCleanup(client_patcher.stop)
         self.mock_client = MagicMock()
@@ -384,7 +384,7 @@ class TwilioCircuitBreakerTests(TestCase):
 @override_settings(TWILIO_ACCOUNT_SID="AC123", TWILIO_AUTH_TOKEN="token", TWILIO_VERIFY_SERVICE_SID="VSID")
 class TwilioServiceSuccessTests(TestCase):
     def setUp(self):
-        client_patcher = patch("users.services.Client")
+        client_patcher = patch("users.services.get_twilio_client")
         self.mock_client_cls = client_patcher.start()
         self.addCleanup(client_patcher.stop)
         # Reset circuit breaker
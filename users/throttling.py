@@ -1,4 +1,4 @@
-from rest_framework.throttling import UserRateThrottle
+from core.api.throttling import RedisUserRateThrottle
 
-class AdminRateThrottle(UserRateThrottle):
+class AdminRateThrottle(RedisUserRateThrottle):
     scope = 'admin'
@@ -1,47 +1,85 @@
 """
 Vistas administrativas para exportación de usuarios.
 """
-import csv
-
-from django.http import HttpResponse
-from rest_framework import generics, status
+from rest_framework import generics
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.infra.db_routing import read_alias
+from core.utils.streaming import (
+    CSVStreamRenderer,
+    NDJSONStreamRenderer,
+    iter_queryset,
+    streaming_csv_response,
+    streaming_ndjson_response,
+)
 
 from ..models import CustomUser
 from ..serializers import UserExportSerializer
 from ..throttling import AdminRateThrottle
 
+CSV_HEADER = ['ID', 'Phone', 'Email', 'First Name', 'Last Name', 'Role', 'Status', 'Created At']
+CSV_FIELDS = (
+    'id', 'phone_number', 'email', 'first_name', 'last_name', 'role',
+    'is_active', 'is_persona_non_grata', 'created_at',
+)
+# Mismas claves que UserExportSerializer.Meta.fields
+JSON_FIELDS = (
+    'id', 'phone_number', 'email', 'first_name', 'last_name', 'role',
+    'is_verified', 'email_verified', 'is_active', 'is_persona_non_grata',
+    'created_at', 'last_login',
+)
+
 
 class UserExportView(generics.GenericAPIView):
-    """Exporta usuarios en formato JSON o CSV."""
+    """
+    Exporta usuarios en JSON (por defecto), CSV (``?format=csv``) o NDJSON
+    (``?format=ndjson``).
+
+    El JSON por defecto es el arreglo de ``UserExportSerializer`` de siempre.
+    CSV y NDJSON se envían en streaming sobre un cursor del servidor (o por
+    páginas de pk detrás de un pooler en modo transacción), así que la memoria
+    es constante sin importar cuántos usuarios existan; para exportaciones
+    grandes conviene NDJSON. Se lee de la réplica cuando está disponible; la
+    base se elige antes de empezar a transmitir.
+    """
 
     permission_classes = [IsAdminUser]
     throttle_classes = [AdminRateThrottle]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVStreamRenderer, NDJSONStreamRenderer]
     queryset = CustomUser.objects.all()
     serializer_class = UserExportSerializer
 
     def get(self, request, *args, **kwargs):
-        format_param = request.query_params.get('format', None)
+        queryset = self.get_queryset().using(read_alias())
+        format_param = request.query_params.get('format')
 
         if format_param == 'csv':
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="users_export.csv"'
-
-            writer = csv.writer(response)
-            writer.writerow(['ID', 'Phone', 'Email', 'First Name', 'Last Name', 'Role', 'Status', 'Created At'])
-
-            for user in self.get_queryset():
-                status_label = "Active" if user.is_active else "Inactive"
-                if user.is_persona_non_grata:
-                    status_label = "CNG"
-                writer.writerow([
-                    user.id, user.phone_number, user.email, user.first_name, user.last_name,
-                    user.role, status_label, user.created_at
-                ])
-            return response
-
-        # Return JSON for non-CSV requests
-        queryset = self.get_queryset()
+            rows = iter_queryset(queryset.order_by('pk').values_list(*CSV_FIELDS))
+            return streaming_csv_response('users_export.csv', CSV_HEADER, self._csv_rows(rows))
+
+        if format_param == 'ndjson':
+            rows = iter_queryset(queryset.order_by('pk').values(*JSON_FIELDS))
+            return streaming_ndjson_response('users_export.ndjson', self._json_rows(rows))
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+    @staticmethod
+    def _csv_rows(rows):
+        for (pk, phone, email, first_name, last_name, role,
+             is_active, is_persona_non_grata, created_at) in rows:
+            status_label = "Active" if is_active else "Inactive"
+            if is_persona_non_grata:
+                status_label = "CNG"
+            yield [pk, phone, email, first_name, last_name, role, status_label, created_at]
+
+    @staticmethod
+    def _json_rows(rows):
+        for row in rows:
+            if row['is_persona_non_grata']:
+                row['status'] = "CNG"
+            else:
+                row['status'] = "Activo" if row['is_active'] else "Inactivo"
+            yield {field: row[field] for field in UserExportSerializer.Meta.fields}